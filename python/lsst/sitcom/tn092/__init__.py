@@ -1,3 +1,15 @@
-
+from . import alignment  # noqa: F401, F403
+from . import cache  # noqa: F401, F403
+from . import coalesce  # noqa: F401, F403
+from . import dynamic_tests  # noqa: F401, F403
+from . import events  # noqa: F401, F403
+from . import executor  # noqa: F401, F403
+from . import histogram  # noqa: F401, F403
+from . import ics  # noqa: F401, F403
+from . import instrumentation  # noqa: F401, F403
+from . import local_efd  # noqa: F401, F403
+from . import movie  # noqa: F401, F403
 from . import plot  # noqa: F401, F403
 from . import query  # noqa: F401, F403
+from . import rainflow  # noqa: F401, F403
+from . import store  # noqa: F401, F403
@@ -0,0 +1,220 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from astropy.time import Time
+
+
+__all__ = ["align_frame", "align_slews", "slew_envelope"]
+
+
+def align_slews(
+    times,
+    values,
+    begins,
+    ends,
+    window=(0.0, 1.0),
+    align="start",
+    rate=50.0,
+    max_gap=None,
+    within_slew=False,
+):
+    """
+    Resample a time series around many slews onto a common time grid
+    relative to the start or the stop of each slew.
+
+    All the slews are interpolated at once: the grid times of every slew
+    are located in the series with a single `numpy.searchsorted` call and
+    linearly interpolated between the neighbouring samples.
+
+    Parameters
+    ----------
+    times : array-like of float
+        The sorted unix timestamps of the samples, in seconds.
+    values : array-like
+        The ``(n_samples,)`` or ``(n_samples, n_columns)`` values.
+    begins, ends : array-like of float
+        The unix timestamps of the start and stop of each slew.
+    window : tuple of float, optional
+        The ``(first, last)`` grid time relative to the alignment point, in
+        seconds. E.g. ``(-1, 5)`` starts 1 s before it (default is 0 to
+        1 s).
+    align : {"start", "stop"}, optional
+        Align the slews on their start or on their stop (default is
+        "start").
+    rate : float, optional
+        The sample rate of the grid, in Hz (default is 50, the rate of the
+        M1M3 telemetry).
+    max_gap : float, optional
+        If given, grid points between two samples more than ``max_gap``
+        seconds apart are NaN instead of interpolated (default is None).
+    within_slew : bool, optional
+        If True, grid points before the start or after the stop of their
+        slew are NaN (default is False).
+
+    Returns
+    -------
+    grid : numpy.ndarray
+        The grid times relative to the alignment point, in seconds.
+    aligned : numpy.ndarray
+        The ``(n_slews, n_grid, n_columns)`` resampled values, or
+        ``(n_slews, n_grid)`` for 1D ``values``. Grid points outside the
+        series are NaN.
+    """
+    if align not in ("start", "stop"):
+        raise ValueError(f"align must be 'start' or 'stop', got {align!r}.")
+
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    begins = np.atleast_1d(np.asarray(begins, dtype=float))
+    ends = np.atleast_1d(np.asarray(ends, dtype=float))
+
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, np.newaxis]
+
+    first, last = window
+    n_grid = int(np.floor((last - first) * rate + 1e-9)) + 1
+    grid = first + np.arange(n_grid) / rate
+
+    origin = begins if align == "start" else ends
+    targets = origin[:, np.newaxis] + grid
+
+    if times.size < 2:
+        aligned = np.full(targets.shape + values.shape[1:], np.nan)
+    else:
+        # Interpolate between the samples before and after each target. The
+        # targets before the first or after the last sample have no
+        # neighbours, except for those exactly on the last sample.
+        after = np.searchsorted(times, targets, side="right")
+        valid = ((after > 0) & (after < times.size)) | (targets == times[-1])
+        after = np.clip(after, 1, times.size - 1)
+        before = after - 1
+
+        t0, t1 = times[before], times[after]
+        span = t1 - t0
+        weight = np.divide(
+            targets - t0, span, out=np.zeros_like(targets), where=span > 0
+        )
+
+        if max_gap is not None:
+            valid &= span <= max_gap
+        if within_slew:
+            valid &= (targets >= begins[:, np.newaxis]) & (
+                targets <= ends[:, np.newaxis]
+            )
+
+        v0, v1 = values[before], values[after]
+        aligned = v0 + weight[..., np.newaxis] * (v1 - v0)
+        aligned[~valid] = np.nan
+
+    if squeeze:
+        aligned = aligned[..., 0]
+
+    return grid, aligned
+
+
+def align_frame(df, events, columns=None, **kwargs):
+    """
+    Resample the columns of a time-indexed DataFrame around TMA events,
+    see `align_slews`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The samples, e.g. hardpoint or force actuator telemetry, indexed by
+        UTC time.
+    events : list of TMAEvent
+        The slews.
+    columns : list of str, optional
+        The columns to resample (default is all the numeric ones).
+    **kwargs
+        Passed to `align_slews`.
+
+    Returns
+    -------
+    grid : numpy.ndarray
+        The grid times relative to the alignment point, in seconds.
+    aligned : numpy.ndarray
+        The ``(n_events, n_grid, n_columns)`` resampled values.
+    columns : list of str
+        The columns, in the order of the last axis of ``aligned``.
+    """
+    if columns is None:
+        columns = list(df.select_dtypes("number").columns)
+
+    df = df.sort_index()
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    times = (index - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+
+    events = list(events)
+    begins = Time([evt.begin for evt in events]).unix if events else []
+    ends = Time([evt.end for evt in events]).unix if events else []
+
+    grid, aligned = align_slews(
+        np.asarray(times, dtype=float),
+        df[columns].to_numpy(dtype=float),
+        begins,
+        ends,
+        **kwargs,
+    )
+
+    return grid, aligned, columns
+
+
+def slew_envelope(grid, aligned, columns=None, percentiles=(5, 25, 75, 95)):
+    """
+    Summarize aligned slews at every grid time.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        The grid times from `align_slews`.
+    aligned : numpy.ndarray
+        The ``(n_slews, n_grid)`` or ``(n_slews, n_grid, n_columns)``
+        aligned values.
+    columns : list of str, optional
+        The names of the columns (default is their position).
+    percentiles : sequence of float, optional
+        The percentiles to compute, in percent (default is 5, 25, 75 and
+        95).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by the relative grid time, with a ``(column, statistic)``
+        column for the number of slews with data ('count'), the 'median',
+        each percentile (e.g. 'p95'), the 'min', the 'max' and the largest
+        absolute value ('max_abs'). Missing values are ignored.
+    """
+    aligned = np.asarray(aligned, dtype=float)
+    if aligned.ndim == 2:
+        aligned = aligned[..., np.newaxis]
+
+    if columns is None:
+        columns = list(range(aligned.shape[-1]))
+
+    with warnings.catch_warnings():
+        # Grid times without data in any slew are NaN.
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+
+        stats = {"count": np.sum(np.isfinite(aligned), axis=0).astype(float)}
+        stats["median"] = np.nanmedian(aligned, axis=0)
+        if len(percentiles) > 0:
+            quantiles = np.nanpercentile(aligned, percentiles, axis=0)
+            for p, values in zip(percentiles, quantiles):
+                stats[f"p{p:g}"] = values
+        stats["min"] = np.nanmin(aligned, axis=0)
+        stats["max"] = np.nanmax(aligned, axis=0)
+        stats["max_abs"] = np.nanmax(np.abs(aligned), axis=0)
+
+    data = {
+        (column, stat): values[:, i]
+        for i, column in enumerate(columns)
+        for stat, values in stats.items()
+    }
+
+    return pd.DataFrame(data, index=pd.Index(grid, name="time"))
@@ -0,0 +1,183 @@
+"""
+Throughput benchmarks of `lsst.sitcom.tn092.query` against a local EFD.
+
+Run it with::
+
+    python -m lsst.sitcom.tn092.benchmark
+
+The default sizes, 100, 10 000 and 100 000 events, take a few minutes
+on a laptop, almost all of it in the hardpoint force queries of the largest
+size. Measuring the peak memory runs each benchmark again under
+`tracemalloc`, which is several times slower; ``--no-memory`` skips it.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from lsst.sitcom.tn092 import query
+from lsst.sitcom.tn092.executor import QueryExecutor
+from lsst.sitcom.tn092.local_efd import make_synthetic_efd
+
+
+__all__ = ["benchmark_queries", "main"]
+
+
+def benchmark_queries(
+    n_events,
+    batch_size=500,
+    latency=0.0,
+    failure_rate=0.0,
+    max_concurrency=16,
+    trace_memory=True,
+):
+    """
+    Time the query functions against a synthetic local EFD.
+
+    Parameters
+    ----------
+    n_events : int
+        Number of synthetic slews, and of Script/Scheduler rows.
+    batch_size : int, optional
+        The batch size used for the batched run of
+        `query.hp_forces_and_azimuth_elevation` (default is 500).
+    latency : float, optional
+        Delay added to every EFD request, in seconds (default is 0).
+    failure_rate : float, optional
+        Probability that an EFD request fails (default is 0).
+    max_concurrency : int, optional
+        Maximum number of queries in flight (default is 16).
+    trace_memory : bool, optional
+        If True, each benchmark is run a second time under `tracemalloc`
+        to measure its peak memory. Tracing slows Python down several
+        times, so it is kept out of the timed run (default is True).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per benchmark with the wall time, events per second, peak
+        traced memory (NaN without ``trace_memory``), number of requests
+        and statements and rows returned by the timed run, and the error
+        that stopped the benchmark, if any.
+    """
+    client, events = make_synthetic_efd(
+        n_events, latency=latency, failure_rate=failure_rate, seed=0
+    )
+    begin, end = events[0].begin, events[-1].end
+
+    def executor():
+        return QueryExecutor(max_concurrency=max_concurrency, backoff=0.01)
+
+    cases = {
+        "hp_forces_and_azimuth_elevation": (
+            lambda: query.hp_forces_and_azimuth_elevation(
+                client, events, executor=executor()
+            )
+        ),
+        "hp_forces_and_azimuth_elevation (batched)": (
+            lambda: query.hp_forces_and_azimuth_elevation(
+                client, events, batch_size=batch_size, executor=executor()
+            )
+        ),
+        "script_states": lambda: query.script_states(
+            client, begin, end, block_id="BLOCK-T227", columns=["state", "blockId"]
+        ),
+        "script_description": lambda: query.script_description(client, begin, end),
+        "script_configuration": lambda: query.script_configuration(client, begin, end),
+        "block_status": lambda: query.block_status(
+            client, begin, end, block_name="BLOCK-T227"
+        ),
+    }
+
+    rows = []
+    for name, func in cases.items():
+        client.influx_client.reset_counters()
+        t0 = time.perf_counter()
+        error = _run_case(func)
+        wall_time = time.perf_counter() - t0
+
+        influx = client.influx_client
+        row = dict(
+            benchmark=name,
+            n_events=n_events,
+            wall_time=wall_time,
+            events_per_second=n_events / wall_time,
+            peak_memory_mb=float("nan"),
+            requests=influx.n_requests,
+            statements=influx.n_statements,
+            rows=influx.n_rows,
+            error=error,
+        )
+
+        if trace_memory:
+            tracemalloc.start()
+            _run_case(func)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            row["peak_memory_mb"] = peak / 2**20
+
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def _run_case(func):
+    """
+    Run one benchmark, returning the error that stopped it, if any.
+    """
+    try:
+        func()
+    except ConnectionError as err:
+        # The Script and Scheduler queries are not retried.
+        return repr(err)
+    return None
+
+
+def main(argv=None):
+    """
+    Run the benchmarks from the command line and print a summary table.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--events",
+        type=int,
+        nargs="+",
+        default=[100, 10_000, 100_000],
+        help="The numbers of events to benchmark (default: %(default)s).",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the second, traced run that measures the peak memory.",
+    )
+    args = parser.parse_args(argv)
+
+    df = pd.concat(
+        [
+            benchmark_queries(
+                n_events,
+                batch_size=args.batch_size,
+                latency=args.latency,
+                failure_rate=args.failure_rate,
+                max_concurrency=args.max_concurrency,
+                trace_memory=not args.no_memory,
+            )
+            for n_events in args.events
+        ],
+        ignore_index=True,
+    )
+
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(df.to_string(index=False, float_format="{:.3g}".format))
+
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+from pathlib import Path
+
+import pandas as pd
+from astropy.time import Time
+
+from lsst.summit.utils.efdUtils import getDayObsEndTime
+
+from lsst.sitcom.tn092.utils import write_atomic
+
+
+__all__ = ["QueryCache"]
+
+
+log = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """
+    Persistent on-disk cache of per-event query results.
+
+    Each result is stored as a Parquet file under
+    ``{path}/{topic}/{day_obs}/{seq_num}_{signature}.parquet``, where the
+    signature is a hash of the query text. Only events from closed day_obs
+    are cached, since their data never changes. When the cache grows beyond
+    ``max_bytes`` the least recently used files are removed.
+
+    Parameters
+    ----------
+    path : str or Path
+        The directory that holds the cache. It is created if needed.
+    max_bytes : int, optional
+        The maximum size of the cache on disk, in bytes (default is 1 GiB).
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, path, max_bytes=2**30):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(f.stat().st_size for f in self._files())
+
+    @property
+    def size(self):
+        """
+        The current size of the cache on disk, in bytes.
+        """
+        return self._size
+
+    def file_path(self, topic, tma_event, query):
+        """
+        Return the path of the cache file for a query on a TMA event.
+
+        Parameters
+        ----------
+        topic : str
+            The EFD topic being queried.
+        tma_event : TMAEvent
+            The TMA event the query covers.
+        query : str
+            The query text, used as the query signature.
+
+        Returns
+        -------
+        Path
+            The path of the cache file.
+        """
+        signature = hashlib.sha1(" ".join(query.split()).encode()).hexdigest()[:16]
+        return (
+            self.path
+            / topic
+            / str(tma_event.dayObs)
+            / f"{tma_event.seqNum:05d}_{signature}{self.suffix}"
+        )
+
+    def is_cacheable(self, tma_event):
+        """
+        Whether the data of a TMA event is final and can be cached.
+
+        Parameters
+        ----------
+        tma_event : TMAEvent
+            The TMA event.
+
+        Returns
+        -------
+        bool
+            True if the day_obs of the event is over.
+        """
+        return getDayObsEndTime(tma_event.dayObs) < Time.now()
+
+    def get(self, topic, tma_event, query):
+        """
+        Read a cached result.
+
+        Parameters
+        ----------
+        topic : str
+            The EFD topic being queried.
+        tma_event : TMAEvent
+            The TMA event the query covers.
+        query : str
+            The query text.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            The cached result, or None if it is not in the cache. Files that
+            cannot be read, e.g. corrupt Parquet files, are removed and
+            count as misses.
+        """
+        file_path = self.file_path(topic, tma_event, query)
+
+        try:
+            df = pd.read_parquet(file_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as error:
+            # pyarrow raises ArrowInvalid, a ValueError, for corrupt files.
+            log.warning(f"Removing unreadable query cache file {file_path}: {error}")
+            self._remove(file_path)
+            self.misses += 1
+            return None
+
+        # Touch the file so eviction sees it as recently used
+        file_path.touch()
+        self.hits += 1
+
+        return df
+
+    def put(self, topic, tma_event, query, df):
+        """
+        Store a result in the cache, if the event is cacheable.
+
+        The file is written to a temporary name first and then renamed, so
+        readers never see partially written files.
+
+        Parameters
+        ----------
+        topic : str
+            The EFD topic being queried.
+        tma_event : TMAEvent
+            The TMA event the query covers.
+        query : str
+            The query text.
+        df : pandas.DataFrame
+            The result to store.
+        """
+        if not self.is_cacheable(tma_event):
+            return
+
+        file_path = self.file_path(topic, tma_event, query)
+
+        old_size = file_path.stat().st_size if file_path.exists() else 0
+        write_atomic(file_path, df.to_parquet)
+        self._size += file_path.stat().st_size - old_size
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache fits in
+        ``max_bytes``.
+        """
+        files = sorted(
+            ((f.stat().st_mtime, f.stat().st_size, f) for f in self._files()),
+            key=lambda item: item[0],
+        )
+        self._size = sum(size for _, size, _ in files)
+
+        for _, size, file_path in files:
+            if self._size <= self.max_bytes:
+                break
+            file_path.unlink(missing_ok=True)
+            self._size -= size
+            log.debug(f"Evicted {file_path} from the query cache.")
+
+    def clear(self):
+        """
+        Remove every file from the cache.
+        """
+        for file_path in self._files():
+            file_path.unlink(missing_ok=True)
+        self._size = 0
+
+    def _remove(self, file_path):
+        try:
+            size = file_path.stat().st_size
+            file_path.unlink()
+        except FileNotFoundError:
+            return
+        self._size -= size
+
+    def _files(self):
+        return self.path.rglob(f"*{self.suffix}")
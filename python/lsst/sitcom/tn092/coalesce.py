@@ -0,0 +1,360 @@
+import asyncio
+import contextlib
+import contextvars
+import threading
+
+import pandas as pd
+
+
+__all__ = ["QueryCoalescer", "coalescing", "current_coalescer", "uncoalesced"]
+
+
+_current_lock = threading.Lock()
+
+# Set by `uncoalesced` for the queries that must not be shared.
+_bypass = contextvars.ContextVar("tn092_coalesce_bypass", default=False)
+
+
+class QueryCoalescer:
+    """
+    Share EFD requests between concurrent queries.
+
+    Identical InfluxQL requests sent while one of them is in flight share a
+    single request. Time range selections on the same topic, with the same
+    columns and conditions, whose windows overlap are merged into a single
+    fetch of their union, up to ``max_span``, and each caller gets the rows
+    of its own window. A window covered by a fetch already in flight reuses
+    it.
+
+    Only concurrent requests are shared, results are not kept once their
+    request is over; use `lsst.sitcom.tn092.cache.QueryCache` to reuse
+    results across runs. A caller that stops waiting, e.g. on a
+    `QueryExecutor` timeout, leaves the shared request: later callers send
+    a new one, and the request is cancelled once nobody waits for it.
+
+    The tn092 query functions use the coalescer returned by
+    `current_coalescer`. Coalescing is off unless one is set with
+    `coalescing`.
+
+    Parameters
+    ----------
+    delay : float, optional
+        How long a new time range selection waits for overlapping ones
+        before it is sent, in seconds. The default of 0 only merges the
+        selections made in the same iteration of the event loop, e.g. by
+        tasks started together with `asyncio.gather`.
+    max_span : float, optional
+        The longest merged fetch, in seconds. Windows are not merged if
+        their union would be longer, so the size of each request stays
+        bounded (default is 3600).
+
+    Attributes
+    ----------
+    requests : int
+        The number of InfluxQL requests and time range selections received.
+    fetches : int
+        The number of them that were not shared with another one.
+
+    Examples
+    --------
+    Count the requests saved by two analyses of the same slews:
+
+    >>> with coalescing(QueryCoalescer()) as coalescer:
+    ...     run_sync(asyncio.gather(analysis_a(events), analysis_b(events)))
+    >>> coalescer.requests - coalescer.fetches
+    """
+
+    def __init__(self, delay=0.0, max_span=3600.0):
+        self.delay = delay
+        self.max_span = pd.Timedelta(seconds=max_span)
+        self.requests = 0
+        self.fetches = 0
+
+        # Keyed by event loop and request, see `query` and `select`.
+        self._in_flight = {}
+        self._windows = {}
+
+    async def query(self, efd_client, query, fetch):
+        """
+        Send an InfluxQL request, or wait for the identical one in flight.
+
+        Parameters
+        ----------
+        efd_client : EfdClient
+            The EFD client the request is sent with.
+        query : str
+            The InfluxQL request.
+        fetch : coroutine function
+            Called without arguments to send the request.
+
+        Returns
+        -------
+        object
+            The result of ``fetch``. Callers sharing a request get their own
+            copy of the DataFrames.
+        """
+        key = (asyncio.get_running_loop(), id(efd_client), query)
+        self.requests += 1
+
+        entry = self._in_flight.get(key)
+        if entry is None:
+            self.fetches += 1
+            # The task, the number of callers and of callers still waiting.
+            entry = self._in_flight[key] = [asyncio.ensure_future(fetch()), 0, 0]
+            entry[0].add_done_callback(lambda _: self._forget(key, entry))
+
+        entry[1] += 1
+        entry[2] += 1
+        try:
+            result = await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            entry[2] -= 1
+            self._forget(key, entry)
+            if entry[2] == 0:
+                entry[0].cancel()
+            raise
+        entry[2] -= 1
+
+        return result if entry[1] == 1 else _copy_result(result)
+
+    async def select(
+        self, efd_client, key, begin, end, include_end, fetch, merge=True
+    ):
+        """
+        Select the rows of a time window, merging the fetch with the
+        overlapping windows requested at the same time.
+
+        Parameters
+        ----------
+        efd_client : EfdClient
+            The EFD client the request is sent with.
+        key : tuple
+            What is selected in the window, e.g. the topic, the columns
+            and the conditions. Only windows with the same key are merged.
+        begin, end : pandas.Timestamp
+            The window, from ``begin`` included.
+        include_end : bool
+            Whether rows at exactly ``end`` are included.
+        fetch : coroutine function
+            Called as ``fetch(begin, end, include_end)`` to send the
+            request for a window, returning a time-indexed DataFrame.
+        merge : bool, optional
+            If False, the window is fetched on its own, e.g. for the chunks
+            of a scan that are sized to bound each request. It can still
+            reuse a fetch in flight that covers it (default is True).
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of the window.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, id(efd_client), key)
+        window = (begin, end, include_end)
+        self.requests += 1
+
+        group = self._windows.setdefault(key, {"pending": [], "fetches": []})
+
+        for entry in group["fetches"]:
+            if _covers(entry["window"], window):
+                entry["waiters"] += 1
+                try:
+                    df = await asyncio.shield(entry["task"])
+                except asyncio.CancelledError:
+                    self._leave(key, entry)
+                    raise
+                entry["waiters"] -= 1
+                return _slice(df, entry["window"], window)
+
+        future = loop.create_future()
+        group["pending"].append((window, future, merge))
+        if len(group["pending"]) == 1:
+            loop.call_later(self.delay, self._flush, key, fetch)
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            for entry in list(group["fetches"]):
+                if any(member is future for _, member in entry["members"]):
+                    self._leave(key, entry)
+            raise
+
+    def _forget(self, key, entry):
+        """
+        Stop sharing a request with new callers.
+        """
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    def _flush(self, key, fetch):
+        """
+        Send the pending windows of a key, one fetch per group of
+        overlapping windows.
+        """
+        group = self._windows[key]
+        pending = sorted(group["pending"], key=lambda item: item[0][:2])
+        group["pending"] = []
+
+        merged = []
+        for window, future, merge in pending:
+            if future.done():
+                continue
+
+            if merge and merged and merged[-1][2]:
+                (begin, end, include_end), members, _ = merged[-1]
+                if window[0] < end and max(end, window[1]) - begin <= self.max_span:
+                    if window[1] > end:
+                        end, include_end = window[1], window[2]
+                    elif window[1] == end:
+                        include_end = include_end or window[2]
+                    members.append((window, future))
+                    merged[-1] = ((begin, end, include_end), members, True)
+                    continue
+
+            merged.append((window, [(window, future)], merge))
+
+        for fetched, members, _ in merged:
+            self.fetches += 1
+            entry = dict(
+                window=fetched,
+                task=asyncio.ensure_future(fetch(*fetched)),
+                members=members,
+                waiters=len(members),
+            )
+            group["fetches"].append(entry)
+            entry["task"].add_done_callback(
+                lambda _, entry=entry: self._deliver(key, entry)
+            )
+
+        if not group["pending"] and not group["fetches"]:
+            del self._windows[key]
+
+    def _leave(self, key, entry):
+        """
+        Remove a caller that stopped waiting from a fetch. The fetch is no
+        longer reused by new windows, and it is cancelled once nobody waits
+        for it.
+        """
+        entry["waiters"] -= 1
+        self._drop(key, entry)
+        if entry["waiters"] <= 0:
+            entry["task"].cancel()
+
+    def _drop(self, key, entry):
+        group = self._windows.get(key)
+        if group is None:
+            return
+        if entry in group["fetches"]:
+            group["fetches"].remove(entry)
+        if not group["pending"] and not group["fetches"]:
+            del self._windows[key]
+
+    def _deliver(self, key, entry):
+        """
+        Pass the result of a fetch to the windows it was made for.
+        """
+        self._drop(key, entry)
+
+        fetched, task, members = entry["window"], entry["task"], entry["members"]
+        for window, future in members:
+            if future.done():
+                continue
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            elif len(members) == 1 and window == fetched:
+                future.set_result(task.result())
+            else:
+                future.set_result(_slice(task.result(), fetched, window))
+
+
+@contextlib.contextmanager
+def coalescing(coalescer):
+    """
+    Use another coalescer for the queries run inside the ``with`` block.
+
+    Parameters
+    ----------
+    coalescer : QueryCoalescer or None
+        The coalescer to use, or None to send every request as is.
+
+    Yields
+    ------
+    QueryCoalescer or None
+        The coalescer.
+    """
+    global _current
+
+    with _current_lock:
+        previous, _current = _current, coalescer
+
+    try:
+        yield coalescer
+    finally:
+        with _current_lock:
+            _current = previous
+
+
+def current_coalescer():
+    """
+    Return the coalescer used by the tn092 query functions, or None if
+    coalescing is off or bypassed with `uncoalesced`.
+    """
+    return None if _bypass.get() else _current
+
+
+@contextlib.contextmanager
+def uncoalesced():
+    """
+    Send the queries made inside the ``with`` block on their own, whichever
+    coalescer is in use.
+
+    Unlike `coalescing`, this only applies to the current thread and
+    asyncio task, and the tasks it starts. `QueryExecutor` uses it for
+    retries, so a retry never waits on the request that failed.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _covers(fetched, window):
+    begin, end, include_end = fetched
+    return (
+        begin <= window[0]
+        and window[1] <= end
+        and (include_end or window[1] < end or not window[2])
+    )
+
+
+def _slice(df, fetched, window):
+    """
+    Select the rows of a window from the result of a larger fetch.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return pd.DataFrame()
+
+    begin, end, include_end = window
+    before_end = (df.index <= end) if include_end else (df.index < end)
+    return df[(df.index >= begin) & before_end].copy()
+
+
+def _copy_result(result):
+    """
+    Copy the DataFrames of a result in the format of the influx client
+    dataframe mode.
+    """
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, list):
+        return [_copy_result(series) for series in result]
+    if isinstance(result, dict):
+        return {name: _copy_result(df) for name, df in result.items()}
+    return result
+
+
+# Coalescing is off by default, see `coalescing` to turn it on.
+_current = None
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from lsst.sitcom.tn092.executor import QueryExecutor, run_sync
+from lsst.sitcom.tn092.utils import write_atomic
+
+
+__all__ = [
+    "DYNAMIC_TEST_FRAMES",
+    "config_hash",
+    "load_config_dir",
+    "run_dynamic_tests",
+    "run_dynamic_tests_async",
+]
+
+
+log = logging.getLogger(__name__)
+
+# Names of the frames returned by `run_single_dynamic_test`, in order.
+DYNAMIC_TEST_FRAMES = ("stats_frame", "hp_forces_df", "fa_following_errors_df")
+
+# Configuration keys that do not change the results of a test.
+_OUTPUT_KEYS = ("data_dir", "plot_dir", "save_data", "make_plots")
+
+
+def load_config_dir(config_dir, pattern="*.yaml", **kwargs):
+    """
+    Load every dynamic test configuration file of a directory.
+
+    Parameters
+    ----------
+    config_dir : str or Path
+        The directory, e.g. "notebooks/dynamical_test_configs".
+    pattern : str, optional
+        The glob pattern of the configuration files (default is "*.yaml").
+    **kwargs
+        Passed to `load_config`, overriding the files. By default the data
+        are not saved and no plots are made.
+
+    Returns
+    -------
+    dict of str to dict
+        The configurations, by test name (the file name without suffix),
+        sorted by name.
+    """
+    from lsst.ts.m1m3.utils.dynamic_test_analysis import load_config
+
+    kwargs.setdefault("save_data", False)
+    kwargs.setdefault("make_plots", False)
+
+    return {
+        config_file.stem: load_config(config_file=str(config_file), **kwargs)
+        for config_file in sorted(Path(config_dir).glob(pattern))
+    }
+
+
+def config_hash(config):
+    """
+    Hash the parts of a dynamic test configuration that change its
+    results.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration, as returned by `load_config`.
+
+    Returns
+    -------
+    str
+        A short hexadecimal digest.
+    """
+    relevant = {k: v for k, v in config.items() if k not in _OUTPUT_KEYS}
+    text = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def run_dynamic_tests(configs, max_concurrency=4, cache_dir=None, refresh=False):
+    """
+    Run many dynamic tests concurrently.
+
+    Parameters
+    ----------
+    configs : dict of str to dict
+        The configurations by test name, e.g. from `load_config_dir`.
+    max_concurrency : int, optional
+        The maximum number of tests running at the same time (default is
+        4).
+    cache_dir : str or Path, optional
+        If given, the frames of each test are stored under
+        ``{cache_dir}/{config_hash}/`` and read back on later runs with the
+        same configuration, so comparison plots can be redrawn without
+        querying the EFD again (default is None).
+    refresh : bool, optional
+        If True, run the tests even if they are in the cache
+        (default is False).
+
+    Returns
+    -------
+    dict of str to dict
+        For each test that succeeded, the 'stats_frame', 'hp_forces_df' and
+        'fa_following_errors_df' frames, the ``dynamic_test_data_dict``
+        expected by `SlewPlotter.multi_test_plot`. Failed tests are logged
+        and left out.
+    """
+    return run_sync(
+        run_dynamic_tests_async(
+            configs,
+            max_concurrency=max_concurrency,
+            cache_dir=cache_dir,
+            refresh=refresh,
+        )
+    )
+
+
+async def run_dynamic_tests_async(
+    configs, max_concurrency=4, cache_dir=None, refresh=False
+):
+    """
+    Asynchronous version of `run_dynamic_tests`, see it for the
+    parameters.
+    """
+    # Imported here so the package can be imported without ts_m1m3_utils,
+    # whose dynamic test analysis is not released yet.
+    from lsst.ts.m1m3.utils.dynamic_test_analysis import run_single_dynamic_test
+
+    # Whole tests are not retried, `run_single_dynamic_test` does its own
+    # error handling.
+    executor = QueryExecutor(max_concurrency=max_concurrency, max_retries=0)
+    cache_dir = None if cache_dir is None else Path(cache_dir)
+
+    async def run(name):
+        config = configs[name]
+        test_dir = None if cache_dir is None else cache_dir / config_hash(config)
+
+        if test_dir is not None and not refresh:
+            frames = _read_frames(test_dir)
+            if frames is not None:
+                log.debug(f"Read {name} from {test_dir}.")
+                return frames
+
+        results = await executor.submit(run_single_dynamic_test, **config)
+        frames = dict(zip(DYNAMIC_TEST_FRAMES, results))
+
+        if test_dir is not None:
+            _write_frames(test_dir, frames)
+
+        return frames
+
+    names = list(configs)
+    results = await executor.map(run, names)
+
+    return {
+        name: frames for name, frames in zip(names, results) if frames is not None
+    }
+
+
+def _read_frames(test_dir):
+    """
+    Read the cached frames of a test, or None if they are not all there.
+    """
+    paths = [test_dir / f"{name}.pkl" for name in DYNAMIC_TEST_FRAMES]
+    if not all(path.exists() for path in paths):
+        return None
+    return {
+        name: pd.read_pickle(path) for name, path in zip(DYNAMIC_TEST_FRAMES, paths)
+    }
+
+
+def _write_frames(test_dir, frames):
+    """
+    Cache the frames of a test. They are pickled, as they can hold enums and
+    other objects that Parquet cannot store, and each file is written under
+    a temporary name and renamed.
+    """
+    for name, df in frames.items():
+        write_atomic(test_dir / f"{name}.pkl", df.to_pickle)
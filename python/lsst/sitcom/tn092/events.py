@@ -0,0 +1,192 @@
+import numpy as np
+
+from astropy.time import Time
+
+
+__all__ = ["EventIndex"]
+
+
+class EventIndex:
+    """
+    Index of TMA events sorted by time, for bulk selection by time window.
+
+    The begin and end of the events are stored as sorted arrays of unix
+    timestamps, so selections are answered with vectorized
+    `numpy.searchsorted` calls instead of comparing `astropy.time.Time`
+    objects one event at a time.
+
+    Parameters
+    ----------
+    events : list of TMAEvent
+        The events to index, in any order.
+
+    Examples
+    --------
+    Select the slews of a block from a month of events:
+
+    >>> index = EventIndex(events)
+    >>> block_events = index.within(start_time, end_time)
+    """
+
+    def __init__(self, events):
+        events = list(events)
+
+        if len(events) == 0:
+            begin = end = np.empty(0)
+        else:
+            begin = Time([evt.begin for evt in events]).unix
+            end = Time([evt.end for evt in events]).unix
+
+        order = np.argsort(begin, kind="stable")
+
+        self.events = np.empty(len(events), dtype=object)
+        self.events[:] = events
+        self.events = self.events[order]
+        self.begin = begin[order]
+        self.end = end[order]
+
+        # Running maximum of the end times. It is sorted even if the events
+        # overlap, so it bounds the first event that can reach a given time.
+        self._max_end = np.maximum.accumulate(self.end)
+
+    def __len__(self):
+        return self.events.size
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def starting_between(self, start, end):
+        """
+        Events that begin in a time range.
+
+        Parameters
+        ----------
+        start, end : astropy.time.Time or float
+            The time range, as Time objects or unix timestamps.
+
+        Returns
+        -------
+        list of TMAEvent
+            The events with ``start <= begin < end``, sorted by begin.
+        """
+        lo, hi = np.searchsorted(self.begin, [_to_unix(start), _to_unix(end)])
+        return list(self.events[lo:hi])
+
+    def within(self, start, end):
+        """
+        Events fully contained in a time range.
+
+        Parameters
+        ----------
+        start, end : astropy.time.Time or float
+            The time range, as Time objects or unix timestamps.
+
+        Returns
+        -------
+        list of TMAEvent
+            The events with ``begin >= start`` and ``end <= end``, sorted
+            by begin.
+        """
+        start, end = _to_unix(start), _to_unix(end)
+        lo = np.searchsorted(self.begin, start, side="left")
+        hi = np.searchsorted(self.begin, end, side="right")
+        mask = self.end[lo:hi] <= end
+        return list(self.events[lo:hi][mask])
+
+    def containing(self, times):
+        """
+        Find the event that contains each of the given times.
+
+        Parameters
+        ----------
+        times : astropy.time.Time or array-like of float
+            The times to look up, as Time objects or unix timestamps.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            The position, in `events`, of the latest-beginning event with
+            ``begin <= time < end`` for each time, or -1 if there is none.
+            For non-overlapping events, such as TMA events, it is the only
+            event that contains the time.
+        """
+        times = np.atleast_1d(_to_unix(times))
+        index = np.searchsorted(self.begin, times, side="right") - 1
+        result = np.full(times.shape, -1, dtype=np.intp)
+
+        # Step back from the last event beginning before each time while an
+        # earlier event can still reach it. Non-overlapping events are
+        # resolved in the first pass.
+        pending = np.flatnonzero(index >= 0)
+        while pending.size > 0:
+            hit = times[pending] < self.end[index[pending]]
+            result[pending[hit]] = index[pending[hit]]
+            pending = pending[~hit]
+            index[pending] -= 1
+            pending = pending[index[pending] >= 0]
+            pending = pending[times[pending] < self._max_end[index[pending]]]
+
+        return result
+
+    def overlapping(self, starts, ends):
+        """
+        Find the events that overlap each of N time intervals.
+
+        Parameters
+        ----------
+        starts, ends : astropy.time.Time or array-like of float
+            The N intervals, as Time objects or unix timestamps.
+
+        Returns
+        -------
+        interval_index : numpy.ndarray of int
+            The index of the interval of each match.
+        event_index : numpy.ndarray of int
+            The position, in `events`, of the event of each match. An event
+            matches an interval if ``begin < interval end`` and
+            ``end > interval start``.
+        """
+        starts = np.atleast_1d(_to_unix(starts))
+        ends = np.atleast_1d(_to_unix(ends))
+
+        # Candidates lie between the first event that ends after the start
+        # and the last event that begins before the end of each interval.
+        lo = np.searchsorted(self._max_end, starts, side="right")
+        hi = np.searchsorted(self.begin, ends, side="left")
+        counts = np.clip(hi - lo, 0, None)
+
+        interval_index = np.repeat(np.arange(starts.size), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        event_index = np.repeat(lo, counts) + np.arange(counts.sum()) - first
+
+        mask = self.end[event_index] > starts[interval_index]
+        return interval_index[mask], event_index[mask]
+
+    def overlapping_events(self, start, end):
+        """
+        Events that overlap a time range.
+
+        Parameters
+        ----------
+        start, end : astropy.time.Time or float
+            The time range, as Time objects or unix timestamps.
+
+        Returns
+        -------
+        list of TMAEvent
+            The events with ``begin < end`` and ``end > start``, sorted by
+            begin.
+        """
+        _, event_index = self.overlapping(start, end)
+        return list(self.events[event_index])
+
+
+def _to_unix(times):
+    """
+    Convert Time objects to unix timestamps, leaving numbers untouched.
+    """
+    if isinstance(times, Time):
+        return times.unix
+    if np.ndim(times) > 0 and len(times) > 0 and isinstance(times[0], Time):
+        return Time(times).unix
+    return np.asarray(times, dtype=float)
@@ -0,0 +1,225 @@
+import asyncio
+import contextlib
+import logging
+import random
+import socket
+import warnings
+
+try:
+    from aiohttp import ClientError
+except ImportError:  # pragma: no cover - aiohttp comes with lsst_efd_client
+    ClientError = ConnectionError
+
+from lsst.sitcom.tn092.coalesce import uncoalesced
+
+
+__all__ = ["QueryExecutor", "TRANSIENT_ERRORS", "run_sync"]
+
+
+# Network errors only: other OSErrors, such as a missing or unreadable
+# file, do not go away by retrying.
+TRANSIENT_ERRORS = (asyncio.TimeoutError, ConnectionError, socket.gaierror, ClientError)
+
+log = logging.getLogger(__name__)
+
+
+class QueryExecutor:
+    """
+    Run EFD queries with a bounded number of requests in flight, retrying
+    transient errors with exponential backoff.
+
+    Parameters
+    ----------
+    max_concurrency : int, optional
+        Maximum number of queries running at the same time (default is 16).
+    max_retries : int, optional
+        Number of times a query is retried after a transient error
+        (default is 3).
+    backoff : float, optional
+        Delay before the first retry, in seconds. It doubles after every
+        attempt (default is 0.5).
+    max_backoff : float, optional
+        Upper limit of the delay between retries, in seconds
+        (default is 10).
+    timeout : float, optional
+        Maximum duration of a single attempt, in seconds. A query that takes
+        longer is cancelled and retried (default is None, no timeout).
+    retry_on : tuple of Exception, optional
+        Exception types considered transient (default is
+        `TRANSIENT_ERRORS`).
+
+    Attributes
+    ----------
+    failures : list of tuple
+        The ``(item, exception)`` pairs for the items that could not be
+        processed by `map`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=16,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=10.0,
+        timeout=None,
+        retry_on=TRANSIENT_ERRORS,
+    ):
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be a positive integer, got {max_concurrency}."
+            )
+
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retry_on = retry_on
+        self.failures = []
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        """
+        The semaphore that limits the number of queries in flight, created
+        on first use so it belongs to the running event loop.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def submit(self, func, *args, **kwargs):
+        """
+        Await ``func(*args, **kwargs)`` once a slot is available, retrying
+        transient errors.
+
+        Parameters
+        ----------
+        func : coroutine function
+            The query to run.
+        *args, **kwargs
+            Arguments passed to ``func``.
+
+        Returns
+        -------
+        object
+            The value returned by ``func``.
+
+        Raises
+        ------
+        Exception
+            The last error raised by ``func`` if it is not transient or if
+            all the retries failed.
+        """
+        for attempt in range(self.max_retries + 1):
+            # Retries are sent on their own, not shared with the request
+            # that failed, see `lsst.sitcom.tn092.coalesce.QueryCoalescer`.
+            bypass = uncoalesced() if attempt > 0 else contextlib.nullcontext()
+            try:
+                with bypass:
+                    async with self.semaphore:
+                        return await asyncio.wait_for(
+                            func(*args, **kwargs), self.timeout
+                        )
+            except self.retry_on as err:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = min(self.backoff * 2**attempt, self.max_backoff)
+                delay *= 1 + random.random() / 2
+                log.debug(
+                    f"{func.__name__} failed with {err!r}, "
+                    f"retrying in {delay:.2f} s ({attempt + 1}/{self.max_retries})."
+                )
+                await asyncio.sleep(delay)
+
+    async def map(self, func, items):
+        """
+        Apply ``func`` to every item concurrently, keeping going when some
+        of them fail.
+
+        Parameters
+        ----------
+        func : coroutine function
+            Called as ``func(item)``. It is expected to send its queries
+            through `submit` so they are bounded and retried.
+        items : iterable
+            The items to process.
+
+        Returns
+        -------
+        list
+            The results in the same order as ``items``, with None for the
+            items that failed. The failures are appended to `failures`.
+        """
+
+        async def guarded(item):
+            try:
+                return await func(item)
+            except Exception as err:
+                log.warning(f"Giving up on {item!r}: {err!r}")
+                self.failures.append((item, err))
+                return None
+
+        return await asyncio.gather(*[guarded(item) for item in items])
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    The coroutine runs on the event loop of the current thread, the one
+    the EFD client binds its HTTP session to when it is created, so the
+    client is never used from another loop.
+
+    The synchronous functions of `lsst.sitcom.tn092.query` cannot be used
+    where an event loop is already running, e.g. in notebooks, since that
+    loop cannot run the coroutine until the call returns; await their
+    ``_async`` variant instead.
+
+    Parameters
+    ----------
+    coro : coroutine
+        The coroutine to run.
+
+    Returns
+    -------
+    object
+        The value returned by the coroutine.
+
+    Raises
+    ------
+    RuntimeError
+        If an event loop is already running in the current thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _get_thread_loop().run_until_complete(coro)
+
+    name = getattr(coro, "__qualname__", "the coroutine")
+    coro.close()
+    raise RuntimeError(
+        f"Cannot run {name} synchronously while an event loop is running, "
+        "e.g. in a notebook. Await the _async function instead."
+    )
+
+
+def _get_thread_loop():
+    """
+    Return the event loop of the current thread, setting a new one if it
+    has none.
+    """
+    with warnings.catch_warnings():
+        # get_event_loop warns when it has to create the loop.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = None
+
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop
@@ -0,0 +1,213 @@
+import numpy as np
+
+
+__all__ = ["HardpointForcesHistogram"]
+
+
+class HardpointForcesHistogram:
+    """
+    Fixed-bin histogram of the minimum and maximum hardpoint measured forces
+    per slew, split by the end reason of the slews.
+
+    The histogram is updated incrementally as results come in and partial
+    histograms with the same bins, e.g. from different day_obs or worker
+    processes, merge exactly with `merge` or ``+``. Bins are half-open,
+    ``[edges[i], edges[i + 1])``, and values outside of the edges are kept
+    in underflow and overflow counters.
+
+    Parameters
+    ----------
+    edges : array-like, optional
+        The bin edges, in N (default is -2000 N to 2000 N in 20 N steps).
+    """
+
+    def __init__(self, edges=None):
+        if edges is None:
+            edges = np.arange(-2000, 2001, 20)
+
+        self.edges = np.asarray(edges, dtype=float)
+
+        if (
+            self.edges.ndim != 1
+            or self.edges.size < 2
+            or np.any(np.diff(self.edges) <= 0)
+        ):
+            raise ValueError(
+                "The bin edges must be a monotonically increasing 1D array."
+            )
+
+        # end_reason -> (2, n_bins + 2) counts of [min, max] forces, with
+        # the underflow in the first column and the overflow in the last.
+        self._counts = {}
+
+    @classmethod
+    def from_frame(cls, df, edges=None):
+        """
+        Create a histogram from the results of
+        `lsst.sitcom.tn092.query.hp_forces_and_azimuth_elevation`.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The per-slew results, with the 'min_forces', 'max_forces' and
+            'end_reason' columns.
+        edges : array-like, optional
+            The bin edges, in N.
+
+        Returns
+        -------
+        HardpointForcesHistogram
+            The new histogram.
+        """
+        hist = cls(edges)
+        hist.update(df)
+        return hist
+
+    @property
+    def n_bins(self):
+        """
+        The number of bins, excluding the underflow and overflow.
+        """
+        return self.edges.size - 1
+
+    @property
+    def centers(self):
+        """
+        The center of each bin, in N.
+        """
+        return 0.5 * (self.edges[1:] + self.edges[:-1])
+
+    @property
+    def end_reasons(self):
+        """
+        The end reasons seen so far, as integers.
+        """
+        return sorted(self._counts)
+
+    @property
+    def n_slews(self):
+        """
+        The total number of slews accumulated.
+        """
+        return int(sum(counts[0].sum() for counts in self._counts.values()))
+
+    def update(self, df):
+        """
+        Add the slews in a DataFrame to the histogram.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The per-slew results, with the 'min_forces', 'max_forces' and
+            'end_reason' columns. Rows with missing forces are ignored.
+        """
+        if df.index.size == 0:
+            return
+
+        min_forces = df["min_forces"].to_numpy(dtype=float)
+        max_forces = df["max_forces"].to_numpy(dtype=float)
+        end_reasons = df["end_reason"].to_numpy(dtype=int)
+
+        valid = np.isfinite(min_forces) & np.isfinite(max_forces)
+
+        for end_reason in np.unique(end_reasons[valid]):
+            mask = valid & (end_reasons == end_reason)
+            counts = self._counts.setdefault(
+                int(end_reason), np.zeros((2, self.n_bins + 2), dtype=np.int64)
+            )
+            counts[0] += self._bin_counts(min_forces[mask])
+            counts[1] += self._bin_counts(max_forces[mask])
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram with the same bins to this one.
+
+        Parameters
+        ----------
+        other : HardpointForcesHistogram
+            The histogram to merge.
+
+        Returns
+        -------
+        HardpointForcesHistogram
+            This histogram.
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges.")
+
+        for end_reason, counts in other._counts.items():
+            if end_reason in self._counts:
+                self._counts[end_reason] += counts
+            else:
+                self._counts[end_reason] = counts.copy()
+
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        """
+        Return an independent copy of the histogram.
+        """
+        hist = type(self)(self.edges)
+        hist._counts = {key: counts.copy() for key, counts in self._counts.items()}
+        return hist
+
+    def min_counts(self, end_reason=None, outliers=False):
+        """
+        Number of slews per bin of minimum force.
+
+        Parameters
+        ----------
+        end_reason : int or TMAState, optional
+            Only count the slews with this end reason (default is all).
+        outliers : bool, optional
+            If True, the underflow and overflow counts are included as the
+            first and last elements (default is False).
+
+        Returns
+        -------
+        numpy.ndarray
+            The counts.
+        """
+        return self._select(0, end_reason, outliers)
+
+    def max_counts(self, end_reason=None, outliers=False):
+        """
+        Number of slews per bin of maximum force.
+
+        Parameters
+        ----------
+        end_reason : int or TMAState, optional
+            Only count the slews with this end reason (default is all).
+        outliers : bool, optional
+            If True, the underflow and overflow counts are included as the
+            first and last elements (default is False).
+
+        Returns
+        -------
+        numpy.ndarray
+            The counts.
+        """
+        return self._select(1, end_reason, outliers)
+
+    def _select(self, row, end_reason, outliers):
+        if end_reason is None:
+            counts = sum(
+                (counts[row] for counts in self._counts.values()),
+                np.zeros(self.n_bins + 2, dtype=np.int64),
+            )
+        elif int(end_reason) in self._counts:
+            counts = self._counts[int(end_reason)][row].copy()
+        else:
+            counts = np.zeros(self.n_bins + 2, dtype=np.int64)
+
+        return counts if outliers else counts[1:-1]
+
+    def _bin_counts(self, values):
+        index = np.searchsorted(self.edges, values, side="right")
+        return np.bincount(index, minlength=self.n_bins + 2)
@@ -0,0 +1,187 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from lsst.summit.utils.efdUtils import makeEfdClient
+from lsst.summit.utils.tmaUtils import TMAEventMaker
+
+from lsst.sitcom.tn092.utils import write_atomic
+
+
+__all__ = ["evaluate_m1m3_ics_day_obs_list"]
+
+
+log = logging.getLogger(__name__)
+
+# State of each worker process, set by `_init_worker`.
+_worker = {}
+
+
+def evaluate_m1m3_ics_day_obs_list(
+    day_obs_list,
+    data_folder,
+    file_pattern="m1m3_ics_{day_obs}.csv",
+    processes=None,
+    max_connections=4,
+    efd_name=None,
+    overwrite=False,
+    log_level="ERROR",
+):
+    """
+    Evaluate the M1M3 inertia compensation system for many day_obs in
+    parallel, writing one CSV file per day_obs.
+
+    The day_obs are spread over a pool of worker processes. Every worker
+    creates its own EFD client and `TMAEventMaker` once and reuses them for
+    all its day_obs. A semaphore shared by the workers limits the number of
+    day_obs evaluated, and therefore of EFD clients querying, at the same
+    time. Each CSV file is written under a temporary name and then renamed,
+    so a crashed worker never leaves a partial file behind and an
+    interrupted run can simply be restarted. If a worker process dies, the
+    day_obs it had not finished are reported as failed.
+
+    The workers are started with the "spawn" method, so scripts calling
+    this function need the usual ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+    day_obs_list : list of int
+        The day_obs to evaluate.
+    data_folder : str or Path
+        The directory of the CSV files. It is created if needed.
+    file_pattern : str, optional
+        The name of the CSV files, formatted with ``day_obs``
+        (default is "m1m3_ics_{day_obs}.csv").
+    processes : int, optional
+        The number of worker processes (default is ``max_connections``).
+    max_connections : int, optional
+        The maximum number of day_obs querying the EFD at the same time
+        (default is 4).
+    efd_name : str, optional
+        The EFD used by the workers (default is the one picked by
+        `lsst.summit.utils.efdUtils.makeEfdClient` for the current site).
+    overwrite : bool, optional
+        If False, day_obs whose CSV file already exists are skipped
+        (default is False).
+    log_level : str or int, optional
+        The level of the log of `evaluate_m1m3_ics_day_obs` in the workers
+        (default is "ERROR").
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per day_obs with the CSV file, the status ("done",
+        "skipped" or "failed"), the number of rows written, the duration
+        in seconds and the error, if any. The CSV files can be merged with
+        ``merge_csvs(data_folder, file_pattern, day_obs_list)``.
+    """
+    data_folder = Path(data_folder)
+    data_folder.mkdir(parents=True, exist_ok=True)
+
+    if processes is None:
+        processes = max_connections
+
+    rows = {}
+    pending = []
+
+    for day_obs in day_obs_list:
+        file_path = data_folder / file_pattern.format(day_obs=day_obs)
+        if file_path.exists() and not overwrite:
+            log.info(f"File exists: {file_path}. Skipping day_obs {day_obs}.")
+            rows[day_obs] = _status(day_obs, file_path, "skipped")
+        else:
+            pending.append((day_obs, file_path))
+
+    if len(pending) > 0:
+        # Spawn the workers so they do not inherit the threads, event loops
+        # or EFD clients of this process.
+        context = multiprocessing.get_context("spawn")
+        semaphore = context.BoundedSemaphore(max_connections)
+
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(pending)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(semaphore, efd_name, log_level),
+        ) as pool:
+            futures = {
+                pool.submit(_evaluate_day_obs, day_obs, file_path): (
+                    day_obs,
+                    file_path,
+                )
+                for day_obs, file_path in pending
+            }
+
+            for future in as_completed(futures):
+                day_obs, file_path = futures[future]
+                try:
+                    n_rows, duration = future.result()
+                    rows[day_obs] = _status(
+                        day_obs, file_path, "done", n_rows, duration
+                    )
+                except Exception as err:
+                    log.warning(f"Failed to evaluate day_obs {day_obs}: {err!r}")
+                    rows[day_obs] = _status(
+                        day_obs, file_path, "failed", error=repr(err)
+                    )
+
+    return pd.DataFrame([rows[day_obs] for day_obs in day_obs_list])
+
+
+def _init_worker(semaphore, efd_name, log_level):
+    """
+    Create the EFD client and event maker of a worker process.
+    """
+    client = makeEfdClient() if efd_name is None else makeEfdClient(efd_name)
+
+    worker_log = logging.getLogger(f"{__name__}.worker")
+    worker_log.setLevel(log_level)
+    worker_log.propagate = False
+
+    _worker.update(
+        semaphore=semaphore,
+        event_maker=TMAEventMaker(client=client),
+        log=worker_log,
+    )
+
+
+def _evaluate_day_obs(day_obs, file_path):
+    """
+    Evaluate one day_obs in a worker process and write its CSV file.
+
+    Returns
+    -------
+    n_rows : int
+        The number of rows written.
+    duration : float
+        The time spent, in seconds.
+    """
+    # Imported here so the package can be imported without the module,
+    # which is not in every release of summit_utils.
+    from lsst.summit.utils.m1m3 import inertia_compensation_system as m1m3_ics
+
+    t0 = time.perf_counter()
+
+    with _worker["semaphore"]:
+        df = m1m3_ics.evaluate_m1m3_ics_day_obs(
+            day_obs, _worker["event_maker"], log=_worker["log"]
+        )
+
+    write_atomic(file_path, df.to_csv)
+
+    return df.index.size, time.perf_counter() - t0
+
+
+def _status(day_obs, file_path, status, n_rows=0, duration=0.0, error=None):
+    return dict(
+        day_obs=day_obs,
+        file_path=str(file_path),
+        status=status,
+        n_rows=n_rows,
+        duration=duration,
+        error=error,
+    )
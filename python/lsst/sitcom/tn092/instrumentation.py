@@ -0,0 +1,309 @@
+import contextlib
+import functools
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["Instrumentation", "Span", "instrument", "result_size", "span", "timed"]
+
+
+_active = []
+_active_lock = threading.Lock()
+
+
+class Span:
+    """
+    A timed section of work, e.g. one EFD query or one stage of an
+    analysis.
+
+    Parameters
+    ----------
+    kind : str
+        The type of work, "query" for EFD requests or "stage" for the
+        steps of an analysis.
+    name : str
+        What was timed, the topic for queries or the stage name, e.g.
+        "discovery", "fetch", "assembly" or "render".
+    attrs : dict, optional
+        Extra values, e.g. "rows" and "payload_bytes" for queries.
+
+    Attributes
+    ----------
+    start, end : float
+        The `time.perf_counter` values at the start and end of the span.
+    wall_start : float
+        The unix time at the start of the span.
+    thread : str
+        The name of the thread that ran the span.
+    """
+
+    __slots__ = ("kind", "name", "attrs", "start", "end", "wall_start", "thread")
+
+    def __init__(self, kind, name, attrs=None):
+        self.kind = kind
+        self.name = name
+        self.attrs = dict(attrs or {})
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.thread = threading.current_thread().name
+
+    @property
+    def duration(self):
+        """
+        The duration of the span, in seconds, or None if it is not over.
+        """
+        return None if self.end is None else self.end - self.start
+
+    def as_dict(self):
+        """
+        Return the span as a flat dictionary, with the attributes last.
+        """
+        return dict(
+            kind=self.kind,
+            name=self.name,
+            wall_start=self.wall_start,
+            duration=self.duration,
+            thread=self.thread,
+            **self.attrs,
+        )
+
+    def __repr__(self):
+        return f"Span({self.kind!r}, {self.name!r}, duration={self.duration})"
+
+
+class Instrumentation:
+    """
+    Collect the spans of the queries and analysis stages run while it is
+    active.
+
+    Instrumentation is opt-in: nothing is recorded unless an instance is
+    activated with `instrument`. Spans can come from any thread, including
+    the event discovery thread of
+    `lsst.sitcom.tn092.query.hp_forces_and_azimuth_elevation_by_day_obs`.
+
+    Parameters
+    ----------
+    hooks : list of callable, optional
+        Functions called with every finished `Span`, e.g. to forward them
+        to a profiler or a tracer.
+
+    Attributes
+    ----------
+    spans : list of Span
+        The finished spans, in the order they ended.
+
+    Examples
+    --------
+    >>> with instrument() as timing:
+    ...     df = query.hp_forces_and_azimuth_elevation(efd_client, events)
+    ...     plot.histogram_hp_minmax_forces(df, day_obs)
+    >>> timing.summary()
+    """
+
+    def __init__(self, hooks=None):
+        self.spans = []
+        self.hooks = list(hooks or [])
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Call ``hook(span)`` for every span finished from now on.
+        """
+        self.hooks.append(hook)
+
+    def record(self, span):
+        """
+        Store a finished span and pass it to the hooks.
+        """
+        with self._lock:
+            self.spans.append(span)
+
+        for hook in self.hooks:
+            hook(span)
+
+    def clear(self):
+        """
+        Forget the spans recorded so far.
+        """
+        with self._lock:
+            self.spans = []
+
+    def to_frame(self):
+        """
+        Return the spans as a table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per span with its kind, name, wall-clock start,
+            duration in seconds, thread and attributes.
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        return pd.DataFrame([span.as_dict() for span in spans])
+
+    def summary(self):
+        """
+        Summarize the spans by kind and name.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per kind and name with the number of spans, the total,
+            mean and maximum duration in seconds and, for queries, the
+            number of statements and rows and the payload size. Query
+            durations overlap when queries run concurrently, so their total
+            can exceed the elapsed time.
+        """
+        df = self.to_frame()
+
+        if df.empty:
+            return pd.DataFrame()
+
+        for column in ("statements", "rows", "payload_bytes"):
+            df[column] = df.get(column, 0)
+            df[column] = df[column].fillna(0).astype(np.int64)
+
+        summary = df.groupby(["kind", "name"]).agg(
+            count=("duration", "size"),
+            total_time=("duration", "sum"),
+            mean_time=("duration", "mean"),
+            max_time=("duration", "max"),
+            statements=("statements", "sum"),
+            rows=("rows", "sum"),
+            payload_bytes=("payload_bytes", "sum"),
+        )
+
+        return summary.sort_values("total_time", ascending=False)
+
+
+@contextlib.contextmanager
+def instrument(instrumentation=None, hooks=None):
+    """
+    Record the spans of everything run inside the ``with`` block.
+
+    Parameters
+    ----------
+    instrumentation : Instrumentation, optional
+        The collector to use, e.g. to accumulate several runs (default is a
+        new one).
+    hooks : list of callable, optional
+        Hooks added to the collector, see `Instrumentation`.
+
+    Yields
+    ------
+    Instrumentation
+        The active collector.
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+    for hook in hooks or []:
+        instrumentation.add_hook(hook)
+
+    with _active_lock:
+        _active.append(instrumentation)
+
+    try:
+        yield instrumentation
+    finally:
+        with _active_lock:
+            _active.remove(instrumentation)
+
+
+@contextlib.contextmanager
+def span(name, kind="stage", **attrs):
+    """
+    Time the ``with`` block as a span, if instrumentation is active.
+
+    Parameters
+    ----------
+    name : str
+        What is timed.
+    kind : str, optional
+        The type of work (default is "stage").
+    **attrs
+        Extra values stored with the span.
+
+    Yields
+    ------
+    Span or None
+        The span, whose ``attrs`` can be updated inside the block, or None
+        if instrumentation is not active.
+    """
+    with _active_lock:
+        collectors = list(_active)
+
+    if len(collectors) == 0:
+        yield None
+        return
+
+    current = Span(kind, name, attrs)
+    try:
+        yield current
+    finally:
+        current.end = time.perf_counter()
+        for collector in collectors:
+            collector.record(current)
+
+
+def timed(name, kind="stage"):
+    """
+    Decorator that records every call of a function as a span.
+
+    Parameters
+    ----------
+    name : str
+        What is timed.
+    kind : str, optional
+        The type of work (default is "stage").
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, kind=kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def result_size(result):
+    """
+    Count the rows and bytes of a query result in the format of the
+    influx client dataframe mode.
+
+    The influx client decodes the response before returning it, so the
+    size is that of the decoded DataFrames rather than of the HTTP payload.
+
+    Parameters
+    ----------
+    result : pandas.DataFrame, dict or list
+        The value returned by ``influx_client.query``.
+
+    Returns
+    -------
+    rows : int
+        The total number of rows.
+    payload_bytes : int
+        The memory used by the DataFrames, in bytes.
+    """
+    if isinstance(result, pd.DataFrame):
+        frames = [result]
+    elif isinstance(result, list):
+        frames = [df for series in result for df in series.values()]
+    else:
+        frames = list(result.values()) if isinstance(result, dict) else []
+
+    frames = [df for df in frames if isinstance(df, pd.DataFrame)]
+    rows = sum(df.index.size for df in frames)
+    payload_bytes = sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+
+    return rows, payload_bytes
@@ -0,0 +1,768 @@
+import asyncio
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+from astropy.time import Time, TimeDelta
+from lsst.summit.utils.tmaUtils import TMAState
+
+from lsst.sitcom.tn092.executor import run_sync
+
+
+__all__ = [
+    "LocalEfdClient",
+    "LocalInfluxClient",
+    "LocalTMAEvent",
+    "LocalTMAEventMaker",
+    "get_efd_data",
+    "make_synthetic_efd",
+]
+
+
+class LocalInfluxClient:
+    """
+    In-memory stand-in for ``EfdClient.influx_client``.
+
+    It replays time-indexed DataFrames, one per topic, and answers the
+    subset of InfluxQL that `lsst.sitcom.tn092.query` sends: column
+    projections, the MIN, MAX, MEAN, MEDIAN, FIRST, LAST, STDDEV, SPREAD,
+    COUNT, SUM and PERCENTILE aggregates, time ranges, ``=``/``=~``
+    conditions combined with AND/OR, ``GROUP BY time()`` and several
+    statements per request. Results follow the dataframe mode of the influx
+    client: a DataFrame for a single statement, or ``{}`` if it has no data,
+    and a list of ``{topic: DataFrame}`` dictionaries for several
+    statements.
+
+    Parameters
+    ----------
+    topics : dict of str to pandas.DataFrame
+        The data of each topic, indexed by UTC time.
+    latency : float, optional
+        Delay added to every request, in seconds (default is 0).
+    failure_rate : float, optional
+        Probability that a request raises `ConnectionError`
+        (default is 0).
+    seed : int, optional
+        The seed of the failure generator.
+
+    Attributes
+    ----------
+    n_requests : int
+        Number of requests received.
+    n_statements : int
+        Number of InfluxQL statements received.
+    n_rows : int
+        Number of rows returned.
+    """
+
+    def __init__(self, topics, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = np.random.default_rng(seed)
+        self._topics = {}
+        self._times = {}
+        self._columns = {}
+
+        for topic, df in topics.items():
+            self.add_topic(topic, df)
+
+        self.reset_counters()
+
+    def add_topic(self, topic, df):
+        """
+        Add or replace the data of a topic.
+
+        Parameters
+        ----------
+        topic : str
+            The topic name, e.g. "lsst.sal.MTMount.azimuth".
+        df : pandas.DataFrame
+            The data, indexed by time. Naive times are taken as UTC.
+        """
+        df = df.copy()
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            df.index = index.tz_localize("UTC")
+        else:
+            df.index = index.tz_convert("UTC")
+        df = df.sort_index()
+
+        self._topics[topic] = df
+        self._times[topic] = _unix_ns(df.index)
+        self._columns[topic] = {column: df[column].to_numpy() for column in df.columns}
+
+    def reset_counters(self):
+        """
+        Set the request, statement and row counters back to zero.
+        """
+        self.n_requests = 0
+        self.n_statements = 0
+        self.n_rows = 0
+
+    async def query(self, query):
+        """
+        Answer an InfluxQL request.
+
+        Parameters
+        ----------
+        query : str
+            One or more InfluxQL statements separated by ";".
+
+        Returns
+        -------
+        pandas.DataFrame, dict or list
+            The results, in the format of the influx client dataframe mode.
+        """
+        self.n_requests += 1
+
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        if self.failure_rate > 0 and self._rng.random() < self.failure_rate:
+            raise ConnectionError("Simulated EFD failure.")
+
+        statements = [st for st in query.split(";") if st.strip()]
+        self.n_statements += len(statements)
+
+        results = []
+        for statement in statements:
+            topic, df = self._run_statement(statement)
+            self.n_rows += df.index.size
+            results.append({} if df.empty else {topic: df})
+
+        if len(results) == 1:
+            return next(iter(results[0].values())) if results[0] else {}
+
+        return results
+
+    def _run_statement(self, statement):
+        match = _STATEMENT.match(" ".join(statement.split()))
+        if match is None:
+            raise ValueError(f"Unsupported statement: {statement}")
+
+        topic = match["topic"]
+        if topic not in self._topics:
+            return topic, pd.DataFrame()
+
+        df = self._topics[topic]
+        columns = self._columns[topic]
+        begin, end, rows = _evaluate_where(match["where"], columns, self._times[topic])
+        times = self._times[topic][rows]
+
+        fields = _parse_fields(match["fields"])
+        aggregate = any(func is not None for func, _, _, _ in fields)
+
+        if match["group"] is not None:
+            interval, fill_none = _parse_group_by(match["group"])
+            grouped = _grouped(
+                columns, rows, times, fields, begin, end, interval, fill_none
+            )
+            return topic, grouped
+
+        if not aggregate:
+            selected = []
+            for _, column, _, _ in fields:
+                selected.extend(df.columns if column == "*" else [column])
+            return topic, df.iloc[rows][[c for c in selected if c in df.columns]]
+
+        if times.size == 0:
+            return topic, pd.DataFrame()
+
+        values = [
+            _aggregate(func, columns[column][rows], arg)
+            for func, column, arg, _ in fields
+        ]
+        index = pd.DatetimeIndex([pd.Timestamp(begin, unit="ns", tz="UTC")], name="time")
+        return topic, _single_row(values, _aliases(fields), index)
+
+
+class LocalEfdClient:
+    """
+    Stand-in for `lsst_efd_client.EfdClient` backed by `LocalInfluxClient`.
+
+    Parameters
+    ----------
+    topics : dict of str to pandas.DataFrame
+        The data of each topic, indexed by UTC time.
+    **kwargs
+        Passed to `LocalInfluxClient`.
+    """
+
+    def __init__(self, topics, **kwargs):
+        self.influx_client = LocalInfluxClient(topics, **kwargs)
+
+
+class LocalTMAEvent:
+    """
+    Minimal stand-in for `lsst.summit.utils.tmaUtils.TMAEvent`.
+
+    Parameters
+    ----------
+    day_obs : int
+        The day_obs of the event.
+    seq_num : int
+        The sequence number of the event.
+    begin, end : astropy.time.Time
+        The time range of the event.
+    event_type : TMAState, optional
+        The type of the event (default is SLEWING).
+    end_reason : TMAState, optional
+        Why the event ended (default is TRACKING).
+    """
+
+    def __init__(
+        self,
+        day_obs,
+        seq_num,
+        begin,
+        end,
+        event_type=TMAState.SLEWING,
+        end_reason=TMAState.TRACKING,
+    ):
+        self.dayObs = day_obs
+        self.seqNum = seq_num
+        self.begin = begin
+        self.end = end
+        self.type = event_type
+        self.endReason = end_reason
+
+    def __repr__(self):
+        return f"LocalTMAEvent(dayObs={self.dayObs}, seqNum={self.seqNum})"
+
+
+class LocalTMAEventMaker:
+    """
+    Minimal stand-in for `lsst.summit.utils.tmaUtils.TMAEventMaker`.
+
+    Like the real one, it reads the mount telemetry of the day_obs with
+    its client, from the event loop of the calling thread.
+
+    Parameters
+    ----------
+    client : LocalEfdClient
+        The local client.
+    events : list of LocalTMAEvent
+        The events to return, e.g. the events of `make_synthetic_efd`.
+    """
+
+    def __init__(self, client, events):
+        self.client = client
+        self.events = list(events)
+
+    def getEvents(self, dayObs):
+        """
+        Return the events of a day_obs.
+        """
+        events = [evt for evt in self.events if evt.dayObs == dayObs]
+        if len(events) > 0:
+            get_efd_data(
+                self.client,
+                "lsst.sal.MTMount.azimuth",
+                begin=events[0].begin,
+                end=events[-1].end,
+            )
+        return events
+
+
+def get_efd_data(
+    client, topic, columns=None, begin=None, end=None, event=None, **kwargs
+):
+    """
+    Stand-in for `lsst.summit.utils.efdUtils.getEfdData` that reads from a
+    `LocalEfdClient`.
+
+    Parameters
+    ----------
+    client : LocalEfdClient
+        The local client.
+    topic : str
+        The topic to read.
+    columns : list of str or "*", optional
+        The columns to read (default is all of them).
+    begin, end : astropy.time.Time, optional
+        The time range to read.
+    event : TMAEvent, optional
+        Read the time range of this event instead.
+    **kwargs
+        Ignored, accepted for compatibility.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data of the topic in the time range.
+    """
+    if event is not None:
+        begin, end = event.begin, event.end
+
+    fields = "*" if columns in (None, "*") else ", ".join(f'"{c}"' for c in columns)
+    query = (
+        f'SELECT {fields} FROM "{topic}" '
+        f"WHERE time >= '{begin.utc.isot}Z' AND time <= '{end.utc.isot}Z'"
+    )
+
+    return pd.DataFrame(run_sync(client.influx_client.query(query)))
+
+
+def make_synthetic_efd(
+    n_events,
+    start="2024-11-28T00:00:00",
+    slew_duration=10.0,
+    gap=5.0,
+    rate=2.0,
+    seed=0,
+    **kwargs,
+):
+    """
+    Build a local EFD with synthetic TMA slews.
+
+    Parameters
+    ----------
+    n_events : int
+        Number of slews.
+    start : str or astropy.time.Time, optional
+        The begin of the first slew.
+    slew_duration : float, optional
+        Duration of each slew, in seconds (default is 10).
+    gap : float, optional
+        Time between slews, in seconds (default is 5).
+    rate : float, optional
+        Sample rate of the mount and hardpoint telemetry, in Hz. Keep it low
+        for large numbers of events (default is 2).
+    seed : int, optional
+        The seed of the random data (default is 0).
+    **kwargs
+        Passed to `LocalInfluxClient`.
+
+    Returns
+    -------
+    client : LocalEfdClient
+        The local client with the MTMount azimuth and elevation,
+        MTM1M3 hardpointActuatorData and Script/Scheduler topics.
+    events : list of LocalTMAEvent
+        The slews, one Script and block execution per slew.
+    """
+    rng = np.random.default_rng(seed)
+    start = Time(start, scale="utc")
+
+    period = slew_duration + gap
+    begin_sec = np.arange(n_events) * period
+    begins = start + TimeDelta(begin_sec, format="sec")
+    ends = start + TimeDelta(begin_sec + slew_duration, format="sec")
+
+    # Day_obs changes at 12:00 UTC.
+    day_obs = (begins - TimeDelta(12 * 3600, format="sec")).datetime64
+    day_obs = np.char.replace(day_obs.astype("datetime64[D]").astype(str), "-", "")
+    end_reasons = rng.choice(
+        [TMAState.TRACKING, TMAState.STOPPED, TMAState.FAULT],
+        n_events,
+        p=[0.8, 0.15, 0.05],
+    )
+
+    events = [
+        LocalTMAEvent(
+            int(day_obs[i]),
+            i,
+            begins[i],
+            ends[i],
+            end_reason=TMAState(int(end_reasons[i])),
+        )
+        for i in range(n_events)
+    ]
+
+    n_samples = int(np.ceil(n_events * period * rate))
+    t = np.arange(n_samples) / rate
+    index = pd.to_datetime(start.unix + t, unit="s", utc=True)
+
+    topics = {
+        "lsst.sal.MTMount.azimuth": pd.DataFrame(
+            {"actualPosition": 180 * np.sin(t / 600)}, index=index
+        ),
+        "lsst.sal.MTMount.elevation": pd.DataFrame(
+            {"actualPosition": 55 + 30 * np.sin(t / 900)}, index=index
+        ),
+        "lsst.sal.MTM1M3.hardpointActuatorData": pd.DataFrame(
+            {
+                f"measuredForce{hp}": rng.normal(0, 300, n_samples)
+                for hp in range(6)
+            },
+            index=index,
+        ),
+    }
+
+    script_index = pd.to_datetime(begins.unix, unit="s", utc=True)
+    sal_index = 100000 + np.arange(n_events)
+    block_ids = [f"BL{227 + i % 3}_O_{day_obs[i]}_{i:06d}" for i in range(n_events)]
+
+    topics["lsst.sal.Script.logevent_state"] = pd.DataFrame(
+        {"salIndex": sal_index, "blockId": block_ids, "state": 8, "reason": ""},
+        index=script_index,
+    )
+    topics["lsst.sal.Script.logevent_description"] = pd.DataFrame(
+        {"salIndex": sal_index, "classname": "MoveP2P", "description": ""},
+        index=script_index,
+    )
+    topics["lsst.sal.Script.command_configure"] = pd.DataFrame(
+        {"salIndex": sal_index, "config": "{}", "blockId": block_ids},
+        index=script_index,
+    )
+    topics["lsst.sal.Script.logevent_logMessage"] = pd.DataFrame(
+        {"salIndex": sal_index, "message": "Running", "level": 20},
+        index=script_index,
+    )
+    topics["lsst.sal.Scheduler.logevent_blockStatus"] = pd.DataFrame(
+        {
+            "id": [f"BLOCK-T{227 + i % 3}" for i in range(n_events)],
+            "executionId": np.arange(n_events),
+            "status": "COMPLETED",
+        },
+        index=script_index,
+    )
+
+    return LocalEfdClient(topics, **kwargs), events
+
+
+_STATEMENT = re.compile(
+    r"^SELECT (?P<fields>.+?) FROM \"(?P<topic>[^\"]+)\""
+    r"(?: WHERE (?P<where>.+?))?(?: GROUP BY (?P<group>.+?))?$",
+    re.IGNORECASE,
+)
+_FIELD = re.compile(
+    r"^(?:(?P<func>\w+)\(\s*\"?(?P<agg_column>[\w*]+)\"?\s*"
+    r"(?:,\s*(?P<arg>[\d.]+))?\s*\)"
+    r"|\"?(?P<column>[\w*]+)\"?)(?:\s+AS\s+\"?(?P<alias>[\w.]+)\"?)?$",
+    re.IGNORECASE,
+)
+_TIME_CONDITION = re.compile(r"^time\s*(?P<op>>=|<=|>|<)\s*'(?P<time>[^']+)'$")
+_CONDITION = re.compile(
+    r"^\"?(?P<column>\w+)\"?\s*(?P<op>=~|!=|>=|<=|=|>|<)\s*(?P<value>.+)$"
+)
+_GROUP_BY = re.compile(
+    r"^time\((?P<value>[\d.]+)(?P<unit>ms|s|m|h|d)\)(?:\s+fill\((?P<fill>\w+)\))?$"
+)
+_UNITS_NS = {
+    "ms": 10**6,
+    "s": 10**9,
+    "m": 60 * 10**9,
+    "h": 3600 * 10**9,
+    "d": 86400 * 10**9,
+}
+
+
+def _unix_ns(index):
+    delta = index - pd.Timestamp(0, tz="UTC")
+    return np.asarray(delta // pd.Timedelta(1, "ns"), dtype=np.int64)
+
+
+def _split_top_level(text, separator=","):
+    """
+    Split on a separator that is not inside parentheses.
+    """
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current).strip())
+    return parts
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_fields(fields):
+    return tuple(_parse_field(field) for field in _split_top_level(fields))
+
+
+@functools.lru_cache(maxsize=256)
+def _aliases(fields):
+    """
+    The result columns of parsed fields, as an object Index, which is much
+    faster to build DataFrames with than a list of strings.
+    """
+    return pd.Index([alias for *_, alias in fields], dtype=object)
+
+
+def _parse_field(field):
+    match = _FIELD.match(field)
+    if match is None:
+        raise ValueError(f"Unsupported field: {field}")
+
+    if match["func"] is not None:
+        func = match["func"].lower()
+        column = match["agg_column"]
+        return func, column, match["arg"], match["alias"] or func
+
+    column = match["column"]
+    return None, column, None, match["alias"] or column
+
+
+def _evaluate_where(where, columns, times):
+    """
+    Evaluate a WHERE clause into the time bounds, in ns, and the selected
+    rows, as a slice or an array of positions.
+
+    The time conditions are resolved with `numpy.searchsorted` on the
+    sorted times, and the other conditions on the column arrays of the rows
+    in the time range only.
+    """
+    begin, end = None, None
+    lo, hi = 0, times.size
+    conditions = []
+
+    clauses = [] if where is None else _split_keyword(where, " AND ")
+    for clause in clauses:
+        clause = clause.strip()
+        time_match = _TIME_CONDITION.match(clause)
+
+        if time_match is None:
+            conditions.append(clause)
+            continue
+
+        value = _parse_time(time_match["time"])
+        op = time_match["op"]
+        if op in (">=", ">"):
+            begin = value
+            side = "left" if op == ">=" else "right"
+            lo = max(lo, int(np.searchsorted(times, value, side=side)))
+        else:
+            end = value
+            side = "right" if op == "<=" else "left"
+            hi = min(hi, int(np.searchsorted(times, value, side=side)))
+
+    rows = slice(lo, max(lo, hi))
+
+    if conditions and hi > lo:
+        # Slices of the column arrays are views, so this copies nothing.
+        selected = {column: values[rows] for column, values in columns.items()}
+        mask = np.logical_and.reduce(
+            [_evaluate_or(c, selected, hi - lo) for c in conditions]
+        )
+        rows = lo + np.flatnonzero(mask)
+
+    if begin is None:
+        selected = times[rows]
+        begin = selected[0] if selected.size else 0
+
+    return begin, end, rows
+
+
+def _parse_time(text):
+    """
+    Convert an RFC3339 time string to unix nanoseconds.
+    """
+    if text.endswith("Z"):
+        return int(np.datetime64(text[:-1], "ns").astype(np.int64))
+    return pd.Timestamp(text).value
+
+
+def _evaluate_or(clause, columns, size):
+    if clause.startswith("(") and clause.endswith(")"):
+        clause = clause[1:-1]
+
+    mask = np.zeros(size, dtype=bool)
+    for part in _split_keyword(clause, " OR "):
+        part = part.strip()
+        if part.startswith("(") and part.endswith(")"):
+            part = part[1:-1]
+        conditions = _split_keyword(part, " AND ")
+        mask |= np.logical_and.reduce(
+            [_evaluate_condition(cond.strip(), columns, size) for cond in conditions]
+        )
+    return mask
+
+
+def _evaluate_condition(condition, columns, size):
+    match = _CONDITION.match(condition)
+    if match is None:
+        raise ValueError(f"Unsupported condition: {condition}")
+
+    column, op, value = match["column"], match["op"], match["value"].strip()
+    if column not in columns:
+        return np.zeros(size, dtype=bool)
+
+    values = columns[column]
+
+    if op == "=~":
+        pattern = value.strip("/")
+        strings = pd.Series(values, dtype=object).astype(str)
+        return strings.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+    if value.startswith("'"):
+        value = value[1:-1].replace("\\'", "'").replace("\\\\", "\\")
+        values = values.astype(str)
+    else:
+        value = float(value)
+
+    return _compare(values, op, value)
+
+
+def _split_keyword(text, keyword):
+    """
+    Split on a keyword, e.g. " AND ", that is not inside parentheses.
+    """
+    parts, start = [], 0
+    upper = text.upper()
+    i = upper.find(keyword)
+    while i >= 0:
+        if text.count("(", start, i) == text.count(")", start, i):
+            parts.append(text[start:i])
+            start = i + len(keyword)
+        i = upper.find(keyword, i + len(keyword))
+    parts.append(text[start:])
+    return parts
+
+
+def _compare(values, op, value):
+    if op == "=":
+        return values == value
+    if op == "!=":
+        return values != value
+    if op == ">=":
+        return values >= value
+    if op == "<=":
+        return values <= value
+    if op == ">":
+        return values > value
+    return values < value
+
+
+def _aggregate(func, values, arg=None):
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        values = values[~np.isnan(values)]
+
+    if values.size == 0:
+        return None
+    if func == "min":
+        return values.min()
+    if func == "max":
+        return values.max()
+    if func == "mean":
+        return values.mean()
+    if func == "median":
+        return np.median(values)
+    if func == "first":
+        return values[0]
+    if func == "last":
+        return values[-1]
+    if func == "stddev":
+        return values.std(ddof=1) if values.size > 1 else None
+    if func == "spread":
+        return values.max() - values.min()
+    if func == "count":
+        return values.size
+    if func == "sum":
+        return values.sum()
+    if func == "percentile":
+        # InfluxQL uses the nearest rank, and returns null when it is out
+        # of range, e.g. for low percentiles of few values.
+        rank = int(np.floor(values.size * float(arg) / 100 + 0.5)) - 1
+        if not 0 <= rank < values.size:
+            return None
+        return np.sort(values)[rank]
+
+    raise ValueError(f"Unsupported aggregate: {func.upper()}")
+
+
+def _parse_group_by(group):
+    match = _GROUP_BY.match(group.strip())
+    if match is None:
+        raise ValueError(f"Unsupported GROUP BY: {group}")
+
+    interval = int(float(match["value"]) * _UNITS_NS[match["unit"]])
+    return interval, (match["fill"] or "null").lower() == "none"
+
+
+def _grouped(columns, rows, times, fields, begin, end, interval, fill_none):
+    """
+    Aggregate rows into time buckets aligned to the epoch, like
+    ``GROUP BY time(interval)``.
+    """
+    # The buckets cover the rows selected, including one at an inclusive
+    # end of the time range.
+    last = end if end is not None else begin
+    if times.size:
+        last = max(last, times[-1] + 1)
+    starts = np.arange(begin - begin % interval, last, interval, dtype=np.int64)
+    bounds = np.append(np.searchsorted(times, starts), times.size)
+
+    keep = np.diff(bounds) > 0 if fill_none else np.ones(starts.size, dtype=bool)
+    if not keep.any():
+        return pd.DataFrame()
+
+    data = {
+        alias: _grouped_aggregate(func, columns[column][rows], bounds, arg)[keep]
+        for func, column, arg, alias in fields
+    }
+    index = pd.DatetimeIndex(pd.to_datetime(starts[keep], unit="ns", utc=True))
+    return pd.DataFrame(data, index=index.rename("time"))
+
+
+def _grouped_aggregate(func, values, bounds, arg=None):
+    """
+    Aggregate consecutive groups of values, ``values[bounds[i]:bounds[i +
+    1]]``, with the semantics of `_aggregate`.
+
+    The common aggregates of float columns without NaN are computed for all
+    the groups at once with `numpy.ufunc.reduceat`.
+    """
+    counts = np.diff(bounds)
+    nonempty = counts > 0
+    firsts = bounds[:-1][nonempty]
+
+    vectorized = (
+        func in ("min", "max", "mean", "sum", "spread", "first", "last", "count")
+        and values.dtype.kind == "f"
+        and firsts.size > 0
+        and not np.isnan(values).any()
+    )
+    if not vectorized:
+        # Let pandas infer the dtype, e.g. float with NaN for empty groups.
+        result = [
+            _aggregate(func, values[bounds[i] : bounds[i + 1]], arg)
+            for i in range(counts.size)
+        ]
+        return pd.Series(result).to_numpy()
+
+    if func == "count":
+        return counts if nonempty.all() else np.where(nonempty, counts, np.nan)
+
+    if func == "first":
+        reduced = values[firsts]
+    elif func == "last":
+        reduced = values[bounds[1:][nonempty] - 1]
+    elif func == "min":
+        reduced = np.minimum.reduceat(values, firsts)
+    elif func == "max":
+        reduced = np.maximum.reduceat(values, firsts)
+    elif func == "spread":
+        reduced = np.maximum.reduceat(values, firsts) - np.minimum.reduceat(
+            values, firsts
+        )
+    else:
+        reduced = np.add.reduceat(values, firsts)
+        if func == "mean":
+            reduced = reduced / counts[nonempty]
+
+    result = np.full(counts.size, np.nan)
+    result[nonempty] = reduced
+    return result
+
+
+def _single_row(values, aliases, index):
+    """
+    Build the one-row result of an aggregate statement. Float results, the
+    common case, are stored in a single block, which is much faster.
+    """
+    if all(value is None or isinstance(value, float) for value in values):
+        data = np.array([[np.nan if value is None else value for value in values]])
+        return pd.DataFrame(data, index=index, columns=aliases)
+
+    data = {alias: [value] for alias, value in zip(aliases, values)}
+    return pd.DataFrame(data, index)
@@ -0,0 +1,701 @@
+import collections
+import itertools
+import multiprocessing
+import os
+import subprocess
+
+import numpy as np
+
+from astropy.time import Time
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LightSource
+from matplotlib.figure import Figure
+
+from lsst.ts.xml.tables.m1m3 import FAOrientation, FATable, FAType
+
+from lsst.sitcom.tn092.instrumentation import span
+from lsst.sitcom.tn092.query import fa_force_columns, m1m3_fa_forces_chunks
+
+
+__all__ = [
+    "ActuatorGeometry",
+    "MovieRenderer",
+    "actuator_forces",
+    "make_movie",
+    "movie_limits",
+    "read_fa_forces",
+    "render_frames",
+    "write_movie",
+]
+
+
+# The marker groups of the actuator maps: (type, orientation, marker, label,
+# color).
+ACTUATOR_GROUPS = [
+    (FAType.SAA, FAOrientation.NA, "o", "Z", "b"),
+    (FAType.DAA, FAOrientation.Y_PLUS, "^", "+Y", "g"),
+    (FAType.DAA, FAOrientation.Y_MINUS, "v", "-Y", "cyan"),
+    (FAType.DAA, FAOrientation.X_PLUS, ">", "+X", "r"),
+    (FAType.DAA, FAOrientation.X_MINUS, "<", "-X", "r"),
+]
+
+# Unit cube faces in the order used by `Axes3D.bar3d`, so the shaded face
+# colors it computes still match the polygons built by `_bar_polygons`.
+_CUBOID = np.array(
+    [
+        ((0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)),
+        ((0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)),
+        ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)),
+        ((0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)),
+        ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)),
+        ((1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)),
+    ],
+    dtype=float,
+)
+
+_BAR_SIZE = 0.2
+_HARDPOINT_RADIUS = 3.1
+
+
+class ActuatorGeometry:
+    """
+    Positions, types and force columns of the M1M3 force actuators, taken
+    once from `FATable` and stored as arrays.
+
+    Parameters
+    ----------
+    fa_table : list, optional
+        The force actuator table (default is
+        `lsst.ts.xml.tables.m1m3.FATable`).
+
+    Attributes
+    ----------
+    x, y : numpy.ndarray
+        The position of each actuator, in m.
+    z_column : numpy.ndarray of int
+        The column of the Z force of each actuator in the force matrix,
+        whose columns are ``fa_force_columns("xyz")``.
+    lateral_column : numpy.ndarray of int
+        The column of the lateral force of each actuator, or -1 for the
+        single axis actuators.
+    lateral_direction : numpy.ndarray
+        The ``(n_actuators, 2)`` unit vectors of the lateral forces in the
+        mirror plane, zero for the single axis actuators.
+    groups : list of tuple
+        The ``(mask, marker, label, color)`` of each marker group.
+    hardpoints : numpy.ndarray
+        The approximate ``(6, 2)`` positions of the hardpoints, in m.
+    """
+
+    def __init__(self, fa_table=None):
+        if fa_table is None:
+            fa_table = FATable
+
+        columns = {name: i for i, name in enumerate(fa_force_columns("xyz"))}
+        directions = {
+            FAOrientation.X_PLUS: ("x", (1, 0)),
+            FAOrientation.X_MINUS: ("x", (-1, 0)),
+            FAOrientation.Y_PLUS: ("y", (0, 1)),
+            FAOrientation.Y_MINUS: ("y", (0, -1)),
+        }
+
+        n = len(fa_table)
+        self.x = np.array([fa.x_position for fa in fa_table], dtype=float)
+        self.y = np.array([fa.y_position for fa in fa_table], dtype=float)
+        self.z_column = np.array(
+            [columns[f"zForce{fa.z_index}"] for fa in fa_table], dtype=int
+        )
+        self.lateral_column = np.full(n, -1, dtype=int)
+        self.lateral_direction = np.zeros((n, 2))
+
+        for i, fa in enumerate(fa_table):
+            if fa.actuator_type != FAType.DAA or fa.orientation not in directions:
+                continue
+            axis, direction = directions[fa.orientation]
+            index = fa.x_index if axis == "x" else fa.y_index
+            self.lateral_column[i] = columns[f"{axis}Force{index}"]
+            self.lateral_direction[i] = direction
+
+        types = np.array([fa.actuator_type for fa in fa_table], dtype=object)
+        orientations = np.array([fa.orientation for fa in fa_table], dtype=object)
+        self.groups = [
+            ((types == fa_type) & (orientations == orientation), marker, label, color)
+            for fa_type, orientation, marker, label, color in ACTUATOR_GROUPS
+        ]
+
+        theta = 2 * np.pi * np.arange(6) / 6
+        self.hardpoints = _HARDPOINT_RADIUS * np.column_stack(
+            [np.cos(theta), np.sin(theta)]
+        )
+
+    def __len__(self):
+        return self.x.size
+
+    @property
+    def is_lateral(self):
+        """
+        Mask of the dual axis actuators, which have a lateral force.
+        """
+        return self.lateral_column >= 0
+
+    def bar_colors(self):
+        """
+        The face colors of the Z force bars: the top and bottom in the color
+        of the actuator type and the sides in grey.
+        """
+        colors = []
+        for i in range(len(self)):
+            if not self.is_lateral[i]:
+                color = "blue"
+            elif self.lateral_direction[i, 1] != 0:
+                color = "green"
+            else:
+                color = "red"
+            colors.extend([color, color] + ["0.9"] * 4)
+        return colors
+
+
+def read_fa_forces(efd_client, begin, end, step=1, **kwargs):
+    """
+    Read the forces of all the M1M3 force actuators in a time range as a
+    single matrix.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    begin, end : int or astropy.time.Time
+        The time range to read. Integers are taken as day_obs.
+    step : int, optional
+        Keep one sample every ``step`` samples (default is 1, all of them).
+    **kwargs
+        Passed to `lsst.sitcom.tn092.query.m1m3_fa_forces_chunks`, e.g.
+        ``dtype=np.float32``.
+
+    Returns
+    -------
+    times : numpy.ndarray
+        The unix timestamps of the samples, in seconds.
+    values : numpy.ndarray
+        The ``(n_samples, 268)`` forces, in N, with the columns given by
+        ``fa_force_columns("xyz")``.
+    """
+    times, values = [], []
+    offset = 0
+
+    # Apply the step across chunk boundaries.
+    for chunk_times, chunk_values in m1m3_fa_forces_chunks(
+        efd_client, begin, end, axes="xyz", **kwargs
+    ):
+        first = (-offset) % step
+        times.append(chunk_times[first::step])
+        values.append(chunk_values[first::step])
+        offset += chunk_times.size
+
+    if len(times) == 0:
+        return np.empty(0), np.empty((0, len(fa_force_columns("xyz"))))
+
+    return np.concatenate(times), np.concatenate(values)
+
+
+def actuator_forces(values, geometry, baseline=None):
+    """
+    Split a force matrix into the per-actuator Z and lateral forces used by
+    the movie frames.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The ``(n_frames, 268)`` forces, with the columns given by
+        ``fa_force_columns("xyz")``.
+    geometry : ActuatorGeometry
+        The actuator geometry.
+    baseline : tuple of int, optional
+        If given, the ``(first, last)`` sample range whose median is
+        subtracted from every frame (default is None, no subtraction).
+
+    Returns
+    -------
+    z : numpy.ndarray
+        The ``(n_frames, n_actuators)`` Z forces, in N.
+    lateral : numpy.ndarray
+        The ``(n_frames, n_actuators, 2)`` lateral forces in the mirror
+        plane, in N, zero for the single axis actuators.
+    """
+    values = np.asarray(values)
+
+    if baseline is not None:
+        first, last = baseline
+        values = values - np.median(values[first:last], axis=0)
+
+    z = values[:, geometry.z_column]
+
+    lateral_column = np.where(geometry.is_lateral, geometry.lateral_column, 0)
+    lateral_force = np.where(geometry.is_lateral, values[:, lateral_column], 0)
+    lateral = lateral_force[..., np.newaxis] * geometry.lateral_direction
+
+    return z, lateral
+
+
+def movie_limits(z, lateral):
+    """
+    Scale limits that keep every frame of a movie on the same scale.
+
+    Parameters
+    ----------
+    z : numpy.ndarray
+        The Z forces from `actuator_forces`.
+    lateral : numpy.ndarray
+        The lateral forces from `actuator_forces`.
+
+    Returns
+    -------
+    zmin, zmax : int
+        The range of the Z forces, always including 0, in N.
+    lateral_max : int
+        The largest lateral force, used to scale the arrows, in N.
+    """
+    zmin = min(0.0, float(np.nanmin(z))) if z.size else 0.0
+    zmax = max(0.0, float(np.nanmax(z))) if z.size else 0.0
+    lateral_max = float(np.nanmax(np.abs(lateral))) if lateral.size else 0.0
+
+    return round(zmin), round(zmax), max(round(lateral_max), 1)
+
+
+class MovieRenderer:
+    """
+    Draw the frames of an M1M3 actuator movie on a single figure.
+
+    The figure has the actuator layout, a 3D bar chart and a heat map of
+    the Z forces and the lateral forces as arrows. The figure and its
+    artists are built once, and every frame only updates the bar heights,
+    the heat map colors and the arrows in place before drawing.
+
+    Parameters
+    ----------
+    geometry : ActuatorGeometry
+        The actuator geometry.
+    limits : tuple
+        The ``(zmin, zmax, lateral_max)`` from `movie_limits`.
+    figsize : tuple of float, optional
+        The size of the figure, in inches (default is 16 x 16).
+    dpi : int, optional
+        The resolution of the frames (default is 72).
+    """
+
+    def __init__(self, geometry, limits, figsize=(16, 16), dpi=72):
+        self.geometry = geometry
+        self.zmin, self.zmax, self.lateral_max = limits
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+
+        self._draw_layout(self.figure.add_subplot(2, 2, 1))
+        self._draw_bars(self.figure.add_subplot(2, 2, 2, projection="3d"))
+        self._draw_lateral(self.figure.add_subplot(2, 2, 3))
+        self._draw_heat_map(self.figure.add_subplot(2, 2, 4))
+        self._title = self.figure.suptitle("", fontsize=18)
+
+    @property
+    def size(self):
+        """
+        The ``(width, height)`` of the frames, in pixels.
+        """
+        return self.canvas.get_width_height()
+
+    def update(self, z, lateral, title=""):
+        """
+        Update the artists with the forces of one frame.
+
+        Parameters
+        ----------
+        z : numpy.ndarray
+            The Z force of each actuator, in N.
+        lateral : numpy.ndarray
+            The ``(n_actuators, 2)`` lateral forces, in N.
+        title : str, optional
+            The title of the frame, e.g. its time.
+        """
+        geometry = self.geometry
+
+        self._bars.set_verts(_bar_polygons(geometry.x, geometry.y, z))
+
+        for scatter, (mask, _, _, _) in zip(self._heat_maps, geometry.groups):
+            scatter.set_array(z[mask])
+
+        arrows = lateral[geometry.is_lateral] / self.lateral_max
+        self._arrows.set_UVC(arrows[:, 0], arrows[:, 1])
+
+        self._title.set_text(title)
+
+    def render(self, z, lateral, title=""):
+        """
+        Update the artists and draw one frame.
+
+        Returns
+        -------
+        numpy.ndarray
+            The ``(height, width, 4)`` RGBA pixels of the frame.
+        """
+        self.update(z, lateral, title)
+        self.canvas.draw()
+        return np.array(self.canvas.buffer_rgba())
+
+    def _draw_layout(self, ax):
+        ax.set_xlabel("X position (m)")
+        ax.set_ylabel("Y position (m)")
+        ax.set_title(
+            "M1M3 Actuator positions and type\nHardpoints are approximate",
+            fontsize=18,
+        )
+
+        for mask, marker, label, color in self.geometry.groups:
+            ax.scatter(
+                self.geometry.x[mask],
+                self.geometry.y[mask],
+                marker=marker,
+                color=color,
+                s=200,
+                label=label,
+            )
+
+        hardpoints = self.geometry.hardpoints
+        ax.scatter(
+            hardpoints[:, 0],
+            hardpoints[:, 1],
+            marker="o",
+            color="magenta",
+            s=200,
+            label="HP",
+        )
+        ax.legend(loc="lower left", fontsize=9)
+
+    def _draw_bars(self, ax):
+        ax.set_xlabel("X position (m)")
+        ax.set_ylabel("Y position (m)")
+        ax.set_zlabel("Force (nt)")
+        ax.set_title("M1M3 Actuator Z forces", fontsize=18)
+
+        n = len(self.geometry)
+        self._bars = ax.bar3d(
+            self.geometry.x,
+            self.geometry.y,
+            np.zeros(n),
+            np.full(n, _BAR_SIZE),
+            np.full(n, _BAR_SIZE),
+            np.ones(n),
+            shade=True,
+            alpha=0.5,
+            lightsource=LightSource(azdeg=180, altdeg=78),
+            color=self.geometry.bar_colors(),
+        )
+        ax.set_zlim(self.zmin, self.zmax)
+        ax.view_init(elev=30.0, azim=225)
+
+    def _draw_lateral(self, ax):
+        ax.set_xlabel("X position (m)")
+        ax.set_ylabel("Y position (m)")
+        ax.set_title("M1M3 lateral forces (nt)", fontsize=18)
+        ax.set_xlim(-4.5, 4.5)
+        ax.set_ylim(-4.5, 4.5)
+
+        geometry = self.geometry
+        for mask, marker, label, color in geometry.groups[1:]:
+            ax.scatter(
+                geometry.x[mask],
+                geometry.y[mask],
+                marker=marker,
+                color=color,
+                s=50,
+                label=label,
+            )
+
+        is_lateral = geometry.is_lateral
+        colors = np.where(geometry.lateral_direction[is_lateral, 0] != 0, "r", "g")
+        self._arrows = ax.quiver(
+            geometry.x[is_lateral],
+            geometry.y[is_lateral],
+            np.zeros(is_lateral.sum()),
+            np.zeros(is_lateral.sum()),
+            color=colors,
+            angles="xy",
+            scale_units="xy",
+            scale=1,
+            width=0.003,
+        )
+
+        ax.plot([-4.0, -3.0], [-4.0, -4.0], color="g")
+        ax.text(-4.0, -4.3, f"{self.lateral_max} nt")
+
+    def _draw_heat_map(self, ax):
+        ax.set_xlabel("X position (m)")
+        ax.set_ylabel("Y position (m)")
+        ax.set_title("M1M3 Actuator Z forces (nt)", fontsize=18)
+
+        self._heat_maps = []
+        for mask, marker, label, _ in self.geometry.groups:
+            self._heat_maps.append(
+                ax.scatter(
+                    self.geometry.x[mask],
+                    self.geometry.y[mask],
+                    marker=marker,
+                    c=np.zeros(mask.sum()),
+                    cmap="RdBu_r",
+                    vmin=self.zmin,
+                    vmax=self.zmax,
+                    s=50,
+                    label=label,
+                )
+            )
+
+        self.figure.colorbar(self._heat_maps[0], ax=ax, fraction=0.055, pad=0.02)
+
+
+def render_frames(
+    times,
+    z,
+    lateral,
+    geometry,
+    limits=None,
+    processes=None,
+    frames_per_task=8,
+    **kwargs,
+):
+    """
+    Render the frames of an actuator movie, in order, with a process pool.
+
+    Every worker builds one `MovieRenderer` and renders contiguous runs of
+    ``frames_per_task`` frames. Only a few tasks are in flight at a time, so
+    the frames can be streamed to an encoder without holding the whole
+    movie in memory.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        The unix timestamp of each frame, used as its title.
+    z, lateral : numpy.ndarray
+        The forces of each frame, from `actuator_forces`.
+    geometry : ActuatorGeometry
+        The actuator geometry.
+    limits : tuple, optional
+        The ``(zmin, zmax, lateral_max)`` of the frames (default is
+        `movie_limits` of the forces).
+    processes : int, optional
+        The number of worker processes. If 1, the frames are rendered in
+        this process (default is the number of CPUs).
+    frames_per_task : int, optional
+        The number of frames rendered by each task (default is 8).
+    **kwargs
+        Passed to `MovieRenderer`.
+
+    Yields
+    ------
+    numpy.ndarray
+        The ``(height, width, 4)`` RGBA pixels of each frame.
+    """
+    if limits is None:
+        limits = movie_limits(z, lateral)
+
+    titles = Time(times, format="unix").utc.isot if len(times) > 0 else []
+    tasks = (
+        (
+            z[i : i + frames_per_task],
+            lateral[i : i + frames_per_task],
+            titles[i : i + frames_per_task],
+        )
+        for i in range(0, len(times), frames_per_task)
+    )
+
+    if processes == 1:
+        _init_worker(geometry, limits, kwargs)
+        for task in tasks:
+            yield from _render_task(*task)
+        return
+
+    if processes is None:
+        processes = os.cpu_count()
+
+    # Spawn the workers: reading the forces with `read_fa_forces` may have
+    # started threads and event loops that a forked worker would copy.
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(geometry, limits, kwargs),
+    ) as pool:
+        pending = collections.deque()
+        max_pending = 2 * processes
+
+        for task in tasks:
+            pending.append(pool.submit(_render_task, *task))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_movie(frames, output, fps=50, ffmpeg="ffmpeg", codec_args=None):
+    """
+    Encode frames into a movie by streaming their pixels to ffmpeg.
+
+    Parameters
+    ----------
+    frames : iterable of numpy.ndarray
+        The ``(height, width, 4)`` RGBA frames, e.g. from `render_frames`.
+    output : str or pathlib.Path
+        The movie file.
+    fps : float, optional
+        The frame rate of the movie (default is 50).
+    ffmpeg : str, optional
+        The ffmpeg executable (default is "ffmpeg").
+    codec_args : list of str, optional
+        The output options of ffmpeg (default is H.264 with the yuv420p
+        pixel format).
+
+    Returns
+    -------
+    int
+        The number of frames written.
+    """
+    if codec_args is None:
+        codec_args = ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return 0
+
+    height, width = first.shape[:2]
+    command = [
+        ffmpeg,
+        "-loglevel", "error",
+        "-y",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgba",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "-",
+        # yuv420p needs even dimensions.
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        *codec_args,
+        str(output),
+    ]  # fmt: skip
+
+    n_frames = 0
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as encoder:
+        try:
+            for frame in itertools.chain([first], frames):
+                encoder.stdin.write(np.ascontiguousarray(frame).tobytes())
+                n_frames += 1
+        finally:
+            encoder.stdin.close()
+
+    if encoder.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed with exit code {encoder.returncode}.")
+
+    return n_frames
+
+
+def make_movie(
+    efd_client,
+    begin,
+    end,
+    output,
+    step=1,
+    baseline=(0, 100),
+    limits=None,
+    fps=50,
+    processes=None,
+    **kwargs,
+):
+    """
+    Make a movie of the M1M3 actuator forces in a time range.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    begin, end : astropy.time.Time
+        The time range of the movie.
+    output : str or pathlib.Path
+        The movie file.
+    step : int, optional
+        Make a frame every ``step`` samples (default is 1, every sample).
+        The other samples are dropped chunk by chunk as they are read, so
+        the forces are never held in memory at full rate.
+    baseline : tuple of int, optional
+        The ``(first, last)`` frames whose median is subtracted from the
+        forces, or None to plot the measured forces (default is the first
+        100 frames).
+    limits : tuple, optional
+        The ``(zmin, zmax, lateral_max)`` scale of the frames (default is
+        `movie_limits` of the forces).
+    fps : float, optional
+        The frame rate of the movie (default is 50).
+    processes : int, optional
+        The number of rendering processes (default is the number of CPUs).
+    **kwargs
+        Passed to `MovieRenderer`.
+
+    Returns
+    -------
+    int
+        The number of frames written.
+    """
+    with span("fetch"):
+        times, values = read_fa_forces(efd_client, begin, end, step=step)
+
+    geometry = ActuatorGeometry()
+    z, lateral = actuator_forces(values, geometry, baseline=baseline)
+    del values
+
+    if limits is None:
+        limits = movie_limits(z, lateral)
+
+    with span("render", n_frames=len(times)):
+        frames = render_frames(
+            times,
+            z,
+            lateral,
+            geometry,
+            limits=limits,
+            processes=processes,
+            **kwargs,
+        )
+        return write_movie(frames, output, fps=fps)
+
+
+_worker_renderer = None
+
+
+def _init_worker(geometry, limits, kwargs):
+    """
+    Build the renderer of a worker process.
+    """
+    global _worker_renderer
+    _worker_renderer = MovieRenderer(geometry, limits, **kwargs)
+
+
+def _render_task(z, lateral, titles):
+    """
+    Render a run of frames with the renderer of the worker process.
+    """
+    return [
+        _worker_renderer.render(z[i], lateral[i], title)
+        for i, title in enumerate(titles)
+    ]
+
+
+def _bar_polygons(x, y, heights):
+    """
+    The polygons of the Z force bars, in the order of `Axes3D.bar3d`.
+    """
+    origin = np.column_stack([x, y, np.zeros_like(x)])
+    size = np.column_stack(
+        [np.full_like(x, _BAR_SIZE), np.full_like(x, _BAR_SIZE), heights]
+    )
+    polygons = origin[:, None, None, :] + size[:, None, None, :] * _CUBOID
+    return polygons.reshape(-1, 4, 3)
+
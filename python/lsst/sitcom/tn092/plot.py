@@ -1,49 +1,120 @@
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import multiprocessing
+import numpy as np
 import os
+import pandas as pd
 
+from astropy.time import Time
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from lsst.summit.utils.efdUtils import getDayObsEndTime, getDayObsStartTime
 from lsst.summit.utils.tmaUtils import TMAState
 
-__all__ = ["histogram_hp_minmax_forces"]
+from lsst.sitcom.tn092.histogram import HardpointForcesHistogram
+from lsst.sitcom.tn092.instrumentation import span, timed
+from lsst.sitcom.tn092.query import downsample_interval, downsampled_time_series
+
+__all__ = [
+    "DownsampledTimeSeriesPlot",
+    "HistogramRenderer",
+    "histogram_hp_minmax_forces",
+    "render_histograms",
+]
 
 
-def histogram_hp_minmax_forces(df, day_obs, end_reason=None):
+@timed("render")
+def histogram_hp_minmax_forces(
+    df, day_obs, end_reason=None, output_dir="./plots", fig=None, show=True
+):
     """
     Plots histograms of the minimum and maximum forces measured on hardpoints
     during slews.
     Parameters
     ----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame or HardpointForcesHistogram
         DataFrame containing the minimum and maximum forces data. It should
-        have columns 'min_forces' and 'max_forces'.
+        have columns 'min_forces' and 'max_forces'. Accumulated counts can
+        be passed instead, in which case the histograms are drawn from them
+        without needing the per-slew data.
     day_obs : int or str
         The observation day identifier to be included in the plot title and
         filename.
+    end_reason : int or TMAState, optional
+        If given, highlight the slews that ended for this reason.
+    output_dir : str or Path, optional
+        The directory where the figure is saved (default is "./plots").
+    fig : matplotlib.figure.Figure, optional
+        An empty figure to draw on (default is a new figure).
+    show : bool, optional
+        If True, the figure is shown with `matplotlib.pyplot.show`. Use
+        False in scripts and batch jobs: the figure is then not shown and,
+        unless it was passed as ``fig``, closed once saved, so no figures
+        are left open (default is True).
     Returns
     -------
-    None
+    matplotlib.figure.Figure
+        The figure.
     """
     end_reason = TMAState(end_reason) if end_reason is not None else None
-    fig, (min_ax, max_ax) = plt.subplots(figsize=(10, 5), ncols=2, sharey=True)
-    
+
+    close = fig is None
+    if fig is None:
+        fig = plt.figure(figsize=(10, 5))
+    min_ax, max_ax = fig.subplots(ncols=2, sharey=True)
+
+    outliers = None
+    if isinstance(df, HardpointForcesHistogram):
+        n_slews = df.n_slews
+        bins = df.edges
+        # The slews outside of the bins are counted in the title, so they
+        # are written on the axes.
+        outliers = (
+            _outliers_text(df.edges, df.min_counts(outliers=True)),
+            _outliers_text(df.edges, df.max_counts(outliers=True)),
+        )
+        min_forces, max_forces = df.centers, df.centers
+        min_weights, max_weights = df.min_counts(), df.max_counts()
+        if end_reason is not None:
+            min_mask, max_mask = df.centers, df.centers
+            min_mask_weights = df.min_counts(end_reason)
+            max_mask_weights = df.max_counts(end_reason)
+    else:
+        n_slews = df.index.size
+        bins = None
+        min_forces, max_forces = df["min_forces"], df["max_forces"]
+        min_weights, max_weights = None, None
+        if end_reason is not None:
+            mask = df["end_reason"] == end_reason
+            min_mask, max_mask = df.loc[mask, "min_forces"], df.loc[mask, "max_forces"]
+            min_mask_weights, max_mask_weights = None, None
+
     min_ax.hist(
-        df["min_forces"],
+        min_forces,
+        bins=bins,
+        weights=min_weights,
         ec="white",
         alpha=0.75,
         label="Minimum forces",
         log=True,
     )
     max_ax.hist(
-        df["max_forces"],
+        max_forces,
+        bins=bins,
+        weights=max_weights,
         ec="white",
         alpha=0.75,
         label="Maximum forces",
         log=True,
     )
-    
+
     if end_reason is not None:
-        mask = df["end_reason"] == end_reason
         min_ax.hist(
-            df.loc[mask, "min_forces"],
+            min_mask,
+            bins=bins,
+            weights=min_mask_weights,
             ec="white",
             fc="orange",
             alpha=0.5,
@@ -51,7 +122,9 @@ def histogram_hp_minmax_forces(df, day_obs, end_reason=None):
             log=True,
         )
         max_ax.hist(
-            df.loc[mask, "max_forces"],
+            max_mask,
+            bins=bins,
+            weights=max_mask_weights,
             ec="white",
             fc="orange",
             alpha=0.5,
@@ -73,13 +146,438 @@ def histogram_hp_minmax_forces(df, day_obs, end_reason=None):
     max_ax.axvline(900, ls="--", c="red", alpha=0.5, label="Fatigue limit", lw=2)
     max_ax.legend()
 
+    if outliers is not None:
+        for ax, text in zip((min_ax, max_ax), outliers):
+            ax.text(0.02, 0.02, text, transform=ax.transAxes, fontsize="small")
+
     fig.suptitle(
         f"Histogram with the number of slews with\n"
         f"different minimum and maximum measured forces on the hardpoints.\n"
-        f"DayObs {day_obs}, total of {df.index.size} slews",
+        f"DayObs {day_obs}, total of {n_slews} slews",
     )
 
-    os.makedirs("./plots", exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     fig.tight_layout()
-    fig.savefig(f"./plots/histogram_hp_minmax_dayobs_{day_obs}.png")
-    plt.show()
+    with span("save", day_obs=day_obs):
+        file_name = f"histogram_hp_minmax_dayobs_{day_obs}.png"
+        fig.savefig(os.path.join(output_dir, file_name))
+
+    if show:
+        plt.show()
+    elif close:
+        plt.close(fig)
+
+    return fig
+
+
+class HistogramRenderer:
+    """
+    Draw hardpoint forces histograms like `histogram_hp_minmax_forces` on a
+    reusable, non-interactive figure.
+
+    The figure, its axes, labels and limit lines are built once on the Agg
+    backend, without pyplot, and every histogram only updates the bar
+    heights and the title before being saved. The bins are fixed by the
+    template, so every figure of a report has the same bins.
+
+    Parameters
+    ----------
+    edges : array-like, optional
+        The bin edges, in N (default is the default bins of
+        `HardpointForcesHistogram`).
+    figsize : tuple of float, optional
+        The size of the figure, in inches (default is 10 x 5).
+    dpi : int, optional
+        The resolution of the saved figures (default is 100).
+    """
+
+    def __init__(self, edges=None, figsize=(10, 5), dpi=100):
+        self.edges = HardpointForcesHistogram(edges).edges
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self._axes = self.figure.subplots(ncols=2, sharey=True)
+        self._bars = []
+        self._outliers = []
+
+        for ax, name, sign in zip(self._axes, ("Minimum", "Maximum"), (-1, 1)):
+            zeros = np.zeros(self.edges.size - 1)
+            all_slews = ax.stairs(
+                zeros, self.edges, fill=True, alpha=0.75, label=f"{name} forces"
+            )
+            selected = ax.stairs(zeros, self.edges, fill=True, fc="orange", alpha=0.5)
+            self._bars.append((all_slews, selected))
+            self._outliers.append(
+                ax.text(0.02, 0.02, "", transform=ax.transAxes, fontsize="small")
+            )
+
+            # The limits are set before the log scale, which warns when the
+            # axes have no positive data yet. They are updated on render.
+            ax.set_ylim(0.5, 2)
+            ax.set_yscale("log")
+            ax.grid(alpha=0.3)
+            ax.set_xlabel(
+                f"{name} measured forces on\n the hardpoints during a slew [N]"
+            )
+            ax.axvline(
+                sign * 450, ls=":", c="black", alpha=0.5, lw=2, label="Operational limit"
+            )
+            ax.axvline(
+                sign * 900, ls="--", c="red", alpha=0.5, lw=2, label="Fatigue limit"
+            )
+
+        self._axes[0].set_ylabel("Number of slews")
+
+        # Laid out once with a title of the same height, so every figure has
+        # the same layout, whichever figures were drawn before it.
+        self._title = self.figure.suptitle("\n\n")
+        self.figure.tight_layout()
+
+    def update(self, hist, title, end_reason=None):
+        """
+        Draw a histogram on the template.
+
+        Parameters
+        ----------
+        hist : HardpointForcesHistogram
+            The counts, with the bins of the template.
+        title : str
+            The last line of the title, e.g. the block and day_obs.
+        end_reason : int or TMAState, optional
+            If given, highlight the slews that ended for this reason.
+        """
+        if not np.array_equal(hist.edges, self.edges):
+            raise ValueError("The histogram bins do not match the template.")
+
+        end_reason = TMAState(end_reason) if end_reason is not None else None
+        counts = (hist.min_counts, hist.max_counts)
+        top = 1
+
+        for ax, (all_slews, selected), outliers, name, count in zip(
+            self._axes, self._bars, self._outliers, ("Minimum", "Maximum"), counts
+        ):
+            values = count()
+            all_slews.set_data(values)
+            outliers.set_text(_outliers_text(self.edges, count(outliers=True)))
+            top = max(top, values.max(initial=0))
+
+            handles = [all_slews]
+            selected.set_visible(end_reason is not None)
+            if end_reason is not None:
+                selected.set_data(count(end_reason))
+                selected.set_label(f"{name} forces ({end_reason.name})")
+                handles.append(selected)
+
+            ax.legend(handles=handles + ax.lines)
+
+        self._axes[0].set_ylim(0.5, 2 * top)
+        self._title.set_text(
+            f"Histogram with the number of slews with\n"
+            f"different minimum and maximum measured forces on the hardpoints.\n"
+            f"{title}, total of {hist.n_slews} slews"
+        )
+
+    def save(self, file_path):
+        """
+        Save the figure to a file.
+        """
+        self.figure.savefig(file_path)
+
+
+def render_histograms(
+    jobs, output_dir="./plots", end_reason=None, processes=None, **kwargs
+):
+    """
+    Render and save many hardpoint forces histograms with a process pool.
+
+    Every worker builds one `HistogramRenderer` and reuses it for all its
+    figures, so a set of figures renders in about the time of the slowest
+    worker instead of one after the other.
+
+    Parameters
+    ----------
+    jobs : iterable of tuple
+        The ``(day_obs, block, data)`` of each figure. ``block`` is the
+        block ID used in the title and the file name, or None, and
+        ``data`` is a `HardpointForcesHistogram` or a DataFrame with the
+        'min_forces', 'max_forces' and 'end_reason' columns.
+    output_dir : str or Path, optional
+        The directory where the figures are saved (default is "./plots").
+    end_reason : int or TMAState, optional
+        If given, highlight the slews that ended for this reason.
+    processes : int, optional
+        The number of worker processes. If 1, the figures are rendered in
+        this process (default is the number of CPUs).
+    **kwargs
+        Passed to `HistogramRenderer`.
+
+    Returns
+    -------
+    list of str
+        The files written, in the order of ``jobs``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    edges = kwargs.get("edges")
+
+    # Only the counts are sent to the workers.
+    tasks = []
+    for day_obs, block, data in jobs:
+        if not isinstance(data, HardpointForcesHistogram):
+            data = HardpointForcesHistogram.from_frame(data, edges)
+
+        if block is None:
+            title = f"DayObs {day_obs}"
+            file_name = f"histogram_hp_minmax_dayobs_{day_obs}.png"
+        else:
+            title = f"{block}, DayObs {day_obs}"
+            file_name = f"hist_hp_minmax_{block}_{day_obs}.png"
+
+        tasks.append((data, title, os.path.join(output_dir, file_name)))
+
+    if processes is None:
+        processes = min(os.cpu_count(), len(tasks))
+
+    if processes <= 1:
+        _init_histogram_worker(end_reason, kwargs)
+        return [_render_histogram(*task) for task in tasks]
+
+    # Spawn the workers so they do not inherit the threads, event loops or
+    # EFD clients of this process, as in `lsst.sitcom.tn092.ics`.
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_histogram_worker,
+        initargs=(end_reason, kwargs),
+    ) as pool:
+        return list(pool.map(_render_histogram, *zip(*tasks)))
+
+
+class DownsampledTimeSeriesPlot:
+    """
+    Time series plot that queries the EFD at the level of detail of the
+    axes, and again whenever they are zoomed or panned.
+
+    Each column is drawn as its mean per time bucket, with a band between
+    the minimum and maximum so short spikes stay visible, see
+    `lsst.sitcom.tn092.query.downsampled_time_series`. Once the view is
+    narrow enough, the raw samples are drawn instead.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        The axes to draw on.
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    topic : str
+        The EFD topic, e.g. `lsst.sitcom.tn092.query.HP_TOPIC`.
+    columns : list of str
+        The columns to plot.
+    begin, end : int or astropy.time.Time
+        The initial time range. Integers are taken as day_obs.
+    sample_rate : float, optional
+        The sample rate of the topic, in Hz (default is 50).
+    width : int, optional
+        The number of time buckets (default is the width of the axes in
+        pixels).
+    interactive : bool, optional
+        If True, the data are queried again when the x limits change
+        (default is True).
+    delay : float, optional
+        How long the x limits must stay still before the data are queried
+        again, in seconds, so a pan or zoom sends one query instead of one
+        per mouse event (default is 0.3). Views already covered by the data
+        drawn, at the same level of detail, are not queried again.
+
+    Attributes
+    ----------
+    lines : dict of str to matplotlib.lines.Line2D
+        The mean, or raw, line of each column.
+    bands : dict of str to matplotlib.collections.PolyCollection
+        The min-max band of each column, when downsampled.
+    interval : float
+        The duration of the time buckets drawn, in seconds, or 0 for the
+        raw samples.
+    limits : tuple of numpy.datetime64
+        The time range drawn.
+
+    Examples
+    --------
+    >>> fig, ax = plt.subplots(figsize=(12, 4))
+    >>> view = DownsampledTimeSeriesPlot(
+    ...     ax, efd_client, HP_TOPIC, HP_FORCE_COLUMNS, day_obs, day_obs
+    ... )
+    """
+
+    def __init__(
+        self,
+        ax,
+        efd_client,
+        topic,
+        columns,
+        begin,
+        end,
+        sample_rate=50.0,
+        width=None,
+        interactive=True,
+        delay=0.3,
+    ):
+        self.ax = ax
+        self.efd_client = efd_client
+        self.topic = topic
+        self.columns = list(columns)
+        self.sample_rate = sample_rate
+        self.width = width
+        self.delay = delay
+
+        self.lines = {}
+        self.bands = {}
+        self.interval = None
+        self._callback = None
+        self._timer = None
+
+        self.update(begin, end)
+        ax.set_xlim(self.limits)
+        ax.legend(loc="upper right")
+        ax.grid(alpha=0.3)
+
+        if interactive:
+            self._callback = ax.callbacks.connect("xlim_changed", self._on_xlim)
+
+    def update(self, begin, end):
+        """
+        Query and draw a new time range, keeping the x limits.
+
+        Parameters
+        ----------
+        begin, end : int or astropy.time.Time
+            The time range. Integers are taken as day_obs.
+        """
+        if isinstance(begin, int):
+            begin = getDayObsStartTime(begin)
+        if isinstance(end, int):
+            end = getDayObsEndTime(end)
+
+        width = self._get_width()
+
+        df = downsampled_time_series(
+            self.efd_client,
+            self.topic,
+            self.columns,
+            begin,
+            end,
+            width=width,
+            sample_rate=self.sample_rate,
+        )
+        self.interval = downsample_interval(begin, end, width, self.sample_rate)
+        self.limits = (begin.utc.datetime64, end.utc.datetime64)
+
+        # Buckets are drawn at their center.
+        times = df.index + pd.Timedelta(seconds=self.interval / 2)
+        times = pd.DatetimeIndex(times).tz_convert(None).to_numpy()
+
+        for column in self.columns:
+            mean = df[(column, "mean")].to_numpy()
+
+            if column in self.lines:
+                self.lines[column].set_data(times, mean)
+            else:
+                (self.lines[column],) = self.ax.plot(times, mean, lw=1, label=column)
+
+            if column in self.bands:
+                self.bands.pop(column).remove()
+
+            if self.interval > 0:
+                self.bands[column] = self.ax.fill_between(
+                    times,
+                    df[(column, "min")].to_numpy(),
+                    df[(column, "max")].to_numpy(),
+                    color=self.lines[column].get_color(),
+                    alpha=0.3,
+                    lw=0,
+                )
+
+        self.ax.set_title(
+            "Raw samples"
+            if self.interval == 0
+            else f"Min, mean and max per {self.interval:g} s"
+        )
+        self.ax.figure.canvas.draw_idle()
+
+    def disconnect(self):
+        """
+        Stop querying the EFD when the x limits change.
+        """
+        if self._callback is not None:
+            self.ax.callbacks.disconnect(self._callback)
+            self._callback = None
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def _get_width(self):
+        return self.width or max(int(self.ax.get_window_extent().width), 1)
+
+    def _on_xlim(self, ax):
+        if self.delay <= 0:
+            self._refresh()
+            return
+
+        # Restart the countdown on every change, so only the last limits of
+        # a pan or zoom are queried.
+        if self._timer is None:
+            self._timer = ax.figure.canvas.new_timer(interval=int(self.delay * 1000))
+            self._timer.single_shot = True
+            self._timer.add_callback(self._refresh)
+        self._timer.stop()
+        self._timer.start()
+
+    def _refresh(self):
+        """
+        Query the data of the current x limits, unless the data drawn
+        already cover them at the same level of detail.
+        """
+        begin, end = (Time(mdates.num2date(x)) for x in self.ax.get_xlim())
+        interval = downsample_interval(begin, end, self._get_width(), self.sample_rate)
+
+        if (
+            interval == self.interval
+            and self.limits[0] <= begin.utc.datetime64
+            and end.utc.datetime64 <= self.limits[1]
+        ):
+            return
+
+        self.update(begin, end)
+
+
+def _outliers_text(edges, counts):
+    """
+    Describe the underflow and overflow counts of a histogram, which are
+    the first and last elements of ``counts``, or "" if both are zero.
+    """
+    under, over = int(counts[0]), int(counts[-1])
+    if under == 0 and over == 0:
+        return ""
+    return f"{under} below {edges[0]:g} N\n{over} above {edges[-1]:g} N"
+
+
+_worker_renderer = None
+_worker_end_reason = None
+
+
+def _init_histogram_worker(end_reason, kwargs):
+    """
+    Build the histogram template of a worker process.
+    """
+    global _worker_renderer, _worker_end_reason
+    _worker_renderer = HistogramRenderer(**kwargs)
+    _worker_end_reason = end_reason
+
+
+def _render_histogram(hist, title, file_path):
+    """
+    Render and save one histogram with the template of the worker process.
+    """
+    with span("render", title=title):
+        _worker_renderer.update(hist, title, end_reason=_worker_end_reason)
+        _worker_renderer.save(file_path)
+    return file_path
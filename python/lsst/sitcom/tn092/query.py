@@ -1,156 +1,552 @@
 import asyncio
+import functools
+import numpy as np
 import pandas as pd
 
-from lsst.summit.utils.efdUtils import getEfdData
+from astropy.time import Time, TimeDelta
+from concurrent.futures import ThreadPoolExecutor
+
+from lsst.summit.utils.efdUtils import (
+    getDayObsEndTime,
+    getDayObsStartTime,
+    offsetDayObs,
+)
 from lsst.summit.utils.tmaUtils import TMAState
+from lsst.ts.xml.tables.m1m3 import FATable
 
-from lsst.sitcom.tn092.utils import filter_by_block_id
+from lsst.sitcom.tn092.coalesce import current_coalescer
+from lsst.sitcom.tn092.events import EventIndex
+from lsst.sitcom.tn092.executor import QueryExecutor, run_sync
+from lsst.sitcom.tn092.instrumentation import result_size, span
+from lsst.sitcom.tn092.utils import format_block_id
 
 
 __all__ = [
-    "get_hp_minmax_forces",
+    "hp_forces_and_azimuth_elevation",
+    "hp_forces_and_azimuth_elevation_async",
+    "hp_forces_and_azimuth_elevation_by_day_obs",
+    "fa_force_columns",
+    "fa_force_snapshots",
+    "fa_force_snapshots_async",
+    "hp_force_exceedances",
+    "hp_force_exceedances_async",
+    "hp_force_statistics",
+    "hp_force_statistics_async",
+    "iter_time_chunks",
+    "iter_time_chunks_async",
+    "m1m3_fa_forces_chunks",
+    "m1m3_hp_measured_forces_chunks",
+    "m1m3_hp_measured_forces",
+    "m1m3_hp_measured_forces_async",
     "script_configuration",
+    "script_configuration_async",
     "script_description",
+    "script_description_async",
+    "script_log_message",
+    "script_log_message_async",
     "script_states",
+    "script_states_async",
     "block_status",
+    "block_status_async",
+    "downsample_interval",
+    "downsampled_time_series",
+    "downsampled_time_series_async",
+]
+
+
+HP_MINMAX_COLUMNS = [
+    f"{stat}_forces_{hp}" for hp in range(6) for stat in ("min", "max")
 ]
 
+HP_TOPIC = "lsst.sal.MTM1M3.hardpointActuatorData"
+HP_FORCE_COLUMNS = [f"measuredForce{hp}" for hp in range(6)]
+
+# Limits of the absolute hardpoint measured forces, in N.
+HP_OPERATIONAL_LIMIT = 450.0
+HP_FATIGUE_LIMIT = 900.0
+HP_FORCE_LIMITS = (HP_OPERATIONAL_LIMIT, HP_FATIGUE_LIMIT)
+
+# InfluxQL aggregates available for the hardpoint forces statistics, besides
+# the percentiles and the RMS.
+HP_AGGREGATES = ("count", "min", "max", "mean", "median", "stddev", "spread")
+HP_STATISTICS = ("min", "max", "mean", "stddev", "spread", "rms", "p5", "p95")
+
+FA_TOPIC = "lsst.sal.MTM1M3.forceActuatorData"
+# Number of force actuators with a force along each axis.
+FA_FORCE_COUNT = {"x": 12, "y": 100, "z": 156}
+FA_AXES = "xyz"
+FA_STATISTICS = ("mean", "min", "max", "stddev")
+
+# Statistics of each time bucket of `downsampled_time_series`.
+LOD_STATISTICS = ("min", "max", "mean")
+# Bucket durations of `downsampled_time_series`, in seconds.
+DOWNSAMPLE_INTERVALS = np.array(
+    [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5]
+    + [1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800]
+    + [3600, 7200, 10800, 21600, 43200, 86400],
+    dtype=float,
+)
 
-def hp_forces_and_azimuth_elevation(efd_client, tma_slew_events):
+# Values queried for every TMA event, in the order they are stored.
+EVENT_VALUE_COLUMNS = ["az_start", "az_end", "el_start", "el_end"] + HP_MINMAX_COLUMNS
+
+
+def hp_forces_and_azimuth_elevation(
+    efd_client, tma_slew_events, batch_size=None, executor=None, cache=None
+):
     """
     Retrieve the minimum and maximum hardpoint measured forces during TMA
     slewing events.
 
-    Parameters:
-    efd_client : object
+    Parameters
+    ----------
+    efd_client : EfdClient
         The EFD client used to query data.
     tma_slew_events : list
         A list of TMA slewing events to process.
-    event_type : TMAState, optional
-        The type of event to filter for (default is TMAState.SLEWING).
-    verbose : bool, optional
-        If True, print detailed information about each event
-        (default is False).
+    batch_size : int, optional
+        If given, pack up to ``batch_size`` event windows into a single
+        request per topic instead of sending one request per event and
+        topic. The number of round trips then grows with the number of
+        chunks rather than with the number of events (default is None).
+    executor : QueryExecutor, optional
+        The executor that bounds, retries and runs the queries. Events (or
+        chunks of events) that still fail after the retries are left out of
+        the result and recorded in ``executor.failures``
+        (default is a `QueryExecutor` with its default settings).
+    cache : QueryCache, optional
+        If given, per-event results are read from and written to this
+        on-disk cache, so only events missing from it reach the EFD
+        (default is None).
 
-    Returns:
+    Returns
+    -------
     pd.DataFrame
         A DataFrame containing the sequence number, azimuth difference,
         elevation difference, minimum forces, and maximum forces for each
         valid event.
     """
-    
-    # Create a list of tasks to run concurrently
-    tasks = [
-        hp_forces_and_azimuth_elevation_per_event(efd_client, evt)
-        for evt in tma_slew_events
-    ]
-    
-    # Run all tasks concurrently and gather results
-    loop = asyncio.get_event_loop()
-    df_list = loop.run_until_complete(asyncio.gather(*tasks))
-    df_list = [df for df in df_list if not df.isnull().any().any()]
-    
-    # Concatenate all DataFrames into one
-    df = pd.concat(df_list, ignore_index=True)
-        
+    return run_sync(
+        hp_forces_and_azimuth_elevation_async(
+            efd_client,
+            tma_slew_events,
+            batch_size=batch_size,
+            executor=executor,
+            cache=cache,
+        )
+    )
+
+
+async def hp_forces_and_azimuth_elevation_async(
+    efd_client, tma_slew_events, batch_size=None, executor=None, cache=None
+):
+    """
+    Asynchronous version of `hp_forces_and_azimuth_elevation`, see it for
+    the parameters.
+    """
+    if executor is None:
+        executor = QueryExecutor()
+
+    events = list(tma_slew_events)
+
+    if len(events) == 0:
+        return pd.DataFrame()
+
+    if batch_size is None:
+        func = functools.partial(
+            _event_values, efd_client, executor=executor, cache=cache
+        )
+        items = events
+    else:
+        func = functools.partial(
+            _batch_values, efd_client, executor=executor, cache=cache
+        )
+        items = _chunks(events, batch_size)
+
+    # Run all tasks concurrently and write their results, one row per
+    # event, into a single preallocated array. Events that failed are
+    # left as NaN.
+    values = np.full((len(events), len(EVENT_VALUE_COLUMNS)), np.nan)
+    row = 0
+
+    with span("fetch", n_events=len(events)):
+        results = await executor.map(func, items)
+
+    for item, result in zip(items, results):
+        size = 1 if batch_size is None else len(item)
+        if result is not None:
+            values[row : row + size] = result
+        row += size
+
+    with span("assembly", n_events=len(events)):
+        df = _events_frame(events, values)
+        df = df[~df.isnull().any(axis=1)].reset_index(drop=True)
+
     return df
 
 
-async def hp_forces_and_azimuth_elevation_per_event(client, evt):
+def hp_forces_and_azimuth_elevation_by_day_obs(
+    efd_client, make_event_maker, day_obs_start, day_obs_end, **kwargs
+):
+    """
+    Retrieve the minimum and maximum hardpoint measured forces during TMA
+    events, one day_obs at a time.
+
+    The events of the next day_obs are discovered in a background thread
+    while the force queries of the current day_obs are running, so both
+    stages overlap and only about one day of events is held in memory.
+
+    The EFD client is bound to the event loop it was created on, so the
+    two stages cannot share one. The event maker is built in the
+    background thread by ``make_event_maker``, with its own EFD client on
+    the event loop of that thread.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client used to query the forces, from the calling thread.
+    make_event_maker : callable
+        Called without arguments in the background thread to create the
+        object that finds the TMA events, e.g.
+        ``lambda: TMAEventMaker(client=makeEfdClient())``. It must not
+        use ``efd_client``.
+    day_obs_start : int
+        The first day_obs to process.
+    day_obs_end : int
+        The last day_obs to process, inclusive.
+    **kwargs
+        Passed to `hp_forces_and_azimuth_elevation`.
+
+    Yields
+    ------
+    day_obs : int
+        The day_obs of the results.
+    df : pd.DataFrame
+        The results of `hp_forces_and_azimuth_elevation` for that day_obs.
+        It is empty if no valid events were found.
+
+    Raises
+    ------
+    ValueError
+        If the event maker uses ``efd_client``.
+    """
+    day_obs_list = []
+    day_obs = day_obs_start
+    while day_obs <= day_obs_end:
+        day_obs_list.append(day_obs)
+        day_obs = offsetDayObs(day_obs, 1)
+
+    if len(day_obs_list) == 0:
+        return
+
+    with ThreadPoolExecutor(max_workers=1, initializer=_set_event_loop) as pool:
+        event_maker = pool.submit(make_event_maker).result()
+        if getattr(event_maker, "client", None) is efd_client:
+            raise ValueError(
+                "The event maker must have its own EFD client, it is used "
+                "from another thread and event loop."
+            )
+
+        next_events = pool.submit(_discover_events, event_maker, day_obs_list[0])
+
+        for i, day_obs in enumerate(day_obs_list):
+            events = next_events.result()
+
+            if i + 1 < len(day_obs_list):
+                next_events = pool.submit(
+                    _discover_events, event_maker, day_obs_list[i + 1]
+                )
+
+            if len(events) == 0:
+                yield day_obs, pd.DataFrame()
+                continue
+
+            yield day_obs, hp_forces_and_azimuth_elevation(efd_client, events, **kwargs)
+            del events
+
+
+async def hp_forces_and_azimuth_elevation_per_event(
+    client, evt, executor=None, cache=None
+):
     """
     Retrieve the azimuth, elevation, and minimum/maximum forces for a
     specific TMA event.
-    
+
     Parameters
     ----------
     client : EfdClient
         The EFD client to use for querying.
     evt : TMAEvent
         The TMA event to process.
-    event_type : TMAState
-        The type of event to filter for (e.g., TMAState.SLEWING).
-    verbose : bool, optional
-        If True, print detailed information about the event (default is False).
-    
+    executor : QueryExecutor, optional
+        If given, the three queries are sent through it (default is None).
+    cache : QueryCache, optional
+        If given, the on-disk cache used for the three queries
+        (default is None).
+
     Returns
     -------
     pd.DataFrame
         A DataFrame containing the azimuth, elevation, and forces data for the event.
     """
-    # Query the EFD for azimuth, elevation, and forces
-    az = await mtmount_azimuth(client, evt)
-    el = await mtmount_elevation(client, evt)
-    forces = await m1m3_hp_minmax_measured_forces(client, evt)
-    
-    df = pd.concat([az, el, forces], axis=1)
-    df["begin"] = evt.begin.isot
-    df["end"] = evt.end.isot
-    df["seq_num"] = evt.seqNum
-    df["day_obs"] = evt.dayObs
-    df["end_reason"] = TMAState(evt.endReason)
-    
-    return df
+    values = await _event_values(client, evt, executor=executor, cache=cache)
+    return _events_frame([evt], values[np.newaxis])
 
 
-async def m1m3_hp_minmax_measured_forces(efd_client, tma_slew_event):
+async def m1m3_hp_minmax_measured_forces(efd_client, tma_slew_event, cache=None):
     """
     Query the EFD for the minimum and maximum measured forces on the M1M3 hardpoints
     during a TMA slew event.
-    
+
     Parameters
     ----------
     efd_client : EfdClient
         The EFD client to use for querying.
     tma_slew_event : TMAEvent
         The TMA event for the slew.
-        
+    cache : QueryCache, optional
+        If given, the result is read from this on-disk cache when available
+        and stored in it otherwise (default is None).
+
     Returns
     -------
     pandas.DataFrame
         A DataFrame containing the minimum and maximum measured forces on the hardpoints.
     """
+    query = _m1m3_hp_minmax_statement(tma_slew_event)
+    df_forces = await _cached_query(
+        efd_client,
+        HP_TOPIC,
+        tma_slew_event,
+        query,
+        cache,
+    )
+    return _format_m1m3_hp_minmax(df_forces)
 
-    # Create the query string
-    query = f"""
-        SELECT
-            MIN(measuredForce0) AS min_forces_0,
-            MAX(measuredForce0) AS max_forces_0,
-            MIN(measuredForce1) AS min_forces_1,
-            MAX(measuredForce1) AS max_forces_1,
-            MIN(measuredForce2) AS min_forces_2,
-            MAX(measuredForce2) AS max_forces_2,
-            MIN(measuredForce3) AS min_forces_3,
-            MAX(measuredForce3) AS max_forces_3,
-            MIN(measuredForce4) AS min_forces_4,
-            MAX(measuredForce4) AS max_forces_4,
-            MIN(measuredForce5) AS min_forces_5,
-            MAX(measuredForce5) AS max_forces_5
-        FROM "lsst.sal.MTM1M3.hardpointActuatorData"
-        WHERE time >= '{tma_slew_event.begin.isot}Z'
-        AND time < '{tma_slew_event.end.isot}Z'
-    """
-    
-    # Execute the query
-    df_forces = await efd_client.influx_client.query(query)
-    
-    if pd.DataFrame(df_forces).empty:
-        df_forces = pd.DataFrame(
-            columns=[
-                "min_forces_0", "max_forces_0",
-                "min_forces_1", "max_forces_1",
-                "min_forces_2", "max_forces_2",
-                "min_forces_3", "max_forces_3",
-                "min_forces_4", "max_forces_4",
-                "min_forces_5", "max_forces_5",
-                "min_forces", "max_forces"
-            ],
-            data=[[None] * 14]
+
+def fa_force_snapshots(
+    efd_client,
+    tma_slew_events,
+    statistics=FA_STATISTICS,
+    batch_size=10,
+    executor=None,
+    cache=None,
+):
+    """
+    Summarize the forces of every M1M3 force actuator during many TMA
+    events, with the statistics computed by the EFD.
+
+    Each event costs one InfluxQL statement with one aggregate per force
+    column and statistic, so only a few numbers per actuator are
+    transferred instead of the 50 Hz samples.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client used to query data.
+    tma_slew_events : list
+        The TMA events to summarize.
+    statistics : sequence of str, optional
+        InfluxQL aggregates computed for every force column (default is
+        `FA_STATISTICS`, MEAN, MIN, MAX and STDDEV). Note that STDDEV is
+        the sample standard deviation.
+    batch_size : int, optional
+        Number of events whose statements are sent in a single request
+        (default is 10).
+    executor : QueryExecutor, optional
+        The executor that bounds, retries and runs the requests. Events in
+        requests that still fail after the retries are left as NaN and
+        recorded in ``executor.failures`` (default is a `QueryExecutor`
+        with its default settings).
+    cache : QueryCache, optional
+        If given, per-event results are read from and written to this
+        on-disk cache (default is None).
+
+    Returns
+    -------
+    numpy.ndarray
+        The ``(n_events, n_actuators, 3, n_statistics)`` statistics. The
+        actuators are in `FATable` order, the axes are X, Y and Z and the
+        statistics are in the order of ``statistics``. Missing data, and the
+        X or Y forces of the actuators without them, are NaN.
+    """
+    return run_sync(
+        fa_force_snapshots_async(
+            efd_client,
+            tma_slew_events,
+            statistics=statistics,
+            batch_size=batch_size,
+            executor=executor,
+            cache=cache,
         )
-    else:
-        df_forces["min_forces"] = df_forces.filter(like="min_forces").min(axis=1)
-        df_forces["max_forces"] = df_forces.filter(like="max_forces").max(axis=1)
+    )
 
-    return df_forces
+
+async def fa_force_snapshots_async(
+    efd_client,
+    tma_slew_events,
+    statistics=FA_STATISTICS,
+    batch_size=10,
+    executor=None,
+    cache=None,
+):
+    """
+    Asynchronous version of `fa_force_snapshots`, see it for the
+    parameters.
+    """
+    if executor is None:
+        executor = QueryExecutor()
+
+    events = list(tma_slew_events)
+    statistics = tuple(stat.lower() for stat in statistics)
+    aliases, targets = _fa_snapshot_layout(statistics)
+
+    shape = (len(events), len(FATable), len(FA_AXES), len(statistics))
+    values = np.full(shape, np.nan)
+    flat = values.reshape(len(events), -1)
+
+    async def query_chunk(chunk):
+        results = await _query_events(
+            efd_client,
+            FA_TOPIC,
+            chunk,
+            [_fa_snapshot_statement(evt, statistics) for evt in chunk],
+            executor=executor,
+            cache=cache,
+        )
+        return [_result_values(result, aliases) for result in results]
+
+    chunks = _chunks(events, batch_size)
+    row = 0
+
+    with span("fetch", n_events=len(events)):
+        results = await executor.map(query_chunk, chunks)
+
+    for chunk, result in zip(chunks, results):
+        if result is not None:
+            flat[row : row + len(chunk), targets] = result
+        row += len(chunk)
+
+    return values
+
+
+def hp_force_statistics(
+    efd_client,
+    tma_slew_events,
+    statistics=HP_STATISTICS,
+    batch_size=10,
+    executor=None,
+    cache=None,
+):
+    """
+    Summarize the measured forces of every M1M3 hardpoint during many TMA
+    events, with the statistics computed by the EFD.
+
+    All the statistics of an event come from a single InfluxQL statement,
+    so the same request feeds the minimum and maximum forces histograms
+    and the analyses of the mean and spread of the forces, e.g. the
+    ``measuredForceMean`` and ``measuredForceStd`` of the ICS historical
+    analysis, without downloading the 50 Hz samples.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client used to query data.
+    tma_slew_events : list
+        The TMA events to summarize.
+    statistics : sequence of str, optional
+        The statistics computed for every hardpoint (default is
+        `HP_STATISTICS`). Any of "count", "min", "max", "mean", "median",
+        "stddev" (the sample standard deviation), "spread" (max - min),
+        "rms" (the root mean square, derived from the count, mean and
+        standard deviation) and percentiles as "p{q}", e.g. "p95".
+    batch_size : int, optional
+        Number of events whose statements are sent in a single request
+        (default is 10).
+    executor : QueryExecutor, optional
+        The executor that bounds, retries and runs the requests. Events in
+        requests that still fail after the retries are left as missing and
+        recorded in ``executor.failures`` (default is a `QueryExecutor`
+        with its default settings).
+    cache : QueryCache, optional
+        If given, per-event results are read from and written to this
+        on-disk cache (default is None).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per event, in order, with a ``{statistic}_forces_{hp}``
+        column per hardpoint and statistic, e.g. 'mean_forces_0' or
+        'p95_forces_5', as float, except the counts which are Int64. With
+        "min" and "max", the overall 'min_forces' and 'max_forces' of all
+        the hardpoints are added, as in `hp_forces_and_azimuth_elevation`.
+        The 'begin', 'end', 'seq_num', 'day_obs' and 'end_reason' of the
+        events come last. Events without data have missing values.
+    """
+    return run_sync(
+        hp_force_statistics_async(
+            efd_client,
+            tma_slew_events,
+            statistics=statistics,
+            batch_size=batch_size,
+            executor=executor,
+            cache=cache,
+        )
+    )
+
+
+async def hp_force_statistics_async(
+    efd_client,
+    tma_slew_events,
+    statistics=HP_STATISTICS,
+    batch_size=10,
+    executor=None,
+    cache=None,
+):
+    """
+    Asynchronous version of `hp_force_statistics`, see it for the
+    parameters.
+    """
+    if executor is None:
+        executor = QueryExecutor()
+
+    events = list(tma_slew_events)
+    statistics = _hp_statistic_names(statistics)
+    aggregates = _hp_statistic_aggregates(statistics)
+    aliases = [f"{stat}_forces_{hp}" for hp in range(6) for stat in aggregates]
+
+    values = np.full((len(events), len(aliases)), np.nan)
+
+    async def query_chunk(chunk):
+        results = await _query_events(
+            efd_client,
+            HP_TOPIC,
+            chunk,
+            [_hp_statistics_statement(evt, aggregates) for evt in chunk],
+            executor=executor,
+            cache=cache,
+        )
+        return [_result_values(result, aliases) for result in results]
+
+    chunks = _chunks(events, batch_size)
+    row = 0
+
+    with span("fetch", n_events=len(events)):
+        results = await executor.map(query_chunk, chunks)
+
+    for chunk, result in zip(chunks, results):
+        if result is not None:
+            values[row : row + len(chunk)] = result
+        row += len(chunk)
+
+    with span("assembly", n_events=len(events)):
+        # (event, hardpoint, aggregate) values.
+        values = values.reshape(len(events), 6, len(aggregates))
+        df = _hp_statistics_frame(
+            events, dict(zip(aggregates, np.moveaxis(values, 2, 0))), statistics
+        )
+
+    return df
 
 
 def m1m3_hp_measured_forces(efd_client, tma_slew_event):
@@ -169,245 +565,1590 @@ def m1m3_hp_measured_forces(efd_client, tma_slew_event):
     pandas.DataFrame
         A DataFrame containing the measured forces of the M1M3 component.
     """
-    df_forces = getEfdData(
+    return run_sync(m1m3_hp_measured_forces_async(efd_client, tma_slew_event))
+
+
+async def m1m3_hp_measured_forces_async(efd_client, tma_slew_event):
+    """
+    Asynchronous version of `m1m3_hp_measured_forces`, see it for the
+    parameters.
+    """
+    df_forces = await _select_time_range(
         efd_client,
-        "lsst.sal.MTM1M3.hardpointActuatorData",
-        columns=[f"measuredForce{i}" for i in range(6)],
-        event=tma_slew_event,
+        HP_TOPIC,
+        tma_slew_event.begin,
+        tma_slew_event.end,
+        columns=HP_FORCE_COLUMNS,
     )
 
     return df_forces
 
 
-async def mtmount_azimuth(efd_client, tma_slew_event):
+def iter_time_chunks(
+    efd_client, topic, columns, begin, end, chunk_duration=300.0, dtype=np.float64
+):
     """
-    Query the EFD for the azimuth of the MTMount component.
+    Page through a topic in time chunks, yielding numpy blocks.
+
+    The request of the next chunk is sent before the current one is
+    yielded, so it is already in flight when the next chunk is needed, and
+    only one or two chunks are held in memory at a time, so running
+    statistics can be computed over hours of high-rate data in constant
+    memory. The requests are sent from the event loop of the calling
+    thread, the one the EFD client is bound to, see
+    `lsst.sitcom.tn092.executor.run_sync`; in notebooks, use
+    `iter_time_chunks_async` instead.
 
     Parameters
     ----------
     efd_client : EfdClient
         The EFD client to use for querying.
-    tma_slew_event : TMAEvent
-        The TMA event for the slew.
+    topic : str
+        The EFD topic to read.
+    columns : list of str
+        The columns to read.
+    begin, end : int or astropy.time.Time
+        The time range to read. Integers are taken as day_obs.
+    chunk_duration : float, optional
+        The duration of each chunk, in seconds (default is 300).
+    dtype : numpy.dtype, optional
+        The type of the values, e.g. ``np.float32`` to halve the memory
+        (default is ``np.float64``).
 
-    Returns
-    -------
-    pandas.DataFrame
-        A DataFrame containing the azimuth of the MTMount component.
-    """    
-    query = f"""
-        SELECT
-            FIRST(actualPosition) AS az_start,
-            LAST(actualPosition) AS az_end
-        FROM "lsst.sal.MTMount.azimuth"
-        WHERE time >= '{tma_slew_event.begin.isot}Z'
-        AND time < '{tma_slew_event.end.isot}Z'
-    """
-    
-    df_azimuth = await efd_client.influx_client.query(query)
-    
-    if pd.DataFrame(df_azimuth).empty:
-        return pd.DataFrame(
-            columns=["az_start", "az_end", "az_diff"],
-            data=[[None, None, None]]
+    Yields
+    ------
+    times : numpy.ndarray
+        The unix timestamps of the samples in the chunk, in seconds.
+    values : numpy.ndarray
+        The ``(len(times), len(columns))`` values of the samples. Chunks
+        without data are skipped.
+
+    Examples
+    --------
+    Running maximum of the hardpoint forces over a night:
+
+    >>> peak = np.zeros(6)
+    >>> for times, values in iter_time_chunks(
+    ...     efd_client, HP_TOPIC, HP_FORCE_COLUMNS, day_obs, day_obs
+    ... ):
+    ...     peak = np.maximum(peak, np.abs(values).max(axis=0))
+    """
+    windows = _time_chunk_windows(begin, end, chunk_duration)
+
+    if len(windows) == 0:
+        return
+
+    def fetch(i):
+        return _time_chunk_values(
+            efd_client,
+            topic,
+            columns,
+            *windows[i],
+            include_end=i == len(windows) - 1,
+            dtype=dtype,
         )
-    else:
-        df_azimuth["az_diff"] = df_azimuth["az_end"] - df_azimuth["az_start"]
 
-    return df_azimuth
+    async def advance(i, current):
+        if current is None:
+            current = asyncio.ensure_future(fetch(i))
+
+        # Send the request of the next chunk before waiting for this one.
+        upcoming = None
+        if i + 1 < len(windows):
+            upcoming = asyncio.ensure_future(fetch(i + 1))
+            await asyncio.sleep(0)
+
+        return await current, upcoming
 
+    upcoming = None
+    try:
+        for i in range(len(windows)):
+            (times, values), upcoming = run_sync(advance(i, upcoming))
 
-async def mtmount_elevation(efd_client, tma_slew_event):
+            if times.size > 0:
+                yield times, values
+    finally:
+        if upcoming is not None:
+            upcoming.cancel()
+            run_sync(asyncio.wait([upcoming]))
+
+
+async def iter_time_chunks_async(
+    efd_client, topic, columns, begin, end, chunk_duration=300.0, dtype=np.float64
+):
     """
-    Query the EFD for the elevation of the MTMount component.
+    Asynchronous version of `iter_time_chunks`, see it for the parameters.
+    """
+    windows = _time_chunk_windows(begin, end, chunk_duration)
+
+    for i, (chunk_begin, chunk_end) in enumerate(windows):
+        times, values = await _time_chunk_values(
+            efd_client,
+            topic,
+            columns,
+            chunk_begin,
+            chunk_end,
+            include_end=i == len(windows) - 1,
+            dtype=dtype,
+        )
+
+        if times.size > 0:
+            yield times, values
+
+
+def m1m3_hp_measured_forces_chunks(efd_client, begin, end, **kwargs):
+    """
+    Page through the measured forces of the M1M3 hardpoints.
 
     Parameters
     ----------
     efd_client : EfdClient
         The EFD client to use for querying.
-    tma_slew_event : TMAEvent
-        The TMA event for the slew.
+    begin, end : int or astropy.time.Time
+        The time range to read. Integers are taken as day_obs.
+    **kwargs
+        Passed to `iter_time_chunks`.
 
-    Returns
-    -------
-    pandas.DataFrame
-        A DataFrame containing the elevation of the MTMount component.
+    Yields
+    ------
+    times : numpy.ndarray
+        The unix timestamps of the samples, in seconds.
+    values : numpy.ndarray
+        The measured forces, one column per hardpoint, in N.
     """
+    yield from iter_time_chunks(
+        efd_client, HP_TOPIC, HP_FORCE_COLUMNS, begin, end, **kwargs
+    )
 
-    query = f"""
-        SELECT
-            FIRST(actualPosition) AS el_start,
-            LAST(actualPosition) AS el_end
-        FROM "lsst.sal.MTMount.elevation"
-        WHERE time >= '{tma_slew_event.begin.isot}Z'
-        AND time < '{tma_slew_event.end.isot}Z'
-    """
 
-    df_elevation = await efd_client.influx_client.query(query)
+def m1m3_fa_forces_chunks(efd_client, begin, end, axes="xyz", **kwargs):
+    """
+    Page through the forces of the M1M3 force actuators.
 
-    if pd.DataFrame(df_elevation).empty:
-        return pd.DataFrame(
-            columns=["el_start", "el_end", "el_diff"], 
-            data=[[None, None, None]]
-        )
-    else:
-        df_elevation["el_diff"] = df_elevation["el_end"] - df_elevation["el_start"]
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    begin, end : int or astropy.time.Time
+        The time range to read. Integers are taken as day_obs.
+    axes : str, optional
+        The force axes to read, any combination of "x", "y" and "z"
+        (default is all of them).
+    **kwargs
+        Passed to `iter_time_chunks`.
 
-    return df_elevation
+    Yields
+    ------
+    times : numpy.ndarray
+        The unix timestamps of the samples, in seconds.
+    values : numpy.ndarray
+        The forces, in N, with the columns given by
+        ``fa_force_columns(axes)``.
+    """
+    yield from iter_time_chunks(
+        efd_client, FA_TOPIC, fa_force_columns(axes), begin, end, **kwargs
+    )
 
 
-def script_configuration(efd_client, start_day_obs, end_day_obs):
+def fa_force_columns(axes="xyz"):
     """
-    Query the EFD for the configuration of the Script SAL component.
+    Names of the force actuator force columns in `FA_TOPIC`.
 
     Parameters
     ----------
-    efd_client : EfdClient
-        The EFD client to use for querying.
-    start_day_obs : int
-        The first day of observations to query.
-    end_day_obs : int
-        The last day of observations to query.
+    axes : str, optional
+        The force axes, any combination of "x", "y" and "z"
+        (default is all of them).
 
     Returns
     -------
-    pandas.DataFrame
-        A DataFrame containing the configuration of the Script SAL component.
+    list of str
+        The column names, e.g. "xForce0", ..., "zForce155".
     """
-    df_configuration = getEfdData(
-        efd_client,
-        "lsst.sal.Script.command_configure",
-        columns="*",
-        begin=start_day_obs,
-        end=end_day_obs,
-    )
-
-    return df_configuration
+    return [
+        f"{axis}Force{i}" for axis in axes for i in range(FA_FORCE_COUNT[axis])
+    ]
 
 
-def script_description(efd_client, start_day_obs, end_day_obs, block_id=None):
+def hp_force_exceedances(
+    efd_client,
+    begin,
+    end,
+    limits=HP_FORCE_LIMITS,
+    tma_events=None,
+    chunk_duration=3600.0,
+    max_gap=0.1,
+    executor=None,
+):
     """
-    Query the EFD for the description of the Script SAL component.
+    Find when the hardpoint measured forces exceeded their limits.
+
+    The threshold is applied by the EFD, on each ``measuredForceN``
+    column, so only the samples beyond the lowest limit are transferred.
+    The time range is split into chunks that are queried concurrently, and
+    consecutive samples of a hardpoint beyond the limit are merged into
+    exceedance intervals. Unlike filtering the per-slew minimum and
+    maximum forces, this also finds the exceedances outside TMA events.
 
     Parameters
     ----------
     efd_client : EfdClient
         The EFD client to use for querying.
-    start_day_obs : int
-        The first day of observations to query.
-    end_day_obs : int
-        The last day of observations to query.
-    block_id : str, optional
-        The block ID to filter by.
+    begin, end : int or astropy.time.Time
+        The time range to scan. Integers are taken as day_obs.
+    limits : sequence of float, optional
+        The absolute force limits, in N. Intervals are where the absolute
+        force exceeds the lowest one, and are labelled with the highest one
+        their peak exceeds (default is the 450 N operational and 900 N
+        fatigue limits).
+    tma_events : list of TMAEvent, optional
+        If given, each interval is matched with the first of these events
+        it overlaps (default is None).
+    chunk_duration : float, optional
+        The duration of each query, in seconds (default is 3600).
+    max_gap : float, optional
+        Samples beyond the limit less than ``max_gap`` seconds apart belong
+        to the same interval. It should be longer than the sample period
+        of the topic (default is 0.1, 5 samples at 50 Hz).
+    executor : QueryExecutor, optional
+        The executor that bounds, retries and runs the queries. Chunks that
+        still fail after the retries are left out of the result and
+        recorded in ``executor.failures`` (default is a `QueryExecutor`
+        with its default settings).
 
     Returns
     -------
     pandas.DataFrame
-        A DataFrame containing the description of the Script SAL component.
+        One row per interval, sorted by begin, with the 'hardpoint', the
+        UTC 'begin' and 'end' times of the first and last samples beyond
+        the limit, the 'duration' in seconds, the number of samples
+        ('n_samples'), the signed 'peak' force and its 'peak_time', the
+        highest 'limit' exceeded and the 'day_obs' and 'seq_num' of the
+        overlapping TMA event, if any.
+
+    Examples
+    --------
+    Exceedances of the fatigue limit over a week:
+
+    >>> df = hp_force_exceedances(efd_client, 20240101, 20240107)
+    >>> df[df["limit"] == HP_FATIGUE_LIMIT]
     """
-    df_description = getEfdData(
-        efd_client,
-        "lsst.sal.Script.logevent_description",
-        columns="*",
-        begin=start_day_obs,
-        end=end_day_obs,
+    return run_sync(
+        hp_force_exceedances_async(
+            efd_client,
+            begin,
+            end,
+            limits=limits,
+            tma_events=tma_events,
+            chunk_duration=chunk_duration,
+            max_gap=max_gap,
+            executor=executor,
+        )
     )
 
-    return df_description
+
+async def hp_force_exceedances_async(
+    efd_client,
+    begin,
+    end,
+    limits=HP_FORCE_LIMITS,
+    tma_events=None,
+    chunk_duration=3600.0,
+    max_gap=0.1,
+    executor=None,
+):
+    """
+    Asynchronous version of `hp_force_exceedances`, see it for the
+    parameters.
+    """
+    if executor is None:
+        executor = QueryExecutor()
+
+    limits = np.sort(np.abs(np.atleast_1d(np.asarray(limits, dtype=float))))
+    where = [_exceedance_condition(HP_FORCE_COLUMNS, limits[0])]
+    windows = _time_chunk_windows(begin, end, chunk_duration)
+
+    async def query_chunk(i):
+        return await executor.submit(
+            _select_time_range,
+            efd_client,
+            HP_TOPIC,
+            *windows[i],
+            columns=HP_FORCE_COLUMNS,
+            where=where,
+            include_end=i == len(windows) - 1,
+            merge=False,
+        )
+
+    with span("fetch", n_chunks=len(windows)):
+        results = await executor.map(query_chunk, range(len(windows)))
+
+    frames = [df for df in results if df is not None and not df.empty]
+    df = pd.concat(frames).sort_index() if frames else pd.DataFrame()
+
+    return _exceedance_intervals(df, limits, max_gap, tma_events)
 
 
-def script_log_message(efd_client, start_day_obs, end_day_obs):
+def downsample_interval(begin, end, width=1000, sample_rate=50.0):
     """
-    Query the EFD for the log messages of the Script SAL component.
+    Pick the time bucket used by `downsampled_time_series`.
 
     Parameters
     ----------
-    efd_client : EfdClient
-        The EFD client to use for querying.
-    start_day_obs : int
-        The first day of observations to query.
-        end_day_obs : int
-        The last day of observations to query.
+    begin, end : int or astropy.time.Time
+        The time range. Integers are taken as day_obs.
+    width : int, optional
+        The number of buckets wanted, e.g. the width of the plot in pixels
+        (default is 1000).
+    sample_rate : float, optional
+        The sample rate of the topic, in Hz (default is 50, the rate of the
+        M1M3 telemetry).
 
     Returns
     -------
-    pandas.DataFrame
-        A DataFrame containing the log messages of the Script SAL component.
+    float
+        The duration of the buckets, in seconds, rounded up to one of
+        `DOWNSAMPLE_INTERVALS`, e.g. 20 ms, 5 s or 15 min, or to whole days.
+        It is 0 when the range has at most two samples per bucket, so the
+        raw samples are read instead.
     """
-    df_log_message = getEfdData(
-        efd_client,
-        "lsst.sal.Script.logevent_logMessage",
-        columns="*",
-        begin=start_day_obs,
-        end=end_day_obs,
-    )
+    begin, end = _to_time_range(begin, end)
+    duration = (end - begin).sec
 
-    return df_log_message
+    if duration * sample_rate <= 2 * width:
+        return 0.0
+
+    target = duration / width
+    above = DOWNSAMPLE_INTERVALS[DOWNSAMPLE_INTERVALS >= target]
+    return float(above[0] if above.size else np.ceil(target / 86400) * 86400)
 
 
-def script_states(efd_client, start_day_obs, end_day_obs, block_id=None):
+def downsampled_time_series(
+    efd_client, topic, columns, begin, end, width=1000, sample_rate=50.0
+):
     """
-    Query the EFD for the state of the Script SAL component.
+    Query a time series at the level of detail needed to plot it.
+
+    Long time ranges are split into about ``width`` time buckets and the
+    minimum, maximum and mean of each bucket are computed by the EFD, so
+    the transfer and the plot stay small while spikes are kept in the
+    minimum and maximum. Time ranges short enough to have at most two
+    samples per bucket are read at full resolution.
 
     Parameters
     ----------
     efd_client : EfdClient
         The EFD client to use for querying.
-    start_day_obs : int
-        The first day of observations to query.
-    end_day_obs : int
-        The last day of observations to query.
-    block_id : str, optional
-        The block ID to filter by.
+    topic : str
+        The EFD topic to query, e.g. `HP_TOPIC`.
+    columns : list of str
+        The columns to query, e.g. `HP_FORCE_COLUMNS`.
+    begin, end : int or astropy.time.Time
+        The time range. Integers are taken as day_obs.
+    width : int, optional
+        The number of buckets wanted, e.g. the width of the plot in pixels
+        (default is 1000).
+    sample_rate : float, optional
+        The sample rate of the topic, in Hz, used to decide when to read the
+        raw samples (default is 50, the rate of the M1M3 telemetry).
 
     Returns
     -------
     pandas.DataFrame
-        A DataFrame containing the state of the Script SAL component.
+        Indexed by the start time of the buckets, or by the time of the
+        samples at full resolution, with a ``(column, statistic)`` column
+        for the 'min', 'max' and 'mean' of each column. At full resolution
+        the three statistics are the sample values. Empty buckets are NaN,
+        so plotted lines break at gaps in the data.
+
+    See Also
+    --------
+    downsample_interval : the bucket duration used.
     """
-    df_state = getEfdData(
-        efd_client,
-        "lsst.sal.Script.logevent_state",
-        columns="*",
-        begin=start_day_obs,
-        end=end_day_obs,
+    return run_sync(
+        downsampled_time_series_async(
+            efd_client,
+            topic,
+            columns,
+            begin,
+            end,
+            width=width,
+            sample_rate=sample_rate,
+        )
     )
 
-    if block_id is not None:
-        df_state = filter_by_block_id(df_state, block_id)
 
-    return df_state
+async def downsampled_time_series_async(
+    efd_client, topic, columns, begin, end, width=1000, sample_rate=50.0
+):
+    """
+    Asynchronous version of `downsampled_time_series`, see it for the
+    parameters.
+    """
+    begin, end = _to_time_range(begin, end)
+    interval = downsample_interval(begin, end, width, sample_rate)
+
+    if interval == 0:
+        df = await _select_time_range(efd_client, topic, begin, end, columns=columns)
+        aliases = {
+            (column, stat): column for column in columns for stat in LOD_STATISTICS
+        }
+    else:
+        fields = ",\n            ".join(
+            f'{stat.upper()}("{column}") AS {stat}_{column}'
+            for column in columns
+            for stat in LOD_STATISTICS
+        )
+        query = f"""
+            SELECT
+                {fields}
+            FROM "{topic}"
+            WHERE time >= '{begin.utc.isot}Z' AND time <= '{end.utc.isot}Z'
+            GROUP BY time({round(interval * 1000)}ms)
+        """
+        df = pd.DataFrame(await _influx_query(efd_client, query, topic))
+        aliases = {
+            (column, stat): f"{stat}_{column}"
+            for column in columns
+            for stat in LOD_STATISTICS
+        }
+
+    names = pd.MultiIndex.from_tuples(list(aliases))
+
+    if df.empty:
+        return pd.DataFrame(
+            index=pd.DatetimeIndex([], tz="UTC"), columns=names, dtype=float
+        )
+
+    values = df[list(aliases.values())].to_numpy(dtype=float)
+    return pd.DataFrame(values, index=df.index, columns=names)
 
 
-def block_status(client, start_day_obs, end_day_obs, block_name=None):
+async def mtmount_azimuth(efd_client, tma_slew_event, cache=None):
     """
-    Query the EFD for the block status.
+    Query the EFD for the azimuth of the MTMount component.
 
     Parameters
     ----------
-    client : EfdClient
+    efd_client : EfdClient
         The EFD client to use for querying.
-    start_day_obs : int
-        The first day of observations to query.
-    end_day_obs : int
-        The last day of observations to query.
-    block_name : str, optional
-        The name of the block to query.
+    tma_slew_event : TMAEvent
+        The TMA event for the slew.
+    cache : QueryCache, optional
+        If given, the result is read from this on-disk cache when available
+        and stored in it otherwise (default is None).
 
     Returns
     -------
     pandas.DataFrame
-        A DataFrame containing the block status.
+        A DataFrame containing the azimuth of the MTMount component.
+    """    
+    query = _mtmount_position_statement("azimuth", "az", tma_slew_event)
+    df_azimuth = await _cached_query(
+        efd_client, "lsst.sal.MTMount.azimuth", tma_slew_event, query, cache
+    )
+    return _format_mtmount_position(df_azimuth, "az")
+
+
+async def mtmount_elevation(efd_client, tma_slew_event, cache=None):
     """
-    df_block = getEfdData(
-        client,
-        "lsst.sal.Scheduler.logevent_blockStatus",
-        columns="*",
-        begin=start_day_obs,
-        end=end_day_obs,
+    Query the EFD for the elevation of the MTMount component.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    tma_slew_event : TMAEvent
+        The TMA event for the slew.
+    cache : QueryCache, optional
+        If given, the result is read from this on-disk cache when available
+        and stored in it otherwise (default is None).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the elevation of the MTMount component.
+    """
+
+    query = _mtmount_position_statement("elevation", "el", tma_slew_event)
+    df_elevation = await _cached_query(
+        efd_client, "lsst.sal.MTMount.elevation", tma_slew_event, query, cache
+    )
+    return _format_mtmount_position(df_elevation, "el")
+
+
+def script_configuration(
+    efd_client, start_day_obs, end_day_obs, columns="*", sal_index=None
+):
+    """
+    Query the EFD for the configuration of the Script SAL component.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    start_day_obs : int or astropy.time.Time
+        The first day of observations to query.
+    end_day_obs : int or astropy.time.Time
+        The last day of observations to query.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+    sal_index : int, optional
+        Only retrieve the rows of the Script with this SAL index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the configuration of the Script SAL component.
+    """
+    return run_sync(
+        script_configuration_async(
+            efd_client,
+            start_day_obs,
+            end_day_obs,
+            columns=columns,
+            sal_index=sal_index,
+        )
+    )
+
+
+async def script_configuration_async(
+    efd_client, start_day_obs, end_day_obs, columns="*", sal_index=None
+):
+    """
+    Asynchronous version of `script_configuration`, see it for the parameters.
+    """
+    df_configuration = await _select_time_range(
+        efd_client,
+        "lsst.sal.Script.command_configure",
+        start_day_obs,
+        end_day_obs,
+        columns=columns,
+        where=_sal_index_condition(sal_index),
+    )
+
+    return df_configuration
+
+
+def script_description(
+    efd_client, start_day_obs, end_day_obs, block_id=None, columns="*", sal_index=None
+):
+    """
+    Query the EFD for the description of the Script SAL component.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    start_day_obs : int or astropy.time.Time
+        The first day of observations to query.
+    end_day_obs : int or astropy.time.Time
+        The last day of observations to query.
+    block_id : str, optional
+        The block ID to filter by. The description has no block ID, so the
+        SAL indices of the Scripts of the block are read from the Script
+        states, filtered by the EFD as in `script_states`, and the
+        descriptions are then selected by SAL index.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+    sal_index : int, optional
+        Only retrieve the rows of the Script with this SAL index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the description of the Script SAL component.
+    """
+    return run_sync(
+        script_description_async(
+            efd_client,
+            start_day_obs,
+            end_day_obs,
+            block_id=block_id,
+            columns=columns,
+            sal_index=sal_index,
+        )
+    )
+
+
+async def script_description_async(
+    efd_client, start_day_obs, end_day_obs, block_id=None, columns="*", sal_index=None
+):
+    """
+    Asynchronous version of `script_description`, see it for the parameters.
+    """
+    if block_id is not None:
+        df_state = await script_states_async(
+            efd_client,
+            start_day_obs,
+            end_day_obs,
+            block_id=block_id,
+            columns=["salIndex"],
+            sal_index=sal_index,
+        )
+        if df_state.empty:
+            return pd.DataFrame()
+        sal_index = df_state["salIndex"].unique()
+
+    df_description = await _select_time_range(
+        efd_client,
+        "lsst.sal.Script.logevent_description",
+        start_day_obs,
+        end_day_obs,
+        columns=columns,
+        where=_sal_index_condition(sal_index),
+    )
+
+    return df_description
+
+
+def script_log_message(
+    efd_client, start_day_obs, end_day_obs, columns="*", sal_index=None
+):
+    """
+    Query the EFD for the log messages of the Script SAL component.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    start_day_obs : int or astropy.time.Time
+        The first day of observations to query.
+    end_day_obs : int or astropy.time.Time
+        The last day of observations to query.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+    sal_index : int, optional
+        Only retrieve the rows of the Script with this SAL index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the log messages of the Script SAL component.
+    """
+    return run_sync(
+        script_log_message_async(
+            efd_client,
+            start_day_obs,
+            end_day_obs,
+            columns=columns,
+            sal_index=sal_index,
+        )
+    )
+
+
+async def script_log_message_async(
+    efd_client, start_day_obs, end_day_obs, columns="*", sal_index=None
+):
+    """
+    Asynchronous version of `script_log_message`, see it for the parameters.
+    """
+    df_log_message = await _select_time_range(
+        efd_client,
+        "lsst.sal.Script.logevent_logMessage",
+        start_day_obs,
+        end_day_obs,
+        columns=columns,
+        where=_sal_index_condition(sal_index),
+    )
+
+    return df_log_message
+
+
+def script_states(
+    efd_client, start_day_obs, end_day_obs, block_id=None, columns="*", sal_index=None
+):
+    """
+    Query the EFD for the state of the Script SAL component.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    start_day_obs : int or astropy.time.Time
+        The first day of observations to query.
+    end_day_obs : int or astropy.time.Time
+        The last day of observations to query.
+    block_id : str, optional
+        The block ID to filter by. The filter is applied by the EFD, with
+        the same matching rules as `lsst.sitcom.tn092.utils.filter_by_block_id`.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+    sal_index : int, optional
+        Only retrieve the rows of the Script with this SAL index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the state of the Script SAL component.
+    """
+    return run_sync(
+        script_states_async(
+            efd_client,
+            start_day_obs,
+            end_day_obs,
+            block_id=block_id,
+            columns=columns,
+            sal_index=sal_index,
+        )
     )
 
+
+async def script_states_async(
+    efd_client, start_day_obs, end_day_obs, block_id=None, columns="*", sal_index=None
+):
+    """
+    Asynchronous version of `script_states`, see it for the parameters.
+    """
+    where = _sal_index_condition(sal_index)
+
+    if block_id is not None:
+        where.append(f'"blockId" =~ /{format_block_id(block_id)}/')
+
+    df_state = await _select_time_range(
+        efd_client,
+        "lsst.sal.Script.logevent_state",
+        start_day_obs,
+        end_day_obs,
+        columns=columns,
+        where=where,
+    )
+
+    return df_state
+
+
+def block_status(client, start_day_obs, end_day_obs, block_name=None, columns="*"):
+    """
+    Query the EFD for the block status.
+
+    Parameters
+    ----------
+    client : EfdClient
+        The EFD client to use for querying.
+    start_day_obs : int or astropy.time.Time
+        The first day of observations to query.
+    end_day_obs : int or astropy.time.Time
+        The last day of observations to query.
+    block_name : str, optional
+        The name of the block to query. The filter is applied by the EFD.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the block status.
+    """
+    return run_sync(
+        block_status_async(
+            client, start_day_obs, end_day_obs, block_name=block_name, columns=columns
+        )
+    )
+
+
+async def block_status_async(
+    client, start_day_obs, end_day_obs, block_name=None, columns="*"
+):
+    """
+    Asynchronous version of `block_status`, see it for the parameters.
+    """
+    where = []
+
     if block_name is not None:
-        df_block = df_block[df_block.id == block_name]
+        where.append(f'"id" = {_influx_string(block_name)}')
+
+    df_block = await _select_time_range(
+        client,
+        "lsst.sal.Scheduler.logevent_blockStatus",
+        start_day_obs,
+        end_day_obs,
+        columns=columns,
+        where=where,
+    )
 
     return df_block
+
+
+def _chunks(items, size):
+    """
+    Split a sequence into consecutive chunks of at most ``size`` items.
+    """
+    if size < 1:
+        raise ValueError(f"Chunk size must be a positive integer, got {size}.")
+    items = list(items)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _set_event_loop():
+    """
+    Give the current thread its own event loop, so that synchronous EFD
+    helpers that call `asyncio.get_event_loop` work outside the main thread.
+    """
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def _discover_events(event_maker, day_obs):
+    """
+    Find the TMA events of a day_obs, recorded as a "discovery" span when
+    instrumentation is active.
+    """
+    with span("discovery", day_obs=day_obs) as current:
+        events = event_maker.getEvents(day_obs)
+        if current is not None:
+            current.attrs["n_events"] = len(events)
+    return events
+
+
+async def _select_time_range(
+    efd_client,
+    topic,
+    begin,
+    end,
+    columns="*",
+    where=None,
+    include_end=True,
+    merge=True,
+):
+    """
+    Query a topic over a time range, with the column projection and the
+    extra ``where`` conditions applied by the EFD.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    topic : str
+        The EFD topic to query.
+    begin, end : int or astropy.time.Time
+        The time range to query. Integers are taken as day_obs and cover
+        from the start of ``begin`` to the end of ``end``.
+    columns : list of str or "*", optional
+        The columns to retrieve (default is all of them).
+    where : list of str, optional
+        Extra InfluxQL conditions, combined with AND.
+    include_end : bool, optional
+        Whether samples at exactly ``end`` are included (default is True).
+    merge : bool, optional
+        Whether the request can be merged with overlapping selections made
+        at the same time, see `lsst.sitcom.tn092.coalesce.QueryCoalescer`.
+        Chunked scans use False to keep each request bounded (default is
+        True).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows in the time range that meet the conditions.
+    """
+    begin, end = _to_time_range(begin, end)
+
+    fields = "*" if columns == "*" else ", ".join(f'"{c}"' for c in columns)
+
+    async def fetch(begin, end, include_end):
+        conditions = [
+            f"time >= '{_influx_time(begin)}'",
+            f"time {'<=' if include_end else '<'} '{_influx_time(end)}'",
+        ]
+        conditions.extend(where or [])
+
+        query = f"""
+            SELECT {fields}
+            FROM "{topic}"
+            WHERE {" AND ".join(conditions)}
+        """
+
+        return pd.DataFrame(await _influx_query(efd_client, query, topic))
+
+    window = (pd.Timestamp(f"{begin.utc.isot}Z"), pd.Timestamp(f"{end.utc.isot}Z"))
+
+    # Overlapping selections of the same data made at the same time share
+    # a single request.
+    coalescer = current_coalescer()
+    if coalescer is None:
+        return await fetch(*window, include_end)
+
+    key = (topic, fields, tuple(where or []))
+    return await coalescer.select(
+        efd_client, key, *window, include_end, fetch, merge=merge
+    )
+
+
+def _to_time_range(begin, end):
+    """
+    Convert a time range given as day_obs or Time objects to Time objects.
+    """
+    if isinstance(begin, int):
+        begin = getDayObsStartTime(begin)
+    if isinstance(end, int):
+        end = getDayObsEndTime(end)
+    return begin, end
+
+
+def _time_chunk_windows(begin, end, chunk_duration):
+    """
+    Split a time range into consecutive (begin, end) windows of at most
+    ``chunk_duration`` seconds.
+    """
+    if chunk_duration <= 0:
+        raise ValueError(f"chunk_duration must be positive, got {chunk_duration}.")
+
+    begin, end = _to_time_range(begin, end)
+    n_chunks = int(np.ceil((end - begin).sec / chunk_duration))
+    edges = begin + TimeDelta(np.arange(n_chunks + 1) * chunk_duration, format="sec")
+    edges[-1] = end
+
+    return list(zip(edges[:-1], edges[1:]))
+
+
+async def _time_chunk_values(
+    efd_client, topic, columns, begin, end, include_end=False, dtype=np.float64
+):
+    """
+    Read one time chunk of a topic as numpy arrays.
+    """
+    df = await _select_time_range(
+        efd_client,
+        topic,
+        begin,
+        end,
+        columns=columns,
+        include_end=include_end,
+        merge=False,
+    )
+
+    if df.empty:
+        return np.empty(0), np.empty((0, len(columns)), dtype=dtype)
+
+    times = (df.index - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    values = df[columns].to_numpy(dtype=dtype)
+
+    return np.asarray(times, dtype=float), values
+
+
+def _exceedance_condition(columns, limit):
+    """
+    Return the InfluxQL condition selecting the samples where the absolute
+    value of any of the columns exceeds a limit.
+    """
+    predicates = " OR ".join(
+        f'"{column}" > {limit:g} OR "{column}" < {-limit:g}' for column in columns
+    )
+    return f"({predicates})"
+
+
+def _exceedance_intervals(df, limits, max_gap, tma_events=None):
+    """
+    Merge the hardpoint force samples beyond the lowest limit into
+    intervals, see `hp_force_exceedances`.
+    """
+    columns = {
+        name: []
+        for name in ("hardpoint", "begin", "end", "n_samples", "peak", "peak_time")
+    }
+
+    # Times are kept as integer nanoseconds, so they come back exactly.
+    if df.empty:
+        times, hardpoints = np.empty(0, dtype=np.int64), []
+    else:
+        times = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        hardpoints = HP_FORCE_COLUMNS
+
+    for hp, column in enumerate(hardpoints):
+        values = df[column].to_numpy(dtype=float)
+        mask = np.abs(values) > limits[0]
+        t, v = times[mask], values[mask]
+        if t.size == 0:
+            continue
+
+        # A new interval starts after a gap or when the sign flips.
+        breaks = (np.diff(t) > max_gap * 1e9) | (np.diff(np.sign(v)) != 0)
+        starts = np.flatnonzero(np.concatenate([[True], breaks]))
+        counts = np.diff(np.append(starts, t.size))
+
+        # Sort by interval, then by decreasing absolute force, so the peak
+        # is the first sample of each interval.
+        group = np.repeat(np.arange(starts.size), counts)
+        peaks = np.lexsort((-np.abs(v), group))[starts]
+
+        columns["hardpoint"].append(np.full(starts.size, hp))
+        columns["begin"].append(t[starts])
+        columns["end"].append(t[starts + counts - 1])
+        columns["n_samples"].append(counts)
+        columns["peak"].append(v[peaks])
+        columns["peak_time"].append(t[peaks])
+
+    columns = {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        for name, parts in columns.items()
+    }
+    order = np.lexsort((columns["hardpoint"], columns["begin"]))
+    columns = {name: values[order] for name, values in columns.items()}
+
+    begin, end = columns["begin"], columns["end"]
+    peak = columns["peak"].astype(float)
+
+    day_obs = np.full(begin.size, -1)
+    seq_num = np.full(begin.size, -1)
+    if tma_events is not None and begin.size > 0:
+        index = EventIndex(tma_events)
+        # Single-sample intervals are widened to overlap the event they
+        # fall in.
+        begin_unix, end_unix = begin / 1e9, end / 1e9
+        interval_index, event_index = index.overlapping(
+            begin_unix, np.maximum(end_unix, np.nextafter(begin_unix, np.inf))
+        )
+        interval_index, first = np.unique(interval_index, return_index=True)
+        events = index.events[event_index[first]]
+        day_obs[interval_index] = [evt.dayObs for evt in events]
+        seq_num[interval_index] = [evt.seqNum for evt in events]
+
+    exceeded = np.searchsorted(limits, np.abs(peak), side="left") - 1
+
+    return pd.DataFrame(
+        {
+            "hardpoint": columns["hardpoint"].astype(int),
+            "begin": pd.to_datetime(begin, unit="ns", utc=True),
+            "end": pd.to_datetime(end, unit="ns", utc=True),
+            "duration": (end - begin) / 1e9,
+            "n_samples": columns["n_samples"].astype(int),
+            "peak": peak,
+            "peak_time": pd.to_datetime(columns["peak_time"], unit="ns", utc=True),
+            "limit": limits[exceeded] if peak.size else np.empty(0),
+            "day_obs": pd.Series(day_obs).where(day_obs >= 0).astype("Int64"),
+            "seq_num": pd.Series(seq_num).where(seq_num >= 0).astype("Int64"),
+        }
+    )
+
+
+def _influx_time(timestamp):
+    """
+    Format a UTC `pandas.Timestamp` as an InfluxQL time literal, with the
+    millisecond precision of `astropy.time.Time.isot`.
+    """
+    return f"{timestamp.tz_convert(None).isoformat(timespec='milliseconds')}Z"
+
+
+def _sal_index_condition(sal_index):
+    """
+    Return the InfluxQL conditions that select a SAL index, or any of a
+    list of them, if any.
+    """
+    if sal_index is None:
+        return []
+
+    indices = sorted({int(i) for i in np.atleast_1d(sal_index)})
+    condition = " OR ".join(f'"salIndex" = {i}' for i in indices)
+    return [condition if len(indices) == 1 else f"({condition})"]
+
+
+def _influx_string(value):
+    """
+    Quote a string literal for InfluxQL.
+    """
+    escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+async def _submit(executor, func, *args):
+    """
+    Await a query directly or through an executor, if one is given.
+    """
+    if executor is None:
+        return await func(*args)
+    return await executor.submit(func, *args)
+
+
+def _time_window(tma_slew_event):
+    """
+    Return the InfluxQL time predicate that covers a TMA event.
+    """
+    return (
+        f"time >= '{tma_slew_event.begin.isot}Z' "
+        f"AND time < '{tma_slew_event.end.isot}Z'"
+    )
+
+
+def _m1m3_hp_minmax_statement(tma_slew_event):
+    """
+    Build the InfluxQL statement with the minimum and maximum measured
+    forces on each hardpoint during a TMA event.
+    """
+    fields = ",\n            ".join(
+        f"{stat.upper()}(measuredForce{hp}) AS {stat}_forces_{hp}"
+        for hp in range(6)
+        for stat in ("min", "max")
+    )
+    return f"""
+        SELECT
+            {fields}
+        FROM "{HP_TOPIC}"
+        WHERE {_time_window(tma_slew_event)}
+    """
+
+
+def _fa_snapshot_statement(tma_slew_event, statistics):
+    """
+    Build the InfluxQL statement with the statistics of every force
+    actuator force column during a TMA event.
+    """
+    fields = ",\n            ".join(
+        f'{stat.upper()}("{column}") AS {stat}_{column}'
+        for column in fa_force_columns(FA_AXES)
+        for stat in statistics
+    )
+    return f"""
+        SELECT
+            {fields}
+        FROM "{FA_TOPIC}"
+        WHERE {_time_window(tma_slew_event)}
+    """
+
+
+@functools.lru_cache(maxsize=8)
+def _fa_snapshot_layout(statistics):
+    """
+    Map the columns of the `fa_force_snapshots` results to the flattened
+    (actuator, axis, statistic) array.
+
+    Returns
+    -------
+    aliases : list of str
+        The result columns.
+    targets : numpy.ndarray of int
+        The flat position of each column in the per-event array.
+    """
+    aliases, targets = [], []
+
+    for actuator, fa in enumerate(FATable):
+        indices = (fa.x_index, fa.y_index, fa.z_index)
+        for axis, (name, index) in enumerate(zip(FA_AXES, indices)):
+            if index is None:
+                continue
+            for i, stat in enumerate(statistics):
+                aliases.append(f"{stat}_{name}Force{index}")
+                targets.append(
+                    (actuator * len(FA_AXES) + axis) * len(statistics) + i
+                )
+
+    return aliases, np.array(targets)
+
+
+def _hp_statistic_names(statistics):
+    """
+    Normalize and check the names of the `hp_force_statistics`
+    statistics, e.g. "P95.0" becomes "p95".
+    """
+    names = []
+
+    for stat in statistics:
+        stat = str(stat).lower()
+
+        if stat.startswith("p") and stat not in HP_AGGREGATES:
+            try:
+                q = float(stat[1:])
+            except ValueError:
+                q = np.nan
+            if not 0 <= q <= 100:
+                raise ValueError(f"Invalid percentile {stat!r}, expected e.g. 'p95'.")
+            stat = f"p{q:g}"
+        elif stat not in HP_AGGREGATES and stat != "rms":
+            raise ValueError(
+                f"Unknown statistic {stat!r}, expected one of "
+                f"{HP_AGGREGATES + ('rms',)} or a percentile such as 'p95'."
+            )
+
+        if stat not in names:
+            names.append(stat)
+
+    return tuple(names)
+
+
+def _hp_statistic_aggregates(statistics):
+    """
+    Return the InfluxQL aggregates needed for the `hp_force_statistics`
+    statistics, by name, as format strings of the column.
+    """
+    aggregates = {}
+
+    for stat in statistics:
+        if stat == "rms":
+            for needed in ("count", "mean", "stddev"):
+                aggregates.setdefault(needed, f"{needed.upper()}({{}})")
+        elif stat in HP_AGGREGATES:
+            aggregates[stat] = f"{stat.upper()}({{}})"
+        else:
+            aggregates[stat] = f"PERCENTILE({{}}, {stat[1:]})"
+
+    return aggregates
+
+
+def _hp_statistics_statement(tma_slew_event, aggregates):
+    """
+    Build the InfluxQL statement with the statistics of the measured forces
+    on each hardpoint during a TMA event.
+    """
+    fields = ",\n            ".join(
+        f'{aggregate.format(column)} AS "{stat}_forces_{hp}"'
+        for hp, column in enumerate(HP_FORCE_COLUMNS)
+        for stat, aggregate in aggregates.items()
+    )
+    return f"""
+        SELECT
+            {fields}
+        FROM "{HP_TOPIC}"
+        WHERE {_time_window(tma_slew_event)}
+    """
+
+
+def _hp_statistics_frame(events, aggregates, statistics):
+    """
+    Build the `hp_force_statistics` table from the ``(n_events, 6)`` values
+    of each aggregate.
+    """
+    stats = {}
+    for stat in statistics:
+        if stat == "rms":
+            # mean(x**2) = mean**2 + (n - 1) / n * stddev**2, with the
+            # sample standard deviation, which is undefined for n = 1.
+            n, mean = aggregates["count"], aggregates["mean"]
+            stddev = np.where(n > 1, aggregates["stddev"], 0.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stats[stat] = np.sqrt(mean**2 + (n - 1) / n * stddev**2)
+        else:
+            stats[stat] = aggregates[stat]
+
+    columns = {}
+    for hp in range(6):
+        for stat, values in stats.items():
+            name = f"{stat}_forces_{hp}"
+            if stat == "count":
+                count = pd.Series(values[:, hp])
+                columns[name] = count.where(count.notna()).astype("Int64")
+            else:
+                columns[name] = values[:, hp]
+
+    if "min" in stats and "max" in stats:
+        columns["min_forces"] = np.min(stats["min"], axis=1)
+        columns["max_forces"] = np.max(stats["max"], axis=1)
+
+    columns["begin"] = Time([evt.begin for evt in events]).isot if events else []
+    columns["end"] = Time([evt.end for evt in events]).isot if events else []
+    columns["seq_num"] = np.array([evt.seqNum for evt in events], dtype=int)
+    columns["day_obs"] = np.array([evt.dayObs for evt in events], dtype=int)
+    columns["end_reason"] = pd.Series(
+        [TMAState(evt.endReason) for evt in events], dtype=object
+    )
+
+    return pd.DataFrame(columns)
+
+
+def _mtmount_position_statement(axis, prefix, tma_slew_event):
+    """
+    Build the InfluxQL statement with the first and last actual position
+    of one of the MTMount axes during a TMA event.
+    """
+    return f"""
+        SELECT
+            FIRST(actualPosition) AS {prefix}_start,
+            LAST(actualPosition) AS {prefix}_end
+        FROM "lsst.sal.MTMount.{axis}"
+        WHERE {_time_window(tma_slew_event)}
+    """
+
+
+async def _influx_query(efd_client, query, topic, statements=1):
+    """
+    Send an InfluxQL request, or share the identical one already in flight,
+    see `lsst.sitcom.tn092.coalesce.QueryCoalescer`.
+    """
+    coalescer = current_coalescer()
+    if coalescer is None:
+        return await _send_query(efd_client, query, topic, statements)
+
+    return await coalescer.query(
+        efd_client,
+        query,
+        functools.partial(_send_query, efd_client, query, topic, statements),
+    )
+
+
+async def _send_query(efd_client, query, topic, statements=1):
+    """
+    Send an InfluxQL request, recording it as a "query" span when
+    instrumentation is active.
+    """
+    with span(topic, kind="query", statements=statements) as current:
+        result = await efd_client.influx_client.query(query)
+        if current is not None:
+            current.attrs["rows"], current.attrs["payload_bytes"] = result_size(
+                result
+            )
+
+    return result
+
+
+async def _query_statements(efd_client, topic, statements):
+    """
+    Send several InfluxQL statements in a single request.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    topic : str
+        The topic queried by the statements, used to label the request.
+    statements : list of str
+        The InfluxQL statements.
+
+    Returns
+    -------
+    list
+        One result per statement, in the same order as ``statements``.
+        Statements without data are returned as empty dictionaries, as
+        the influx client does for single statements.
+    """
+    if len(statements) == 0:
+        return []
+
+    result = await _influx_query(
+        efd_client, ";\n".join(statements), topic, statements=len(statements)
+    )
+
+    # The influx client unwraps single statement responses, but returns a
+    # list of {measurement: DataFrame} dictionaries for multiple ones.
+    if len(statements) == 1:
+        return [result]
+
+    return [
+        next(iter(series.values())) if len(series) > 0 else {}
+        for series in result
+    ]
+
+
+async def _cached_query(efd_client, topic, tma_slew_event, query, cache=None):
+    """
+    Send a single InfluxQL statement about a TMA event, going through the
+    on-disk cache if one is given.
+    """
+    if cache is not None:
+        df = cache.get(topic, tma_slew_event, query)
+        if df is not None:
+            return df
+
+    df = await _influx_query(efd_client, query, topic)
+
+    if cache is not None:
+        cache.put(topic, tma_slew_event, query, pd.DataFrame(df))
+
+    return df
+
+
+async def _query_events(
+    efd_client, topic, events, statements, executor=None, cache=None
+):
+    """
+    Send one InfluxQL statement per TMA event in a single request, leaving
+    out the events already in the on-disk cache if one is given.
+
+    Returns
+    -------
+    list
+        One result per event, in the same order as ``events``.
+    """
+    if cache is None:
+        return await _submit(
+            executor, _query_statements, efd_client, topic, statements
+        )
+
+    results = [cache.get(topic, evt, query) for evt, query in zip(events, statements)]
+    missing = [i for i, df in enumerate(results) if df is None]
+
+    fetched = await _submit(
+        executor,
+        _query_statements,
+        efd_client,
+        topic,
+        [statements[i] for i in missing],
+    )
+
+    for i, df in zip(missing, fetched):
+        cache.put(topic, events[i], statements[i], pd.DataFrame(df))
+        results[i] = df
+
+    return results
+
+
+def _format_m1m3_hp_minmax(df_forces):
+    """
+    Add the overall minimum and maximum forces to the per-hardpoint
+    results, or build a placeholder row if no data was returned.
+    """
+    if pd.DataFrame(df_forces).empty:
+        df_forces = pd.DataFrame(
+            columns=HP_MINMAX_COLUMNS + ["min_forces", "max_forces"],
+            data=[[None] * (len(HP_MINMAX_COLUMNS) + 2)]
+        )
+    else:
+        df_forces["min_forces"] = df_forces.filter(like="min_forces").min(axis=1)
+        df_forces["max_forces"] = df_forces.filter(like="max_forces").max(axis=1)
+
+    return df_forces
+
+
+def _format_mtmount_position(df_position, prefix):
+    """
+    Add the position difference to the MTMount axis results, or build a
+    placeholder row if no data was returned.
+    """
+    if pd.DataFrame(df_position).empty:
+        return pd.DataFrame(
+            columns=[f"{prefix}_start", f"{prefix}_end", f"{prefix}_diff"],
+            data=[[None, None, None]]
+        )
+
+    df_position[f"{prefix}_diff"] = (
+        df_position[f"{prefix}_end"] - df_position[f"{prefix}_start"]
+    )
+    return df_position
+
+
+def _event_queries():
+    """
+    Return the (topic, statement builder, columns) of the queries sent for
+    every TMA event by `hp_forces_and_azimuth_elevation`.
+    """
+    return [
+        (
+            "lsst.sal.MTMount.azimuth",
+            functools.partial(_mtmount_position_statement, "azimuth", "az"),
+            ["az_start", "az_end"],
+        ),
+        (
+            "lsst.sal.MTMount.elevation",
+            functools.partial(_mtmount_position_statement, "elevation", "el"),
+            ["el_start", "el_end"],
+        ),
+        (
+            HP_TOPIC,
+            _m1m3_hp_minmax_statement,
+            HP_MINMAX_COLUMNS,
+        ),
+    ]
+
+
+async def _event_values(efd_client, tma_slew_event, executor=None, cache=None):
+    """
+    Query the azimuth, elevation and forces of a TMA event at the same time.
+
+    Returns
+    -------
+    numpy.ndarray
+        The values of `EVENT_VALUE_COLUMNS`, NaN where there is no data.
+    """
+    queries = _event_queries()
+    results = await asyncio.gather(
+        *[
+            _submit(
+                executor,
+                _cached_query,
+                efd_client,
+                topic,
+                tma_slew_event,
+                statement(tma_slew_event),
+                cache,
+            )
+            for topic, statement, _ in queries
+        ]
+    )
+
+    return np.concatenate(
+        [
+            _result_values(result, columns)
+            for result, (_, _, columns) in zip(results, queries)
+        ]
+    )
+
+
+async def _batch_values(efd_client, events, executor=None, cache=None):
+    """
+    Query the azimuth, elevation and forces of a chunk of TMA events with
+    one request per topic.
+
+    Each request carries one InfluxQL statement per event, so the
+    aggregates are still computed per event window on the server and the
+    returned rows map back to the events in order.
+
+    Returns
+    -------
+    numpy.ndarray
+        One row per event with the values of `EVENT_VALUE_COLUMNS`, NaN
+        where there is no data.
+    """
+    queries = _event_queries()
+    results = await asyncio.gather(
+        *[
+            _query_events(
+                efd_client,
+                topic,
+                events,
+                [statement(evt) for evt in events],
+                executor=executor,
+                cache=cache,
+            )
+            for topic, statement, _ in queries
+        ]
+    )
+
+    values = np.full((len(events), len(EVENT_VALUE_COLUMNS)), np.nan)
+    first = 0
+
+    for topic_results, (_, _, columns) in zip(results, queries):
+        for row, result in enumerate(topic_results):
+            values[row, first : first + len(columns)] = _result_values(result, columns)
+        first += len(columns)
+
+    return values
+
+
+def _result_values(result, columns):
+    """
+    Extract the values of a single-row query result, or NaN if the query
+    returned no data.
+    """
+    if isinstance(result, pd.DataFrame) and not result.empty:
+        # Selecting the columns by label costs more than the query itself
+        # for large batches, so the first row is looked up by name instead.
+        row = dict(zip(result.columns, result.to_numpy(dtype=float)[0]))
+        return np.array([row[column] for column in columns])
+    return np.full(len(columns), np.nan)
+
+
+def _events_frame(events, values):
+    """
+    Build the `hp_forces_and_azimuth_elevation` table from the per-event
+    values, computing the derived and event columns for all rows at once.
+    """
+    az_start, az_end, el_start, el_end = values[:, :4].T
+    min_forces = values[:, 4::2]
+    max_forces = values[:, 5::2]
+
+    columns = {
+        "az_start": az_start,
+        "az_end": az_end,
+        "az_diff": az_end - az_start,
+        "el_start": el_start,
+        "el_end": el_end,
+        "el_diff": el_end - el_start,
+    }
+    columns.update(zip(HP_MINMAX_COLUMNS, values[:, 4:].T))
+    columns["min_forces"] = min_forces.min(axis=1)
+    columns["max_forces"] = max_forces.max(axis=1)
+    columns["begin"] = Time([evt.begin for evt in events]).isot
+    columns["end"] = Time([evt.end for evt in events]).isot
+    columns["seq_num"] = np.array([evt.seqNum for evt in events], dtype=int)
+    columns["day_obs"] = np.array([evt.dayObs for evt in events], dtype=int)
+    # The end reasons stay TMAState members, so labels can use their name.
+    columns["end_reason"] = pd.Series(
+        [TMAState(evt.endReason) for evt in events], dtype=object
+    )
+
+    return pd.DataFrame(columns)
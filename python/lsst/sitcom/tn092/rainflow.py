@@ -0,0 +1,370 @@
+import numpy as np
+
+from lsst.sitcom.tn092.events import EventIndex
+from lsst.sitcom.tn092.query import HP_FORCE_COLUMNS, m1m3_hp_measured_forces_chunks
+
+
+__all__ = ["RainflowCounter", "m1m3_hp_rainflow"]
+
+
+class RainflowCounter:
+    """
+    Streaming rainflow cycle counter with fixed-bin range and mean
+    histograms, one per channel.
+
+    Samples are fed in consecutive chunks with `update`. Only the residue
+    of each channel, the reversals that have not closed a cycle yet, is
+    kept between chunks, so the memory used does not grow with the amount
+    of data. Counting a signal in chunks gives the same cycles as counting
+    it at once, and counters of consecutive periods, e.g. of different
+    day_obs, merge exactly with `merge` or ``+``.
+
+    Full cycles are closed with the four-point rule. The residue is
+    counted as half cycles by `counts` and `range_counts`, without being
+    consumed, so more data can still be added. Bins are half-open, and
+    cycles outside of the edges are kept in underflow and overflow bins.
+
+    Parameters
+    ----------
+    n_channels : int, optional
+        The number of channels, e.g. the 6 hardpoints (default is 6).
+    range_edges : array-like, optional
+        The bin edges of the cycle ranges, in N (default is 0 N to 4000 N in
+        20 N steps).
+    mean_edges : array-like, optional
+        The bin edges of the cycle means, in N (default is -2000 N to 2000 N
+        in 100 N steps).
+
+    Examples
+    --------
+    >>> counter = RainflowCounter()
+    >>> for times, forces in m1m3_hp_measured_forces_chunks(
+    ...     efd_client, day_obs, day_obs
+    ... ):
+    ...     counter.update(forces)
+    >>> cycles = counter.range_counts(channel=0)
+    """
+
+    def __init__(self, n_channels=6, range_edges=None, mean_edges=None):
+        if range_edges is None:
+            range_edges = np.arange(0, 4001, 20)
+        if mean_edges is None:
+            mean_edges = np.arange(-2000, 2001, 100)
+
+        self.n_channels = int(n_channels)
+        self.range_edges = _check_edges(range_edges)
+        self.mean_edges = _check_edges(mean_edges)
+
+        # (channel, range bin, mean bin) counts of full cycles, with the
+        # underflow in the first bin and the overflow in the last.
+        self._cycles = np.zeros(
+            (self.n_channels, self.range_edges.size + 1, self.mean_edges.size + 1),
+            dtype=np.int64,
+        )
+        self._residue = [np.empty(0) for _ in range(self.n_channels)]
+        self.n_samples = np.zeros(self.n_channels, dtype=np.int64)
+
+    @property
+    def range_centers(self):
+        """
+        The center of each range bin, in N.
+        """
+        return 0.5 * (self.range_edges[1:] + self.range_edges[:-1])
+
+    @property
+    def mean_centers(self):
+        """
+        The center of each mean bin, in N.
+        """
+        return 0.5 * (self.mean_edges[1:] + self.mean_edges[:-1])
+
+    @property
+    def residue(self):
+        """
+        The reversals of each channel that have not closed a cycle yet.
+        """
+        return [residue.copy() for residue in self._residue]
+
+    def update(self, values):
+        """
+        Count the cycles of the next samples.
+
+        Parameters
+        ----------
+        values : array-like
+            The ``(n_samples, n_channels)`` values, following the ones
+            already counted, e.g. the values yielded by
+            `lsst.sitcom.tn092.query.iter_time_chunks`. A 1D array is taken
+            as a single channel. Missing values are skipped.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+
+        if values.shape[1] != self.n_channels:
+            raise ValueError(
+                f"Expected {self.n_channels} channels, got {values.shape[1]}."
+            )
+
+        for channel in range(self.n_channels):
+            column = values[:, channel]
+            column = column[np.isfinite(column)]
+            self.n_samples[channel] += column.size
+            self._count(channel, column)
+
+    def merge(self, other):
+        """
+        Add the cycles of a counter of the following period to this one.
+
+        The residue of ``other`` is appended to the residue of this counter,
+        closing the cycles that span both periods, so merging counters in
+        time order gives the same result as counting all the samples with a
+        single counter. Merging in another order only changes how the
+        residue is paired into cycles.
+
+        Parameters
+        ----------
+        other : RainflowCounter
+            The counter to merge, with the same channels and bins.
+
+        Returns
+        -------
+        RainflowCounter
+            This counter.
+        """
+        if (
+            self.n_channels != other.n_channels
+            or not np.array_equal(self.range_edges, other.range_edges)
+            or not np.array_equal(self.mean_edges, other.mean_edges)
+        ):
+            raise ValueError(
+                "Cannot merge counters with different channels or bin edges."
+            )
+
+        self._cycles += other._cycles
+        self.n_samples += other.n_samples
+
+        for channel in range(self.n_channels):
+            self._count(channel, other._residue[channel])
+
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        """
+        Return an independent copy of the counter.
+        """
+        counter = type(self)(self.n_channels, self.range_edges, self.mean_edges)
+        counter._cycles = self._cycles.copy()
+        counter._residue = self.residue
+        counter.n_samples = self.n_samples.copy()
+        return counter
+
+    def counts(self, channel=None, residue=True, outliers=False):
+        """
+        Number of cycles per range and mean bin.
+
+        Parameters
+        ----------
+        channel : int, optional
+            Only count the cycles of this channel (default is all).
+        residue : bool, optional
+            If True, the residue is included as half cycles (default is
+            True).
+        outliers : bool, optional
+            If True, the underflow and overflow bins are included as the
+            first and last elements of each axis (default is False).
+
+        Returns
+        -------
+        numpy.ndarray
+            The ``(n_range_bins, n_mean_bins)`` counts.
+        """
+        channels = range(self.n_channels) if channel is None else [channel]
+
+        counts = self._cycles[list(channels)].sum(axis=0).astype(float)
+        if residue:
+            for i in channels:
+                ranges, means = _half_cycles(self._residue[i])
+                counts += 0.5 * self._bin_counts(ranges, means)
+
+        return counts if outliers else counts[1:-1, 1:-1]
+
+    def range_counts(self, channel=None, residue=True, outliers=False):
+        """
+        Number of cycles per range bin, for all means.
+
+        Parameters
+        ----------
+        channel : int, optional
+            Only count the cycles of this channel (default is all).
+        residue : bool, optional
+            If True, the residue is included as half cycles (default is
+            True).
+        outliers : bool, optional
+            If True, the underflow and overflow counts are included as the
+            first and last elements (default is False).
+
+        Returns
+        -------
+        numpy.ndarray
+            The counts.
+        """
+        counts = self.counts(channel, residue, outliers=True).sum(axis=1)
+        return counts if outliers else counts[1:-1]
+
+    def _count(self, channel, values):
+        """
+        Append values to the residue of a channel and count the cycles they
+        close.
+        """
+        if values.size == 0:
+            return
+
+        reversals = _reversals(np.concatenate([self._residue[channel], values]))
+        ranges, means, self._residue[channel] = _rainflow(reversals)
+        self._cycles[channel] += self._bin_counts(ranges, means)
+
+    def _bin_counts(self, ranges, means):
+        shape = self._cycles.shape[1:]
+        range_index = np.searchsorted(self.range_edges, ranges, side="right")
+        mean_index = np.searchsorted(self.mean_edges, means, side="right")
+        flat = np.bincount(
+            range_index * shape[1] + mean_index, minlength=shape[0] * shape[1]
+        )
+        return flat.reshape(shape)
+
+
+def m1m3_hp_rainflow(efd_client, begin, end, events=None, counter=None, **kwargs):
+    """
+    Count the load cycles of the M1M3 hardpoints over a time range.
+
+    Parameters
+    ----------
+    efd_client : EfdClient
+        The EFD client to use for querying.
+    begin, end : int or astropy.time.Time
+        The time range to read. Integers are taken as day_obs.
+    events : list of TMAEvent, optional
+        If given, only the samples during these events, e.g. the slews, are
+        counted, as one continuous signal (default is all the samples).
+    counter : RainflowCounter, optional
+        A counter of the preceding period to continue, e.g. of the previous
+        day_obs (default is a new counter with the default bins).
+    **kwargs
+        Passed to `lsst.sitcom.tn092.query.iter_time_chunks`, e.g.
+        ``chunk_duration``.
+
+    Returns
+    -------
+    RainflowCounter
+        The counter, with one channel per hardpoint.
+    """
+    if counter is None:
+        counter = RainflowCounter(n_channels=len(HP_FORCE_COLUMNS))
+
+    index = None if events is None else EventIndex(events)
+
+    for times, forces in m1m3_hp_measured_forces_chunks(
+        efd_client, begin, end, **kwargs
+    ):
+        if index is not None:
+            forces = forces[index.containing(times) >= 0]
+        counter.update(forces)
+
+    return counter
+
+
+def _check_edges(edges):
+    edges = np.asarray(edges, dtype=float)
+    if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError("The bin edges must be a monotonically increasing 1D array.")
+    return edges
+
+
+def _reversals(values):
+    """
+    Reduce a signal to its end points and local extrema.
+    """
+    # Drop repeated values, so plateaus do not hide the extrema.
+    keep = np.ones(values.size, dtype=bool)
+    keep[1:] = np.diff(values) != 0
+    values = values[keep]
+
+    if values.size < 3:
+        return values
+
+    slope = np.sign(np.diff(values))
+    keep = np.ones(values.size, dtype=bool)
+    keep[1:-1] = slope[1:] != slope[:-1]
+
+    return values[keep]
+
+
+def _rainflow(reversals):
+    """
+    Extract the full cycles of a sequence of reversals.
+
+    The cycles are closed with the four-point rule: reversals B and C form
+    a cycle if the range B-C is not larger than the ranges A-B and C-D. All
+    the closable pairs that do not share a reversal are removed at once,
+    which does not change the cycles found, and the passes are repeated
+    until no pair can be closed. The last few reversals, which usually only
+    close one cycle per pass, are handled one at a time.
+
+    Returns
+    -------
+    ranges, means : numpy.ndarray
+        The range and mean of each full cycle.
+    residue : numpy.ndarray
+        The reversals left.
+    """
+    ranges, means = [], []
+
+    while reversals.size >= 4:
+        amplitude = np.abs(np.diff(reversals))
+        closable = (amplitude[1:-1] <= amplitude[:-2]) & (
+            amplitude[1:-1] <= amplitude[2:]
+        )
+        # Pairs i and i + 1 share a reversal, only the first is closed.
+        closable[1:] &= ~closable[:-1]
+        first = np.flatnonzero(closable) + 1
+
+        if first.size * 32 < reversals.size:
+            break
+
+        ranges.append(amplitude[first])
+        means.append(0.5 * (reversals[first] + reversals[first + 1]))
+
+        keep = np.ones(reversals.size, dtype=bool)
+        keep[first] = keep[first + 1] = False
+        reversals = reversals[keep]
+
+    stack = []
+    for value in reversals.tolist():
+        stack.append(value)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            amplitude = abs(b - c)
+            if amplitude > abs(a - b) or amplitude > abs(c - d):
+                break
+            ranges.append([amplitude])
+            means.append([0.5 * (b + c)])
+            del stack[-3:-1]
+
+    if len(ranges) == 0:
+        return np.empty(0), np.empty(0), np.asarray(stack, dtype=float)
+
+    return np.concatenate(ranges), np.concatenate(means), np.asarray(stack, dtype=float)
+
+
+def _half_cycles(residue):
+    """
+    Range and mean of the half cycles of a residue.
+    """
+    return np.abs(np.diff(residue)), 0.5 * (residue[1:] + residue[:-1])
@@ -0,0 +1,285 @@
+import logging
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from lsst.sitcom.tn092.utils import write_atomic
+
+
+__all__ = ["SummaryStore"]
+
+
+log = logging.getLogger(__name__)
+
+
+class SummaryStore:
+    """
+    Parquet store of per-slew summary tables, partitioned by day_obs.
+
+    Tables such as the results of
+    `lsst.sitcom.tn092.query.hp_forces_and_azimuth_elevation` or of the ICS
+    evaluation are stored as one Parquet file per day_obs under
+    ``{path}/day_obs={day_obs}/``. Reading only opens the day_obs in the
+    requested range, only decodes the requested columns and skips the row
+    groups that cannot match the filters.
+
+    The schema of the store is kept in ``{path}/_common_metadata`` and
+    widened by each write: columns that are all null on some days take the
+    type of the other days, and integer columns that are float on some
+    days, e.g. because of missing values, become float. All the day_obs
+    are read with this schema, so they are never coerced to the types of
+    whichever file is read first. Columns whose types cannot be combined,
+    such as strings and floats, are rejected.
+
+    Parameters
+    ----------
+    path : str or Path
+        The directory of the store. It is created if needed. Use one store
+        per kind of table.
+
+    Examples
+    --------
+    >>> store = SummaryStore("./data/hp_forces")
+    >>> store.write(df)
+    >>> el_only = store.read(
+    ...     columns=["el_diff", "min_forces", "max_forces"],
+    ...     day_obs_start=20240101,
+    ...     day_obs_end=20241231,
+    ...     filters=[("end_reason", "==", 2)],
+    ... )
+    """
+
+    file_name = "data.parquet"
+    schema_file_name = "_common_metadata"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def day_obs_list(self):
+        """
+        The day_obs stored, sorted.
+        """
+        return sorted(
+            int(part.name.split("=", 1)[1])
+            for part in self.path.glob("day_obs=*")
+            if (part / self.file_name).exists()
+        )
+
+    @property
+    def schema(self):
+        """
+        The `pyarrow.Schema` of the stored columns, without day_obs, or None
+        for an empty store.
+        """
+        schema_path = self.path / self.schema_file_name
+        if schema_path.exists():
+            return pq.read_schema(schema_path)
+
+        # Stores written before the schema was kept: combine the schemas of
+        # the files.
+        schemas = [
+            pq.read_schema(self.partition_path(day_obs) / self.file_name)
+            for day_obs in self.day_obs_list
+        ]
+        if len(schemas) == 0:
+            return None
+        return _unify([schema.remove_metadata() for schema in schemas])
+
+    def partition_path(self, day_obs):
+        """
+        Return the directory of the files of a day_obs.
+        """
+        return self.path / f"day_obs={int(day_obs)}"
+
+    def write(self, df, day_obs=None):
+        """
+        Store a summary table, replacing the day_obs it contains.
+
+        Each day_obs is written to a temporary file that is then renamed,
+        so readers never see partially written partitions. The schema of the
+        store is widened to the columns of the table first.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The table, with a 'day_obs' column unless ``day_obs`` is given.
+        day_obs : int, optional
+            The day_obs of all the rows, for tables without a 'day_obs'
+            column, such as the ICS evaluation of one day_obs.
+
+        Returns
+        -------
+        list of int
+            The day_obs written.
+
+        Raises
+        ------
+        ValueError
+            If the table has no day_obs, or if the type of a column cannot
+            be combined with its type in the store.
+        """
+        if day_obs is not None:
+            df = df.assign(day_obs=int(day_obs))
+        elif "day_obs" not in df.columns:
+            raise ValueError("The table has no 'day_obs' column, pass day_obs.")
+
+        tables = {
+            int(value): pa.Table.from_pandas(
+                df_day.drop(columns="day_obs"), preserve_index=False
+            )
+            for value, df_day in df.groupby("day_obs", sort=True)
+        }
+        if len(tables) == 0:
+            return []
+
+        schemas = [table.schema.remove_metadata() for table in tables.values()]
+        if self.schema is not None:
+            schemas.insert(0, self.schema)
+        schema = _unify(schemas)
+        write_atomic(
+            self.path / self.schema_file_name,
+            lambda path: pq.write_metadata(schema, path),
+        )
+
+        written = []
+        for value, table in tables.items():
+            self._write_partition(value, table.cast(_select(schema, table)))
+            written.append(value)
+
+        return written
+
+    def read(
+        self, columns=None, day_obs_start=None, day_obs_end=None, filters=None
+    ):
+        """
+        Read summary tables back, with the column selection and filters
+        applied while reading.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            The columns to read (default is all of them). 'day_obs' is
+            always included.
+        day_obs_start, day_obs_end : int, optional
+            The day_obs range to read, inclusive (default is all of them).
+        filters : list of tuple, optional
+            Row filters as ``(column, op, value)`` tuples combined with AND,
+            or a list of such lists combined with OR, as in
+            `pyarrow.parquet.read_table`. The operators are "==", "!=",
+            "<", "<=", ">", ">=", "in" and "not in".
+
+        Returns
+        -------
+        pandas.DataFrame
+            The matching rows, sorted by day_obs.
+        """
+        if len(self.day_obs_list) == 0:
+            return pd.DataFrame()
+
+        expression = None
+        if filters:
+            expression = pq.filters_to_expression(filters)
+        if day_obs_start is not None:
+            expression = _and(expression, ds.field("day_obs") >= int(day_obs_start))
+        if day_obs_end is not None:
+            expression = _and(expression, ds.field("day_obs") <= int(day_obs_end))
+
+        if columns is not None:
+            columns = ["day_obs"] + [c for c in columns if c != "day_obs"]
+
+        table = self.dataset().to_table(columns=columns, filter=expression)
+        df = table.to_pandas()
+
+        return df.sort_values("day_obs", kind="stable").reset_index(drop=True)
+
+    def dataset(self):
+        """
+        Return the store as a `pyarrow.dataset.Dataset`, for queries that
+        `read` does not cover. All the day_obs are read with the schema of
+        the store.
+        """
+        day_obs_field = pa.field("day_obs", pa.int64())
+        partitioning = ds.partitioning(pa.schema([day_obs_field]), flavor="hive")
+        schema = self.schema
+        if schema is not None:
+            schema = schema.append(day_obs_field)
+        return ds.dataset(
+            self.path,
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            exclude_invalid_files=False,
+            ignore_prefixes=[".", "_"],
+        )
+
+    def delete(self, day_obs):
+        """
+        Remove a day_obs from the store.
+        """
+        shutil.rmtree(self.partition_path(day_obs), ignore_errors=True)
+
+    def import_csvs(self, data_folder, file_pattern, day_obs_list, **kwargs):
+        """
+        Copy per-day_obs CSV files, such as the ``m1m3_ics_{day_obs}.csv``
+        files of the ICS evaluation, into the store.
+
+        Parameters
+        ----------
+        data_folder : str or Path
+            The directory of the CSV files.
+        file_pattern : str
+            The name of the CSV files, formatted with ``day_obs``.
+        day_obs_list : list of int
+            The day_obs to import. Missing files are skipped.
+        **kwargs
+            Passed to `pandas.read_csv`, e.g. ``index_col=0``.
+
+        Returns
+        -------
+        list of int
+            The day_obs imported.
+        """
+        imported = []
+        for day_obs in day_obs_list:
+            file_path = Path(data_folder) / file_pattern.format(day_obs=day_obs)
+            if not file_path.exists():
+                log.warning(f"File not found: {file_path}. Skipping.")
+                continue
+            df = pd.read_csv(file_path, **kwargs)
+            self.write(df, day_obs=day_obs)
+            imported.append(day_obs)
+        return imported
+
+    def _write_partition(self, day_obs, table):
+        write_atomic(
+            self.partition_path(day_obs) / self.file_name,
+            lambda path: pq.write_table(table, path),
+        )
+
+
+def _and(expression, other):
+    return other if expression is None else expression & other
+
+
+def _unify(schemas):
+    """
+    Combine schemas, with null columns taking the type of the others and
+    integers promoted to floats.
+    """
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as err:
+        raise ValueError(f"Incompatible column types: {err}") from err
+
+
+def _select(schema, table):
+    """
+    Return the fields of a schema for the columns of a table, in its order.
+    """
+    return pa.schema([schema.field(name) for name in table.column_names])
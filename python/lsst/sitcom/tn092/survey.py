@@ -0,0 +1,358 @@
+"""
+Sharded batch survey of the hardpoint measured forces during TMA events.
+
+The day_obs range is split into shards that can run on separate batch
+nodes, each writing the per-event table of its day_obs to a shared output
+directory, and a reduce step combines them into the final table and
+histogram. For example, with 16 batch jobs::
+
+    python -m lsst.sitcom.tn092.survey shard 20250601 20250930 ./survey \\
+        --block BLOCK-T227 --shard $SLURM_ARRAY_TASK_ID --n-shards 16
+    python -m lsst.sitcom.tn092.survey reduce 20250601 20250930 ./survey \\
+        --end-reason 0
+
+The same commands are installed as ``tn092-hp-survey``.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from lsst.summit.utils.efdUtils import makeEfdClient, offsetDayObs
+from lsst.summit.utils.tmaUtils import TMAEventMaker
+
+from lsst.sitcom.tn092 import plot, query
+from lsst.sitcom.tn092.cache import QueryCache
+from lsst.sitcom.tn092.executor import QueryExecutor
+from lsst.sitcom.tn092.store import SummaryStore
+from lsst.sitcom.tn092.utils import format_block_id, write_atomic
+
+
+__all__ = [
+    "day_obs_range",
+    "filter_events_by_block",
+    "main",
+    "reduce_survey",
+    "run_shard",
+    "shard_day_obs",
+]
+
+
+log = logging.getLogger(__name__)
+
+# Layout of the output directory.
+STORE_DIR = "hp_forces"
+SHARD_DIR = "shards"
+PLOT_DIR = "plots"
+
+
+def day_obs_range(day_obs_start, day_obs_end):
+    """
+    List the day_obs from ``day_obs_start`` to ``day_obs_end``, inclusive.
+    """
+    day_obs_list = []
+    day_obs = day_obs_start
+    while day_obs <= day_obs_end:
+        day_obs_list.append(day_obs)
+        day_obs = offsetDayObs(day_obs, 1)
+    return day_obs_list
+
+
+def shard_day_obs(day_obs_list, shard, n_shards):
+    """
+    Select the day_obs of one shard.
+
+    The day_obs are dealt to the shards in turn, so each shard gets a
+    similar mix of busy and quiet nights.
+
+    Parameters
+    ----------
+    day_obs_list : list of int
+        All the day_obs, sorted.
+    shard : int
+        The shard, from 0 to ``n_shards - 1``.
+    n_shards : int
+        The number of shards.
+
+    Returns
+    -------
+    list of int
+        The day_obs of the shard.
+    """
+    if not 0 <= shard < n_shards:
+        raise ValueError(f"shard must be between 0 and {n_shards - 1}, got {shard}.")
+    return list(day_obs_list[shard::n_shards])
+
+
+def filter_events_by_block(events, block_name):
+    """
+    Keep the TMA events that belong to a block.
+
+    Parameters
+    ----------
+    events : list of TMAEvent
+        The events.
+    block_name : str
+        The block name, e.g. "BLOCK-T227", matched against the block IDs
+        of the events as in `lsst.sitcom.tn092.utils.filter_by_block_id`.
+
+    Returns
+    -------
+    list of TMAEvent
+        The events of the block.
+    """
+    block_id = format_block_id(block_name)
+    return [
+        evt
+        for evt in events
+        if any(block_id in str(info.blockId) for info in evt.blockInfos or [])
+    ]
+
+
+def run_shard(
+    day_obs_start,
+    day_obs_end,
+    output_dir,
+    shard=0,
+    n_shards=1,
+    block_name=None,
+    efd_name=None,
+    batch_size=100,
+    max_concurrency=16,
+    cache_dir=None,
+    overwrite=False,
+):
+    """
+    Compute the hardpoint forces table of the day_obs of one shard.
+
+    The table of every day_obs is stored as its own partition of a
+    `SummaryStore` under ``{output_dir}/hp_forces``, so shards never write
+    the same file and day_obs already stored are skipped when a shard is
+    run again. The status of each day_obs is written to
+    ``{output_dir}/shards/shard-{shard}-of-{n_shards}.csv``.
+
+    Parameters
+    ----------
+    day_obs_start, day_obs_end : int
+        The day_obs range of the whole survey, inclusive.
+    output_dir : str or Path
+        The directory shared by the shards.
+    shard : int, optional
+        The shard to run, from 0 to ``n_shards - 1`` (default is 0).
+    n_shards : int, optional
+        The number of shards of the survey (default is 1).
+    block_name : str, optional
+        If given, only the events of this block, e.g. "BLOCK-T227", are
+        used (default is all the events).
+    efd_name : str, optional
+        The EFD to query (default is the one picked by
+        `lsst.summit.utils.efdUtils.makeEfdClient` for the current site).
+    batch_size : int, optional
+        Passed to `lsst.sitcom.tn092.query.hp_forces_and_azimuth_elevation`
+        (default is 100).
+    max_concurrency : int, optional
+        The maximum number of EFD queries in flight (default is 16).
+    cache_dir : str or Path, optional
+        If given, the directory of a `QueryCache` for the per-event
+        queries (default is None).
+    overwrite : bool, optional
+        If True, day_obs already stored are computed again (default is
+        False).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per day_obs of the shard with the number of events and of
+        rows stored, the status ("done", "skipped" or "failed") and the
+        error, if any.
+    """
+    output_dir = Path(output_dir)
+    store = SummaryStore(output_dir / STORE_DIR)
+    stored = set(store.day_obs_list)
+
+    client = makeEfdClient() if efd_name is None else makeEfdClient(efd_name)
+    event_maker = TMAEventMaker(client=client)
+    cache = None if cache_dir is None else QueryCache(cache_dir)
+
+    day_obs_list = shard_day_obs(
+        day_obs_range(day_obs_start, day_obs_end), shard, n_shards
+    )
+    rows = []
+
+    for day_obs in day_obs_list:
+        if day_obs in stored and not overwrite:
+            log.info(f"day_obs {day_obs} is already stored. Skipping.")
+            rows.append(_status(day_obs, "skipped"))
+            continue
+
+        try:
+            events = event_maker.getEvents(day_obs)
+            if block_name is not None:
+                events = filter_events_by_block(events, block_name)
+
+            executor = QueryExecutor(max_concurrency=max_concurrency)
+            df = query.hp_forces_and_azimuth_elevation(
+                client, events, batch_size=batch_size, executor=executor, cache=cache
+            )
+            if len(executor.failures) > 0:
+                raise RuntimeError(
+                    f"{len(executor.failures)} queries failed, "
+                    f"first: {executor.failures[0][1]!r}"
+                )
+
+            store.delete(day_obs)
+            if not df.empty:
+                store.write(df, day_obs=day_obs)
+        except Exception as err:
+            log.warning(f"Failed to process day_obs {day_obs}: {err!r}")
+            rows.append(_status(day_obs, "failed", error=repr(err)))
+            continue
+
+        log.info(f"day_obs {day_obs}: {len(events)} events, {df.index.size} rows.")
+        rows.append(_status(day_obs, "done", len(events), df.index.size))
+
+    status = pd.DataFrame(rows, columns=list(_status(0, "").keys()))
+    status_path = output_dir / SHARD_DIR / f"shard-{shard}-of-{n_shards}.csv"
+    write_atomic(status_path, lambda path: status.to_csv(path, index=False))
+
+    return status
+
+
+def reduce_survey(day_obs_start, day_obs_end, output_dir, end_reason=None):
+    """
+    Combine the results of the shards into the final table and histogram.
+
+    Parameters
+    ----------
+    day_obs_start, day_obs_end : int
+        The day_obs range of the survey, inclusive.
+    output_dir : str or Path
+        The directory shared by the shards.
+    end_reason : int or TMAState, optional
+        If given, highlight the events that ended for this reason in the
+        histogram.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The hardpoint forces table of the whole survey, also written to
+        ``{output_dir}/hp_forces_{day_obs_start}_{day_obs_end}.parquet``.
+        The histogram is saved under ``{output_dir}/plots``.
+    """
+    output_dir = Path(output_dir)
+    label = f"{day_obs_start}_{day_obs_end}"
+
+    store = SummaryStore(output_dir / STORE_DIR)
+
+    # Day_obs without events are only recorded in the status of the shards.
+    finished = set(store.day_obs_list)
+    for path in sorted((output_dir / SHARD_DIR).glob("shard-*.csv")):
+        status = pd.read_csv(path)
+        finished.update(status.loc[status["status"] != "failed", "day_obs"])
+
+    missing = [
+        day_obs
+        for day_obs in day_obs_range(day_obs_start, day_obs_end)
+        if day_obs not in finished
+    ]
+    if len(missing) > 0:
+        log.warning(
+            f"{len(missing)} day_obs were not processed or failed, "
+            f"e.g. {missing[:5]}. Run their shards again."
+        )
+
+    df = store.read(day_obs_start=day_obs_start, day_obs_end=day_obs_end)
+
+    table_path = output_dir / f"hp_forces_{label}.parquet"
+    write_atomic(table_path, lambda path: df.to_parquet(path, index=False))
+
+    if df.empty:
+        log.warning("No events found, the histogram is not made.")
+    else:
+        plot.histogram_hp_minmax_forces(
+            df,
+            label,
+            end_reason=end_reason,
+            output_dir=output_dir / PLOT_DIR,
+            show=False,
+        )
+
+    return df
+
+
+def main(argv=None):
+    """
+    Run a shard or the reduce step of a survey from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        epilog="Run '%(prog)s {shard,reduce} -h' for the options of each step.",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("day_obs_start", type=int)
+    common.add_argument("day_obs_end", type=int)
+    common.add_argument("output_dir", type=Path)
+    common.add_argument("--log-level", default="INFO")
+
+    steps = parser.add_subparsers(dest="step", required=True)
+    shard_parser = steps.add_parser(
+        "shard", parents=[common], help="Process the day_obs of a shard."
+    )
+    reduce_parser = steps.add_parser(
+        "reduce", parents=[common], help="Combine the shards."
+    )
+
+    shard_parser.add_argument("--shard", type=int, default=0)
+    shard_parser.add_argument("--n-shards", type=int, default=1)
+    shard_parser.add_argument("--block", default=None, help="e.g. BLOCK-T227")
+    shard_parser.add_argument("--efd-name", default=None)
+    shard_parser.add_argument("--batch-size", type=int, default=100)
+    shard_parser.add_argument("--max-concurrency", type=int, default=16)
+    shard_parser.add_argument("--cache-dir", type=Path, default=None)
+    shard_parser.add_argument("--overwrite", action="store_true")
+
+    reduce_parser.add_argument(
+        "--end-reason", type=int, default=None, help="The TMAState to highlight."
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+
+    if args.step == "shard":
+        status = run_shard(
+            args.day_obs_start,
+            args.day_obs_end,
+            args.output_dir,
+            shard=args.shard,
+            n_shards=args.n_shards,
+            block_name=args.block,
+            efd_name=args.efd_name,
+            batch_size=args.batch_size,
+            max_concurrency=args.max_concurrency,
+            cache_dir=args.cache_dir,
+            overwrite=args.overwrite,
+        )
+        print(status.to_string(index=False))
+        return 1 if (status["status"] == "failed").any() else 0
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    df = reduce_survey(
+        args.day_obs_start, args.day_obs_end, args.output_dir, end_reason=args.end_reason
+    )
+    print(f"{df.index.size} events from {args.day_obs_start} to {args.day_obs_end}.")
+    return 0
+
+
+def _status(day_obs, status, n_events=0, n_rows=0, error=None):
+    return dict(
+        day_obs=day_obs, status=status, n_events=n_events, n_rows=n_rows, error=error
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
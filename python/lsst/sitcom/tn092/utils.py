@@ -1,10 +1,16 @@
+import os
 import re
+import uuid
+from pathlib import Path
+
 from lsst.ts.xml.enums.Script import ScriptState
 
 
 __all__ = [
     "convert_script_state",
-    "filter_by_block_id"
+    "filter_by_block_id",
+    "format_block_id",
+    "write_atomic",
 ]
 
 
@@ -42,7 +48,55 @@ def filter_by_block_id(df, block_name):
         The filtered DataFrame.
     """
     assert "blockId" in df.columns, "The DataFrame must have a 'blockId' column."
-    block_number = int(re.search(r"\d+", block_name).group())
-    block_id = f"{block_number:03d}"
+    block_id = format_block_id(block_name)
     temp_df = df[df.blockId.str.contains(block_id)]
     return temp_df
+
+
+def format_block_id(block_name):
+    """
+    Format the number of a block the way it appears in the Script blockId.
+
+    Parameters
+    ----------
+    block_name : str
+        The block name, e.g. "BLOCK-T227".
+
+    Returns
+    -------
+    str
+        The zero-padded block number, e.g. "227".
+    """
+    block_number = int(re.search(r"\d+", block_name).group())
+    return f"{block_number:03d}"
+
+
+def write_atomic(file_path, write):
+    """
+    Write a file under a temporary name and rename it, so the file is
+    either complete or absent, even if the writer is interrupted.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        The file to write. Its directory is created if needed.
+    write : callable
+        Called with the temporary path to write the file to, e.g.
+        ``lambda path: df.to_csv(path, index=False)``.
+
+    Returns
+    -------
+    Path
+        The path of the file.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.parent / f".{file_path.name}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return file_path
@@ -0,0 +1,33 @@
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def synthetic_efd():
+    """A local EFD with 20 synthetic slews on a closed day_obs."""
+    from lsst.sitcom.tn092.local_efd import make_synthetic_efd
+
+    return make_synthetic_efd(20, start="2024-11-28T00:00:00")
+
+
+@pytest.fixture
+def record_requests():
+    """
+    Return a function that records the thread and event loop of every
+    request sent with a local EFD client.
+    """
+
+    def record(client):
+        query = client.influx_client.query
+        requests = []
+
+        async def recording(statement):
+            requests.append((threading.current_thread(), asyncio.get_running_loop()))
+            return await query(statement)
+
+        client.influx_client.query = recording
+        return requests
+
+    return record
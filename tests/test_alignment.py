@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.alignment import (  # noqa: E402
+    align_frame,
+    align_slews,
+    slew_envelope,
+)
+from lsst.sitcom.tn092.local_efd import LocalTMAEvent  # noqa: E402
+
+START = 1.7e9
+
+
+@pytest.fixture
+def slews():
+    """Slews at irregular offsets from the samples, and their durations."""
+    k = np.arange(8)
+    begins = START + 100 + 37.3 * k + 0.013 * k**2
+    ends = begins + 10 + 0.7 * k
+    return begins, ends
+
+
+@pytest.fixture
+def series():
+    """Two columns sampled at about 10 Hz with jitter."""
+    rng = np.random.default_rng(4)
+    times = START + np.cumsum(rng.uniform(0.08, 0.12, 5000))
+    values = np.column_stack([rng.normal(0, 1, times.size), np.sin(times / 7)])
+    return times, values
+
+
+def test_linear_signal(slews):
+    begins, ends = slews
+    times = START + np.arange(0, 500, 0.1)
+    # The interpolation of a linear signal is exact, so every slew is the
+    # same ramp shifted by its offset.
+    values = 3 * (times - START)
+
+    grid, aligned = align_slews(times, values, begins, ends, window=(0, 5))
+    np.testing.assert_allclose(grid, np.arange(251) / 50)
+    expected = 3 * (begins[:, None] + grid - START)
+    np.testing.assert_allclose(aligned, expected, atol=1e-5)
+
+    grid, aligned = align_slews(
+        times, values, begins, ends, window=(-2, 0), align="stop", rate=10
+    )
+    np.testing.assert_allclose(grid, np.linspace(-2, 0, 21))
+    expected = 3 * (ends[:, None] + grid - START)
+    np.testing.assert_allclose(aligned, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("align", ["start", "stop"])
+def test_matches_per_slew_interpolation(series, slews, align):
+    times, values = series
+    begins, ends = slews
+
+    grid, aligned = align_slews(
+        times, values, begins, ends, window=(-1.5, 3), align=align, rate=20
+    )
+
+    assert aligned.shape == (len(begins), grid.size, 2)
+    origins = begins if align == "start" else ends
+    for k, origin in enumerate(origins):
+        for column in range(2):
+            expected = np.interp(origin + grid, times, values[:, column])
+            np.testing.assert_allclose(aligned[k, :, column], expected, rtol=1e-12)
+
+
+def test_outside_series_and_masks(series, slews):
+    times, values = series
+    begins, ends = slews
+
+    # Grid points before the first sample are NaN.
+    grid, aligned = align_slews(
+        times, values[:, 0], [times[0] + 0.5, times[0] - 0.5], [times[0] + 2] * 2
+    )
+    assert aligned.shape == (2, 51)
+    assert np.all(np.isfinite(aligned[0]))
+    assert np.all(np.isnan(aligned[1, grid < 0.5 - 1e-6]))
+    assert np.all(np.isfinite(aligned[1, grid > 0.5 + 1e-6]))
+
+    # Grid points in a gap of the series are NaN with max_gap.
+    keep = (times < begins[0] + 1) | (times > begins[0] + 2)
+    _, aligned = align_slews(
+        times[keep], values[keep], begins, ends, window=(0, 3), max_gap=0.5
+    )
+    grid = np.arange(151) / 50
+    in_gap = (grid > 1 + 0.12) & (grid < 2 - 0.12)
+    assert np.all(np.isnan(aligned[0, in_gap]))
+    assert np.all(np.isfinite(aligned[1]))
+
+    # Grid points outside of their slew are NaN with within_slew.
+    grid, aligned = align_slews(
+        times, values, begins, ends, window=(-1, 20), within_slew=True
+    )
+    for k in range(len(begins)):
+        duration = ends[k] - begins[k]
+        # Unix timestamps only resolve ~0.2 us, so leave a margin at the
+        # edges of the slew.
+        inside = (grid > 1e-6) & (grid < duration - 1e-6)
+        assert np.all(np.isfinite(aligned[k, inside]))
+        outside = (grid < -1e-6) | (grid > duration + 1e-6)
+        assert np.all(np.isnan(aligned[k, outside]))
+
+
+def test_align_frame(series, slews):
+    times, values = series
+    begins, ends = slews
+    index = pd.to_datetime(times, unit="s", utc=True)
+    df = pd.DataFrame(
+        {"a": values[:, 0], "b": values[:, 1], "label": "x"}, index=index
+    ).iloc[::-1]
+    events = [
+        LocalTMAEvent(
+            20241127,
+            k,
+            Time(begin, format="unix", scale="utc"),
+            Time(end, format="unix", scale="utc"),
+        )
+        for k, (begin, end) in enumerate(zip(begins, ends))
+    ]
+
+    grid, aligned, columns = align_frame(df, events, window=(0, 2), rate=10)
+
+    assert columns == ["a", "b"]
+    frame_times = (index - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    expected_grid, expected = align_slews(
+        np.asarray(frame_times),
+        values,
+        Time([evt.begin for evt in events]).unix,
+        Time([evt.end for evt in events]).unix,
+        window=(0, 2),
+        rate=10,
+    )
+    np.testing.assert_array_equal(grid, expected_grid)
+    np.testing.assert_allclose(aligned, expected, rtol=1e-9)
+
+
+def test_slew_envelope(series, slews):
+    times, values = series
+    begins, ends = slews
+    grid, aligned = align_slews(
+        times, values, begins, ends, window=(-1, 12), within_slew=True, rate=10
+    )
+
+    envelope = slew_envelope(grid, aligned, columns=["a", "b"], percentiles=(5, 95))
+
+    assert list(envelope.index) == list(grid)
+    assert list(envelope["a"].columns) == [
+        "count",
+        "median",
+        "p5",
+        "p95",
+        "min",
+        "max",
+        "max_abs",
+    ]
+    for column, name in enumerate(["a", "b"]):
+        for i in range(grid.size):
+            samples = aligned[:, i, column]
+            samples = samples[np.isfinite(samples)]
+            row = envelope.loc[grid[i], name]
+            assert row["count"] == samples.size
+            if samples.size == 0:
+                assert row[["median", "min", "max"]].isna().all()
+                continue
+            assert row["median"] == np.median(samples)
+            assert row["p95"] == np.percentile(samples, 95)
+            assert row["min"] == samples.min()
+            assert row["max"] == samples.max()
+            assert row["max_abs"] == np.abs(samples).max()
+
+
+def test_slew_envelope_1d():
+    aligned = np.array([[1.0, -4.0], [3.0, np.nan]])
+
+    envelope = slew_envelope(np.array([0.0, 0.5]), aligned, percentiles=())
+
+    np.testing.assert_array_equal(envelope[(0, "count")], [2, 1])
+    np.testing.assert_array_equal(envelope[(0, "median")], [2, -4])
+    np.testing.assert_array_equal(envelope[(0, "max_abs")], [3, 4])
+
+
+def test_invalid_align():
+    with pytest.raises(ValueError):
+        align_slews([0.0, 1.0], [0.0, 1.0], [0.0], [1.0], align="middle")
@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+from astropy.time import Time
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.cache import QueryCache  # noqa: E402
+from lsst.sitcom.tn092.local_efd import make_synthetic_efd  # noqa: E402
+from lsst.sitcom.tn092.query import hp_forces_and_azimuth_elevation  # noqa: E402
+
+
+@pytest.mark.parametrize("batch_size", [None, 6])
+def test_repeat_run_served_from_cache(tmp_path, synthetic_efd, batch_size):
+    client, events = synthetic_efd
+    cache = QueryCache(tmp_path)
+
+    first = hp_forces_and_azimuth_elevation(
+        client, events, batch_size=batch_size, cache=cache
+    )
+    assert client.influx_client.n_requests > 0
+    assert cache.hits == 0
+
+    client.influx_client.reset_counters()
+    second = hp_forces_and_azimuth_elevation(
+        client, events, batch_size=batch_size, cache=cache
+    )
+
+    assert client.influx_client.n_requests == 0
+    assert cache.hits == 3 * len(events)
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_cache_shared_between_batched_and_unbatched(tmp_path, synthetic_efd):
+    client, events = synthetic_efd
+    cache = QueryCache(tmp_path)
+
+    first = hp_forces_and_azimuth_elevation(client, events, cache=cache)
+
+    client.influx_client.reset_counters()
+    second = hp_forces_and_azimuth_elevation(client, events, batch_size=6, cache=cache)
+
+    assert client.influx_client.n_requests == 0
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_only_missing_events_are_queried(tmp_path, synthetic_efd):
+    client, events = synthetic_efd
+    cache = QueryCache(tmp_path)
+
+    hp_forces_and_azimuth_elevation(client, events[:5], cache=cache)
+
+    client.influx_client.reset_counters()
+    hp_forces_and_azimuth_elevation(client, events, cache=cache)
+
+    assert client.influx_client.n_requests == 3 * (len(events) - 5)
+
+
+def test_open_day_obs_not_cached(tmp_path):
+    client, events = make_synthetic_efd(3, start=Time.now())
+    cache = QueryCache(tmp_path)
+
+    assert not cache.is_cacheable(events[0])
+
+    hp_forces_and_azimuth_elevation(client, events, cache=cache)
+    client.influx_client.reset_counters()
+    hp_forces_and_azimuth_elevation(client, events, cache=cache)
+
+    assert client.influx_client.n_requests == 3 * len(events)
+    assert cache.size == 0
+
+
+@pytest.mark.parametrize("truncate", [False, True])
+def test_corrupt_file_is_a_miss(tmp_path, synthetic_efd, truncate):
+    client, events = synthetic_efd
+    cache = QueryCache(tmp_path)
+    first = hp_forces_and_azimuth_elevation(client, events, cache=cache)
+
+    # Truncate one cached result, or overwrite it with garbage.
+    file_path = sorted(cache.path.rglob(f"*{cache.suffix}"))[0]
+    data = file_path.read_bytes()
+    file_path.write_bytes(data[: len(data) // 2] if truncate else b"garbage")
+    cache = QueryCache(tmp_path)
+
+    client.influx_client.reset_counters()
+    second = hp_forces_and_azimuth_elevation(client, events, cache=cache)
+
+    assert cache.misses == 1
+    assert cache.hits == 3 * len(events) - 1
+    assert client.influx_client.n_requests == 1
+    pd.testing.assert_frame_equal(second, first)
+    # The bad file was replaced by the new result.
+    assert file_path.stat().st_size == len(data)
+    assert cache.size == sum(f.stat().st_size for f in cache.path.rglob("*.parquet"))
+
+
+def test_corrupt_file_removed(tmp_path, synthetic_efd):
+    _, events = synthetic_efd
+    cache = QueryCache(tmp_path)
+    cache.put("topic", events[0], "SELECT 1", pd.DataFrame({"a": [1.0]}))
+    file_path = cache.file_path("topic", events[0], "SELECT 1")
+    file_path.write_bytes(b"PAR1 not really PAR1")
+    cache = QueryCache(tmp_path)
+
+    assert cache.get("topic", events[0], "SELECT 1") is None
+
+    assert not file_path.exists()
+    assert cache.size == 0
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.get("topic", events[0], "SELECT 1") is None
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.local_efd import get_efd_data  # noqa: E402
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    HP_FORCE_COLUMNS,
+    HP_TOPIC,
+    iter_time_chunks,
+    iter_time_chunks_async,
+    m1m3_hp_measured_forces_chunks,
+)
+
+
+@pytest.fixture
+def time_range(synthetic_efd):
+    _, events = synthetic_efd
+    return events[0].begin, events[-1].end
+
+
+def _expected(client, begin, end):
+    df = get_efd_data(client, HP_TOPIC, columns=HP_FORCE_COLUMNS, begin=begin, end=end)
+    times = (df.index - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    return np.asarray(times), df[HP_FORCE_COLUMNS].to_numpy()
+
+
+@pytest.mark.parametrize("chunk_duration", [7, 60, 3600])
+def test_chunks_match_whole_range(synthetic_efd, time_range, chunk_duration):
+    client, _ = synthetic_efd
+    times, values = _expected(client, *time_range)
+
+    chunks = list(
+        m1m3_hp_measured_forces_chunks(
+            client, *time_range, chunk_duration=chunk_duration
+        )
+    )
+
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in chunks]), times)
+    np.testing.assert_array_equal(np.concatenate([v for _, v in chunks]), values)
+
+
+def test_chunks_use_the_calling_loop(synthetic_efd, time_range, record_requests):
+    client, _ = synthetic_efd
+    loops = record_requests(client)
+
+    chunks = list(
+        iter_time_chunks(
+            client, HP_TOPIC, HP_FORCE_COLUMNS, *time_range, chunk_duration=30
+        )
+    )
+
+    assert len(loops) == len(chunks) == 10
+    assert len(set(loops)) == 1
+    assert loops[0][0] is threading.current_thread()
+
+
+def test_chunks_float32(synthetic_efd, time_range):
+    client, _ = synthetic_efd
+
+    for _, values in iter_time_chunks(
+        client, HP_TOPIC, HP_FORCE_COLUMNS, *time_range, dtype=np.float32
+    ):
+        assert values.dtype == np.float32
+
+
+def test_chunks_stopped_early(synthetic_efd, time_range):
+    client, _ = synthetic_efd
+
+    chunks = iter_time_chunks(
+        client, HP_TOPIC, HP_FORCE_COLUMNS, *time_range, chunk_duration=30
+    )
+    next(chunks)
+    chunks.close()
+
+    # Only the first chunk and the one fetched ahead were requested.
+    assert client.influx_client.n_requests == 2
+
+
+def test_chunks_async(synthetic_efd, time_range):
+    client, _ = synthetic_efd
+    times, values = _expected(client, *time_range)
+
+    async def read():
+        return [
+            chunk
+            async for chunk in iter_time_chunks_async(
+                client, HP_TOPIC, HP_FORCE_COLUMNS, *time_range, chunk_duration=60
+            )
+        ]
+
+    chunks = asyncio.run(read())
+
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in chunks]), times)
+    np.testing.assert_array_equal(np.concatenate([v for _, v in chunks]), values)
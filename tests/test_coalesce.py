@@ -0,0 +1,226 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from astropy.time import TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.coalesce import (  # noqa: E402
+    QueryCoalescer,
+    coalescing,
+    current_coalescer,
+    uncoalesced,
+)
+from lsst.sitcom.tn092.executor import QueryExecutor, run_sync  # noqa: E402
+from lsst.sitcom.tn092.local_efd import LocalTMAEvent  # noqa: E402
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    hp_force_exceedances,
+    hp_forces_and_azimuth_elevation,
+    hp_forces_and_azimuth_elevation_async,
+    m1m3_hp_measured_forces_async,
+)
+
+
+def _window(evt, begin, end):
+    """An event over ``[evt.begin + begin, evt.begin + end]``, in seconds."""
+    return LocalTMAEvent(
+        evt.dayObs,
+        evt.seqNum,
+        evt.begin + TimeDelta(begin, format="sec"),
+        evt.begin + TimeDelta(end, format="sec"),
+    )
+
+
+async def _gather(func, efd_client, events):
+    return await asyncio.gather(*[func(efd_client, evt) for evt in events])
+
+
+def _hang_first_request(influx_client):
+    """Make the first request never return, as a stuck EFD connection."""
+    query = influx_client.query
+    calls = []
+
+    async def hanging(statement):
+        calls.append(statement)
+        if len(calls) == 1:
+            await asyncio.sleep(3600)
+        return await query(statement)
+
+    influx_client.query = hanging
+    return calls
+
+
+def test_off_by_default():
+    assert current_coalescer() is None
+
+    coalescer = QueryCoalescer()
+    with coalescing(coalescer):
+        assert current_coalescer() is coalescer
+        with uncoalesced():
+            assert current_coalescer() is None
+
+    assert current_coalescer() is None
+
+
+def test_identical_queries_shared(synthetic_efd):
+    client, events = synthetic_efd
+    expected = hp_forces_and_azimuth_elevation(client, events)
+
+    client.influx_client.reset_counters()
+    with coalescing(QueryCoalescer()) as coalescer:
+        first, second = run_sync(
+            asyncio.gather(
+                hp_forces_and_azimuth_elevation_async(client, events),
+                hp_forces_and_azimuth_elevation_async(client, events),
+            )
+        )
+
+    assert client.influx_client.n_requests == 3 * len(events)
+    assert coalescer.requests == 2 * coalescer.fetches
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_overlapping_windows_merged(synthetic_efd):
+    client, events = synthetic_efd
+    windows = [_window(events[0], 3 * i, 3 * i + 10) for i in range(30)]
+    expected = run_sync(_gather(m1m3_hp_measured_forces_async, client, windows))
+
+    client.influx_client.reset_counters()
+    with coalescing(QueryCoalescer()) as coalescer:
+        results = run_sync(_gather(m1m3_hp_measured_forces_async, client, windows))
+
+    assert client.influx_client.n_requests == 1
+    assert coalescer.requests - coalescer.fetches == len(windows) - 1
+    for df, df_expected in zip(results, expected):
+        assert len(df) > 0
+        pd.testing.assert_frame_equal(df, df_expected)
+
+
+@pytest.mark.parametrize(
+    "step, max_span, n_requests",
+    [
+        # Windows that only touch are not merged.
+        (10, 3600, 30),
+        # The union of the overlapping windows is limited to 30 s, which
+        # holds 7 of them.
+        (3, 30, 5),
+    ],
+)
+def test_merge_limits(synthetic_efd, step, max_span, n_requests):
+    client, events = synthetic_efd
+    windows = [_window(events[0], step * i, step * i + 10) for i in range(30)]
+    expected = run_sync(_gather(m1m3_hp_measured_forces_async, client, windows))
+
+    client.influx_client.reset_counters()
+    with coalescing(QueryCoalescer(max_span=max_span)):
+        results = run_sync(_gather(m1m3_hp_measured_forces_async, client, windows))
+
+    assert client.influx_client.n_requests == n_requests
+    for df, df_expected in zip(results, expected):
+        pd.testing.assert_frame_equal(df, df_expected)
+
+
+def test_chunked_scan_not_merged(synthetic_efd):
+    client, events = synthetic_efd
+    begin, end = events[0].begin, events[0].begin + TimeDelta(600, format="sec")
+    kwargs = dict(limits=(300,), chunk_duration=60)
+    expected = hp_force_exceedances(client, begin, end, **kwargs)
+
+    client.influx_client.reset_counters()
+    with coalescing(QueryCoalescer()):
+        df = hp_force_exceedances(client, begin, end, **kwargs)
+
+    assert client.influx_client.n_requests == 10
+    assert len(df) > 0
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_timeout_retried_query(synthetic_efd, coalesce):
+    client, events = synthetic_efd
+    expected = hp_forces_and_azimuth_elevation(client, events[:1])
+
+    calls = _hang_first_request(client.influx_client)
+    executor = QueryExecutor(timeout=0.5, backoff=0.01)
+    coalescer = QueryCoalescer() if coalesce else None
+
+    with coalescing(coalescer):
+        df = hp_forces_and_azimuth_elevation(client, events[:1], executor=executor)
+
+    assert executor.failures == []
+    assert len(calls) == 4
+    pd.testing.assert_frame_equal(df, expected)
+    if coalesce:
+        assert coalescer._in_flight == {}
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_timeout_retried_selection(synthetic_efd, coalesce):
+    client, events = synthetic_efd
+    expected = run_sync(m1m3_hp_measured_forces_async(client, events[0]))
+
+    calls = _hang_first_request(client.influx_client)
+    executor = QueryExecutor(timeout=0.5, backoff=0.01)
+    coalescer = QueryCoalescer() if coalesce else None
+
+    with coalescing(coalescer):
+        df = run_sync(
+            executor.submit(m1m3_hp_measured_forces_async, client, events[0])
+        )
+
+    assert len(calls) == 2
+    pd.testing.assert_frame_equal(df, expected)
+    if coalesce:
+        assert coalescer._windows == {}
+
+
+def test_cancelled_caller_leaves_shared_request(synthetic_efd):
+    client, _ = synthetic_efd
+    coalescer = QueryCoalescer()
+    started, release = [], asyncio.Event()
+
+    async def fetch():
+        started.append(True)
+        await release.wait()
+        return pd.DataFrame({"value": [1.0]})
+
+    async def scenario():
+        waiting = asyncio.ensure_future(coalescer.query(client, "q", fetch))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(coalescer.query(client, "q", fetch), 0.05)
+
+        # The request is no longer shared, but still sent for the caller
+        # that waits for it.
+        assert coalescer._in_flight == {}
+        release.set()
+        return await waiting
+
+    df = run_sync(scenario())
+
+    assert len(started) == 1
+    assert df["value"].tolist() == [1.0]
+
+
+def test_abandoned_request_cancelled(synthetic_efd):
+    client, _ = synthetic_efd
+    coalescer = QueryCoalescer()
+    cancelled = []
+
+    async def fetch():
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(coalescer.query(client, "q", fetch), 0.05)
+        await asyncio.sleep(0)
+
+    run_sync(scenario())
+
+    assert cancelled == [True]
+    assert coalescer._in_flight == {}
@@ -0,0 +1,159 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from lsst.sitcom.tn092.local_efd import get_efd_data, make_synthetic_efd  # noqa: E402
+from lsst.sitcom.tn092.plot import DownsampledTimeSeriesPlot  # noqa: E402
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    HP_TOPIC,
+    downsample_interval,
+    downsampled_time_series,
+)
+
+START = Time("2024-11-28T00:00:00", scale="utc")
+COLUMNS = ["measuredForce0", "measuredForce3"]
+
+
+def _after(seconds):
+    return START + TimeDelta(seconds, format="sec")
+
+
+@pytest.fixture
+def efd():
+    """Five minutes of hardpoint forces at 50 Hz."""
+    client, _ = make_synthetic_efd(20, start=START, rate=50)
+    return client
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots(figsize=(8, 3))
+    yield ax
+    plt.close(fig)
+
+
+@pytest.mark.parametrize(
+    "duration, width, sample_rate, expected",
+    [
+        (10, 1000, 50, 0),
+        # Two samples per bucket is still read raw, one more is not.
+        (40, 1000, 50, 0),
+        (41, 1000, 50, 0.05),
+        (3600, 1000, 50, 5),
+        (3600, 100, 50, 60),
+        (3600, 1000, 1, 5),
+        (3600, 2000, 1, 0),
+        (86400, 1000, 50, 120),
+        (86400, 1, 50, 86400),
+        # Beyond a day, buckets are whole days.
+        (30 * 86400, 10, 50, 3 * 86400),
+        (30 * 86400, 7, 50, 5 * 86400),
+    ],
+)
+def test_downsample_interval(duration, width, sample_rate, expected):
+    interval = downsample_interval(START, _after(duration), width, sample_rate)
+
+    assert interval == pytest.approx(expected)
+    assert isinstance(interval, float)
+
+
+def test_downsample_interval_day_obs():
+    # A day_obs spans 24 h, from 12:00 UTC to 12:00 UTC of the next day.
+    assert downsample_interval(20241127, 20241127) == 120
+    assert downsample_interval(20241127, 20241127, width=100) == 900
+    assert downsample_interval(20241127, 20241203, width=100) == 7200
+
+
+def test_downsampled_time_series(efd):
+    begin, end = _after(10), _after(250)
+
+    df = downsampled_time_series(efd, HP_TOPIC, COLUMNS, begin, end, width=25)
+
+    assert list(df.columns) == [
+        (column, stat) for column in COLUMNS for stat in ("min", "max", "mean")
+    ]
+    assert df.columns.nlevels == 2
+    assert df.index.tz is not None
+    assert (df.dtypes == float).all()
+
+    # Buckets of 10 s aligned to the epoch, the last one with the sample at
+    # the end of the range, computed from the raw samples.
+    raw = get_efd_data(efd, HP_TOPIC, columns=COLUMNS, begin=begin, end=end)
+    expected = raw.resample("10s").agg(["min", "max", "mean"])
+    assert len(df) == 25
+    np.testing.assert_array_equal(df.index, expected.index)
+    np.testing.assert_allclose(df.to_numpy(), expected[df.columns].to_numpy())
+
+
+def test_downsampled_time_series_raw(efd):
+    begin, end = _after(10), _after(20)
+
+    df = downsampled_time_series(efd, HP_TOPIC, COLUMNS, begin, end, width=1000)
+
+    raw = get_efd_data(efd, HP_TOPIC, columns=COLUMNS, begin=begin, end=end)
+    assert len(df) == len(raw)
+    for column in COLUMNS:
+        for stat in ("min", "max", "mean"):
+            np.testing.assert_array_equal(df[(column, stat)], raw[column])
+
+
+def test_downsampled_time_series_empty(efd):
+    begin = Time("2024-12-05T00:00:00", scale="utc")
+
+    for width in (10, 1000):
+        df = downsampled_time_series(
+            efd, HP_TOPIC, COLUMNS, begin, begin + TimeDelta(60, format="sec"), width
+        )
+        # Empty buckets are NaN, so lines break at gaps.
+        assert df.isna().all().all()
+        assert df.columns.nlevels == 2
+        assert len(df.columns) == 3 * len(COLUMNS)
+
+
+def test_plot_downsampled(efd, ax):
+    view = DownsampledTimeSeriesPlot(
+        ax, efd, HP_TOPIC, COLUMNS, _after(0), _after(300), width=300
+    )
+
+    assert view.interval == 1
+    assert set(view.lines) == set(view.bands) == set(COLUMNS)
+    assert len(view.lines[COLUMNS[0]].get_xdata()) == 300
+    assert ax.get_title() == "Min, mean and max per 1 s"
+    assert view.limits == (START.datetime64, _after(300).datetime64)
+
+    # Zoomed in far enough, the raw samples are drawn without bands.
+    view.update(_after(100), _after(110))
+
+    assert view.interval == 0
+    assert view.bands == {}
+    assert len(view.lines[COLUMNS[1]].get_xdata()) == 501
+    assert ax.get_title() == "Raw samples"
+    view.disconnect()
+
+
+def test_plot_queries_on_zoom(efd, ax):
+    view = DownsampledTimeSeriesPlot(
+        ax, efd, HP_TOPIC, COLUMNS, _after(0), _after(300), width=300, delay=0
+    )
+    efd.influx_client.reset_counters()
+
+    # Panning within the data drawn, at the same level of detail, does not
+    # query again.
+    ax.set_xlim(_after(0).datetime64, _after(299).datetime64)
+    assert efd.influx_client.n_requests == 0
+
+    ax.set_xlim(_after(100).datetime64, _after(110).datetime64)
+    assert efd.influx_client.n_requests == 1
+    assert view.interval == 0
+
+    view.disconnect()
+    ax.set_xlim(_after(0).datetime64, _after(300).datetime64)
+    assert efd.influx_client.n_requests == 1
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.events import EventIndex  # noqa: E402
+from lsst.sitcom.tn092.local_efd import LocalTMAEvent  # noqa: E402
+
+START = Time("2024-11-28T00:00:00", scale="utc")
+
+
+def _events(begins, durations):
+    return [
+        LocalTMAEvent(
+            20241127,
+            i,
+            START + TimeDelta(begin, format="sec"),
+            START + TimeDelta(begin + duration, format="sec"),
+        )
+        for i, (begin, duration) in enumerate(zip(begins, durations))
+    ]
+
+
+@pytest.fixture(params=["slews", "overlapping"])
+def events(request):
+    """Shuffled events, either back to back like slews or overlapping."""
+    rng = np.random.default_rng(7)
+    if request.param == "slews":
+        durations = rng.integers(1, 60, 200)
+        begins = np.cumsum(durations + rng.integers(0, 30, 200)) - durations
+    else:
+        begins = rng.integers(0, 5000, 200)
+        durations = rng.integers(1, 300, 200)
+        durations[::17] = 2000
+
+    events = _events(begins.astype(float), durations.astype(float))
+    return [events[i] for i in rng.permutation(len(events))]
+
+
+@pytest.fixture
+def index(events):
+    return EventIndex(events)
+
+
+def _bounds(events):
+    return (
+        np.array([evt.begin.unix for evt in events]),
+        np.array([evt.end.unix for evt in events]),
+    )
+
+
+def _times(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # Include exact integer seconds, which land on the event bounds.
+    times = np.concatenate([rng.uniform(-100, 9000, n), np.arange(-10, 9000, 13.0)])
+    return START.unix + times
+
+
+def _seq_nums(events):
+    return sorted(evt.seqNum for evt in events)
+
+
+def test_sorted(index, events):
+    assert len(index) == len(events)
+    assert np.all(np.diff(index.begin) >= 0)
+    assert _seq_nums(index) == _seq_nums(events)
+
+
+def test_containing(index, events):
+    begin, end = _bounds(index.events)
+    times = _times(2000)
+
+    result = index.containing(times)
+
+    for time, position in zip(times, result):
+        inside = np.flatnonzero((begin <= time) & (time < end))
+        if inside.size == 0:
+            assert position == -1
+        else:
+            assert position == inside[-1]
+
+
+def test_containing_time_objects(index):
+    times = _times(50)
+    np.testing.assert_array_equal(
+        index.containing(Time(times, format="unix")), index.containing(times)
+    )
+
+
+def test_overlapping(index, events):
+    begin, end = _bounds(index.events)
+    rng = np.random.default_rng(1)
+    starts = START.unix + rng.uniform(-100, 9000, 300)
+    ends = starts + rng.exponential(100, 300)
+    ends[:10] = starts[:10]
+
+    interval_index, event_index = index.overlapping(starts, ends)
+
+    found = set(zip(interval_index.tolist(), event_index.tolist()))
+    expected = {
+        (i, j)
+        for i in range(starts.size)
+        for j in np.flatnonzero((begin < ends[i]) & (end > starts[i])).tolist()
+    }
+    assert found == expected
+    assert len(found) == interval_index.size
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_windows(index, events, seed):
+    begin, end = _bounds(events)
+    rng = np.random.default_rng(seed)
+    start = START.unix + rng.uniform(-100, 9000)
+    stop = start + rng.exponential(500)
+    t_start = Time(start, format="unix")
+    t_stop = Time(stop, format="unix")
+
+    def expected(mask):
+        return sorted(events[i].seqNum for i in np.flatnonzero(mask))
+
+    assert _seq_nums(index.starting_between(t_start, t_stop)) == expected(
+        (start <= begin) & (begin < stop)
+    )
+    assert _seq_nums(index.within(t_start, t_stop)) == expected(
+        (begin >= start) & (end <= stop)
+    )
+    assert _seq_nums(index.overlapping_events(t_start, t_stop)) == expected(
+        (begin < stop) & (end > start)
+    )
+
+
+def test_empty():
+    index = EventIndex([])
+
+    assert len(index) == 0
+    np.testing.assert_array_equal(index.containing([1.0, 2.0]), [-1, -1])
+    assert index.within(0.0, 1e10) == []
+    assert index.overlapping_events(0.0, 1e10) == []
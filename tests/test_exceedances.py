@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.local_efd import LocalEfdClient, LocalTMAEvent  # noqa: E402
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    HP_FORCE_COLUMNS,
+    HP_FORCE_LIMITS,
+    HP_TOPIC,
+    hp_force_exceedances,
+)
+
+BEGIN = Time("2024-11-28T00:00:00", scale="utc")
+END = BEGIN + TimeDelta(600, format="sec")
+
+
+@pytest.fixture
+def hp_frame():
+    """
+    Hardpoint forces at 50 Hz around the scan range, with spikes, runs that
+    flip sign, a dropout inside a run and runs across the edges of the range.
+    """
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2024-11-27T23:59:00", "2024-11-28T00:11:00", freq="20ms")
+    index = index.tz_localize("UTC")
+    values = rng.normal(0, 150, (index.size, 6))
+
+    # Random spikes, most of them a few samples long.
+    for _ in range(300):
+        i, hp = rng.integers(index.size), rng.integers(6)
+        sign = rng.choice([-1, 1])
+        values[i : i + rng.integers(1, 8), hp] = sign * rng.uniform(460, 1200)
+
+    first = index.searchsorted(pd.Timestamp(BEGIN.isot, tz="UTC"))
+    last = index.searchsorted(pd.Timestamp(END.isot, tz="UTC"))
+
+    # Runs across the begin and the end of the range, and one that only
+    # touches the end.
+    values[first - 10 : first + 5, 0] = 700.0
+    values[last - 3 : last + 10, 1] = -950.0
+    values[last - 20 : last + 1, 2] = 500.0
+    values[last + 1 :, 2] = 0.0
+    # A run that flips sign without going back under the limit.
+    values[first + 1000 : first + 1010, 3] = 600.0
+    values[first + 1010 : first + 1020, 3] = -600.0
+    # A run with a 0.3 s dropout of the telemetry in the middle.
+    values[first + 2000 : first + 2050, 4] = 800.0
+    keep = np.ones(index.size, dtype=bool)
+    keep[first + 2020 : first + 2035] = False
+
+    return pd.DataFrame(values, index=index, columns=HP_FORCE_COLUMNS)[keep]
+
+
+def _brute_force(df, limits, max_gap, events=()):
+    """
+    The exceedance intervals found by scanning the samples one at a time.
+    """
+    df = df[
+        (df.index >= pd.Timestamp(BEGIN.isot, tz="UTC"))
+        & (df.index <= pd.Timestamp(END.isot, tz="UTC"))
+    ]
+    limits = sorted(limits)
+    rows = []
+
+    for hp, column in enumerate(HP_FORCE_COLUMNS):
+        run = None
+        for time, value in df[column].items():
+            if abs(value) <= limits[0]:
+                continue
+            if (
+                run is None
+                or (time - run["end"]).total_seconds() > max_gap
+                or np.sign(value) != np.sign(run["peak"])
+            ):
+                if run is not None:
+                    rows.append(run)
+                run = dict(
+                    hardpoint=hp,
+                    begin=time,
+                    end=time,
+                    n_samples=0,
+                    peak=value,
+                    peak_time=time,
+                )
+            run["end"] = time
+            run["n_samples"] += 1
+            if abs(value) > abs(run["peak"]):
+                run["peak"], run["peak_time"] = value, time
+        if run is not None:
+            rows.append(run)
+
+    for row in rows:
+        row["duration"] = (row["end"] - row["begin"]).total_seconds()
+        row["limit"] = max(limit for limit in limits if abs(row["peak"]) > limit)
+        row["day_obs"], row["seq_num"] = pd.NA, pd.NA
+        for evt in events:
+            evt_begin = pd.Timestamp(evt.begin.isot, tz="UTC")
+            evt_end = pd.Timestamp(evt.end.isot, tz="UTC")
+            if evt_begin <= row["end"] and evt_end > row["begin"]:
+                row["day_obs"], row["seq_num"] = evt.dayObs, evt.seqNum
+                break
+
+    expected = pd.DataFrame(rows)
+    return expected.sort_values(["begin", "hardpoint"], ignore_index=True)
+
+
+@pytest.mark.parametrize("chunk_duration", [45, 600])
+def test_matches_brute_force(hp_frame, chunk_duration):
+    client = LocalEfdClient({HP_TOPIC: hp_frame})
+    events = [
+        LocalTMAEvent(
+            20241127,
+            k,
+            BEGIN + TimeDelta(60 * k - 30, format="sec"),
+            BEGIN + TimeDelta(60 * k, format="sec"),
+        )
+        for k in range(12)
+    ]
+
+    df = hp_force_exceedances(
+        client, BEGIN, END, tma_events=events, chunk_duration=chunk_duration
+    )
+
+    expected = _brute_force(hp_frame, HP_FORCE_LIMITS, 0.1, events)
+    assert len(df) > 100
+    pd.testing.assert_frame_equal(
+        df[expected.columns].astype({"day_obs": object, "seq_num": object}),
+        expected.astype({"day_obs": object, "seq_num": object}),
+        check_dtype=False,
+    )
+
+
+def test_window_edges(hp_frame):
+    client = LocalEfdClient({HP_TOPIC: hp_frame})
+
+    df = hp_force_exceedances(client, BEGIN, END, chunk_duration=60)
+
+    begin = pd.Timestamp(BEGIN.isot, tz="UTC")
+    end = pd.Timestamp(END.isot, tz="UTC")
+    # Runs across the edges are cut to the samples in the range, which is
+    # inclusive at both ends.
+    edge = df[(df["hardpoint"] == 0) & (df["begin"] == begin)]
+    assert edge["n_samples"].tolist() == [5]
+    edge = df[(df["hardpoint"] == 1) & (df["end"] == end)]
+    assert edge["n_samples"].tolist() == [4]
+    assert edge["limit"].tolist() == [900.0]
+    edge = df[(df["hardpoint"] == 2) & (df["end"] == end)]
+    assert edge["n_samples"].tolist() == [21]
+
+    # The sign flip and the dropout split their runs.
+    flip = df[(df["hardpoint"] == 3) & (df["begin"] >= begin + pd.Timedelta(20, "s"))]
+    assert flip["n_samples"].tolist()[:2] == [10, 10]
+    assert flip["peak"].tolist()[:2] == [600.0, -600.0]
+    dropout = df[
+        (df["hardpoint"] == 4) & (df["begin"] >= begin + pd.Timedelta(40, "s"))
+    ]
+    assert dropout["n_samples"].tolist()[:2] == [20, 15]
+
+
+def test_max_gap_and_limits(hp_frame):
+    client = LocalEfdClient({HP_TOPIC: hp_frame})
+
+    df = hp_force_exceedances(client, BEGIN, END, limits=(-1000, 600), max_gap=0.5)
+
+    expected = _brute_force(hp_frame, (600, 1000), 0.5)
+    pd.testing.assert_frame_equal(
+        df[expected.columns.drop(["day_obs", "seq_num"])],
+        expected.drop(columns=["day_obs", "seq_num"]),
+        check_dtype=False,
+    )
+    assert df["day_obs"].isna().all()
+
+
+def test_no_exceedances(hp_frame):
+    client = LocalEfdClient({HP_TOPIC: hp_frame.clip(-100, 100)})
+
+    df = hp_force_exceedances(client, BEGIN, END)
+
+    assert df.empty
+    assert "peak" in df.columns
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092 import query  # noqa: E402
+from lsst.sitcom.tn092.executor import QueryExecutor, run_sync  # noqa: E402
+
+
+def _failing(errors):
+    """A query that raises the given errors, then returns the attempt count."""
+    calls = []
+
+    async def func():
+        calls.append(True)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return len(calls)
+
+    return func, calls
+
+
+def test_run_sync_uses_the_thread_loop(synthetic_efd, record_requests):
+    client, events = synthetic_efd
+    requests = record_requests(client)
+
+    query.hp_forces_and_azimuth_elevation(client, events[:2])
+    query.script_states(client, events[0].dayObs, events[0].dayObs)
+
+    assert len(set(requests)) == 1
+    assert requests[0][0] is threading.current_thread()
+
+
+def test_run_sync_in_a_running_loop(synthetic_efd):
+    client, events = synthetic_efd
+
+    async def notebook():
+        with pytest.raises(RuntimeError, match="_async"):
+            query.hp_forces_and_azimuth_elevation(client, events)
+
+    asyncio.run(notebook())
+
+
+def test_async_functions_in_a_running_loop(synthetic_efd, record_requests):
+    client, events = synthetic_efd
+    day_obs = events[0].dayObs
+    expected = query.hp_forces_and_azimuth_elevation(client, events)
+    expected_states = query.script_states(client, day_obs, day_obs)
+    requests = record_requests(client)
+
+    async def notebook():
+        results = await asyncio.gather(
+            query.hp_forces_and_azimuth_elevation_async(client, events),
+            query.script_states_async(client, day_obs, day_obs),
+            query.block_status_async(client, day_obs, day_obs),
+            query.script_description_async(client, day_obs, day_obs),
+        )
+        return asyncio.get_running_loop(), results
+
+    loop, (df, states, blocks, descriptions) = asyncio.run(notebook())
+
+    pd.testing.assert_frame_equal(df, expected)
+    pd.testing.assert_frame_equal(states, expected_states)
+    assert len(blocks) == len(descriptions) == len(events)
+    assert {request_loop for _, request_loop in requests} == {loop}
+
+
+def test_transient_errors_retried():
+    executor = QueryExecutor(backoff=0.001)
+    func, calls = _failing([ConnectionError(), asyncio.TimeoutError()])
+
+    assert run_sync(executor.submit(func)) == 3
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("error", [FileNotFoundError, PermissionError, ValueError])
+def test_other_errors_not_retried(error):
+    executor = QueryExecutor(backoff=0.001)
+    func, calls = _failing([error()])
+
+    with pytest.raises(error):
+        run_sync(executor.submit(func))
+    assert len(calls) == 1
+
+
+def test_retries_exhausted():
+    executor = QueryExecutor(max_retries=2, backoff=0.001)
+    func, calls = _failing([ConnectionError()] * 5)
+
+    with pytest.raises(ConnectionError):
+        run_sync(executor.submit(func))
+    assert len(calls) == 3
+
+
+def test_map_records_failures():
+    executor = QueryExecutor(max_retries=0)
+
+    async def func(item):
+        if item % 2:
+            raise ConnectionError(item)
+        return item
+
+    assert run_sync(executor.map(func, range(5))) == [0, None, 2, None, 4]
+    assert [item for item, _ in executor.failures] == [1, 3]
+
+
+def test_concurrency_bounded():
+    executor = QueryExecutor(max_concurrency=3)
+    running, peak = [0], [0]
+
+    async def func(item):
+        async def send():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+        return await executor.submit(send)
+
+    run_sync(executor.map(func, range(20)))
+
+    assert peak[0] == 3
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+pytest.importorskip("lsst.ts.xml")
+
+from lsst.ts.xml.tables.m1m3 import FATable  # noqa: E402
+
+from lsst.sitcom.tn092.executor import QueryExecutor  # noqa: E402
+from lsst.sitcom.tn092.local_efd import (  # noqa: E402
+    LocalEfdClient,
+    LocalTMAEvent,
+)
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    FA_TOPIC,
+    fa_force_columns,
+    fa_force_snapshots,
+)
+
+START = Time("2024-11-28T00:00:00", scale="utc")
+
+
+@pytest.fixture
+def efd_events():
+    """
+    A minute of force actuator forces at 10 Hz, four slews in it and one
+    slew without data.
+    """
+    rng = np.random.default_rng(11)
+    columns = fa_force_columns()
+    index = pd.date_range("2024-11-28T00:00:00", periods=600, freq="100ms", tz="UTC")
+    df = pd.DataFrame(
+        rng.normal(0, 500, (index.size, len(columns))), index=index, columns=columns
+    )
+
+    events = [
+        LocalTMAEvent(
+            20241127,
+            k,
+            START + TimeDelta(2 + 12 * k, format="sec"),
+            START + TimeDelta(9.55 + 12 * k, format="sec"),
+        )
+        for k in range(4)
+    ]
+    empty = LocalTMAEvent(
+        20241127,
+        4,
+        START + TimeDelta(3600, format="sec"),
+        START + TimeDelta(3610, format="sec"),
+    )
+    return LocalEfdClient({FA_TOPIC: df}), df, events[:2] + [empty] + events[2:]
+
+
+def _expected(df, events, statistics):
+    """The statistics of each actuator computed from the raw samples."""
+    functions = {
+        "mean": np.mean,
+        "min": np.min,
+        "max": np.max,
+        "stddev": lambda x: np.std(x, ddof=1),
+    }
+    values = np.full((len(events), len(FATable), 3, len(statistics)), np.nan)
+
+    for e, evt in enumerate(events):
+        begin = pd.Timestamp(evt.begin.isot, tz="UTC")
+        end = pd.Timestamp(evt.end.isot, tz="UTC")
+        samples = df[(df.index >= begin) & (df.index < end)]
+        if samples.empty:
+            continue
+        for a, fa in enumerate(FATable):
+            indices = (fa.x_index, fa.y_index, fa.z_index)
+            for axis, (name, index) in enumerate(zip("xyz", indices)):
+                if index is None:
+                    continue
+                x = samples[f"{name}Force{index}"].to_numpy()
+                for s, stat in enumerate(statistics):
+                    values[e, a, axis, s] = functions[stat](x)
+
+    return values
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 10])
+def test_matches_raw_samples(efd_events, batch_size):
+    client, df, events = efd_events
+
+    values = fa_force_snapshots(
+        client, events, batch_size=batch_size, executor=QueryExecutor(backoff=0.01)
+    )
+
+    expected = _expected(df, events, ("mean", "min", "max", "stddev"))
+    assert values.shape == (len(events), len(FATable), 3, 4)
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+    # Events without data, and actuators without X or Y forces, are NaN.
+    assert np.isnan(values[2]).all()
+    has_x = np.array([fa.x_index is not None for fa in FATable])
+    assert np.isnan(values[:, ~has_x, 0]).all()
+    assert np.isfinite(values[[0, 1, 3, 4]][:, has_x, 0]).all()
+    assert np.isfinite(values[[0, 1, 3, 4], :, 2]).all()
+
+
+def test_statistics_order(efd_events):
+    client, df, events = efd_events
+
+    values = fa_force_snapshots(client, events, statistics=("MAX", "mean"))
+
+    np.testing.assert_allclose(
+        values, _expected(df, events, ("max", "mean")), rtol=1e-12
+    )
+
+
+def test_one_statement_per_event(efd_events):
+    client, _, events = efd_events
+    client.influx_client.reset_counters()
+
+    fa_force_snapshots(client, events, batch_size=2)
+
+    assert client.influx_client.n_requests == 3
+    assert client.influx_client.n_statements == len(events)
+    assert client.influx_client.n_rows == len(events) - 1
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.summit.utils.tmaUtils import TMAState  # noqa: E402
+
+from lsst.sitcom.tn092.histogram import HardpointForcesHistogram  # noqa: E402
+
+EDGES = np.arange(-1000, 1001, 50)
+
+
+def _slews(n, seed):
+    """Per-slew forces, some beyond the edges, some missing."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "min_forces": rng.normal(-400, 400, n),
+            "max_forces": rng.normal(400, 400, n),
+            "end_reason": rng.choice(
+                [TMAState.TRACKING, TMAState.STOPPED, TMAState.FAULT], n
+            ),
+        }
+    )
+    df.loc[rng.choice(n, 5, replace=False), "min_forces"] = np.nan
+    return df
+
+
+def _brute_force(values, edges):
+    """Underflow, half-open bins and overflow counted one value at a time."""
+    counts = np.zeros(edges.size + 1, dtype=int)
+    for value in values:
+        if value < edges[0]:
+            counts[0] += 1
+        elif value >= edges[-1]:
+            counts[-1] += 1
+        else:
+            for i in range(edges.size - 1):
+                if edges[i] <= value < edges[i + 1]:
+                    counts[i + 1] += 1
+    return counts
+
+
+def _assert_same(hist, other):
+    assert hist.end_reasons == other.end_reasons
+    for end_reason in [None] + hist.end_reasons:
+        for method in ("min_counts", "max_counts"):
+            np.testing.assert_array_equal(
+                getattr(hist, method)(end_reason, outliers=True),
+                getattr(other, method)(end_reason, outliers=True),
+            )
+
+
+def test_counts_match_brute_force():
+    df = _slews(500, 1)
+    valid = df.dropna()
+
+    hist = HardpointForcesHistogram.from_frame(df, EDGES)
+
+    assert hist.n_slews == len(valid)
+    for end_reason in (None, TMAState.TRACKING, TMAState.FAULT):
+        selected = valid
+        if end_reason is not None:
+            selected = valid[valid["end_reason"] == end_reason]
+        np.testing.assert_array_equal(
+            hist.min_counts(end_reason, outliers=True),
+            _brute_force(selected["min_forces"], EDGES),
+        )
+        np.testing.assert_array_equal(
+            hist.max_counts(end_reason, outliers=True),
+            _brute_force(selected["max_forces"], EDGES),
+        )
+        np.testing.assert_array_equal(
+            hist.max_counts(end_reason),
+            _brute_force(selected["max_forces"], EDGES)[1:-1],
+        )
+
+
+def test_underflow_and_overflow():
+    df = pd.DataFrame(
+        {
+            "min_forces": [-1000.1, -1000.0, -999.9, 999.9, 1000.0, 5000.0, -np.inf],
+            "max_forces": [-3000.0, 0.0, 0.0, 950.0, 1000.0, 1e9, 0.0],
+            "end_reason": 0,
+        }
+    )
+
+    hist = HardpointForcesHistogram.from_frame(df, EDGES)
+
+    # Bins are half-open, so the last edge belongs to the overflow.
+    min_counts = hist.min_counts(outliers=True)
+    assert min_counts[0] == 1
+    assert min_counts[1] == 2
+    assert min_counts[-2] == 1
+    assert min_counts[-1] == 2
+    max_counts = hist.max_counts(outliers=True)
+    assert max_counts[0] == 1
+    assert max_counts[-2] == 1
+    assert max_counts[-1] == 2
+    # Slews with infinite forces are left out.
+    assert hist.n_slews == 6
+    assert min_counts.sum() == max_counts.sum() == 6
+    assert hist.min_counts().sum() == 3
+    assert hist.max_counts().sum() == 3
+
+
+@pytest.mark.parametrize("split", [0, 1, 137, 499])
+def test_merge_equals_single_pass(split):
+    df = _slews(500, 2)
+    whole = HardpointForcesHistogram.from_frame(df, EDGES)
+
+    first = HardpointForcesHistogram.from_frame(df.iloc[:split], EDGES)
+    second = HardpointForcesHistogram.from_frame(df.iloc[split:], EDGES)
+
+    _assert_same(first + second, whole)
+    _assert_same(second + first, whole)
+    # `+` leaves its operands untouched, `+=` merges in place.
+    assert first.n_slews + second.n_slews == whole.n_slews
+    first += second
+    _assert_same(first, whole)
+
+
+def test_merge_disjoint_end_reasons():
+    df = _slews(300, 3)
+    tracking = df["end_reason"] == TMAState.TRACKING
+
+    merged = HardpointForcesHistogram.from_frame(df[tracking], EDGES).merge(
+        HardpointForcesHistogram.from_frame(df[~tracking], EDGES)
+    )
+
+    _assert_same(merged, HardpointForcesHistogram.from_frame(df, EDGES))
+
+
+def test_merge_different_edges():
+    hist = HardpointForcesHistogram(EDGES)
+
+    with pytest.raises(ValueError):
+        hist.merge(HardpointForcesHistogram(EDGES[1:]))
+
+
+@pytest.mark.parametrize("edges", [[0.0], [1.0, 1.0], [2.0, 1.0], [[0.0, 1.0]]])
+def test_invalid_edges(edges):
+    with pytest.raises(ValueError):
+        HardpointForcesHistogram(edges)
@@ -0,0 +1,164 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time
+
+pytest.importorskip("lsst.summit.utils")
+pytest.importorskip("lsst.ts.xml")
+
+from lsst.ts.xml.tables.m1m3 import FAOrientation, FAType  # noqa: E402
+
+from lsst.sitcom.tn092.movie import (  # noqa: E402
+    ActuatorGeometry,
+    MovieRenderer,
+    actuator_forces,
+    movie_limits,
+    read_fa_forces,
+    render_frames,
+)
+from lsst.sitcom.tn092.query import FA_TOPIC, fa_force_columns  # noqa: E402
+
+COLUMNS = fa_force_columns("xyz")
+
+
+@pytest.fixture
+def fa_table():
+    """Eight actuators: four single axis, two along Y and two along X."""
+    orientations = [FAOrientation.NA] * 4 + [
+        FAOrientation.Y_PLUS,
+        FAOrientation.Y_MINUS,
+        FAOrientation.X_PLUS,
+        FAOrientation.X_MINUS,
+    ]
+    angles = 2 * np.pi * np.arange(8) / 8
+    return [
+        SimpleNamespace(
+            z_index=10 + i,
+            x_index=i - 6 if i >= 6 else None,
+            y_index=i if 4 <= i < 6 else None,
+            x_position=2 * np.cos(angle),
+            y_position=2 * np.sin(angle),
+            actuator_type=FAType.SAA if i < 4 else FAType.DAA,
+            orientation=orientation,
+        )
+        for i, (angle, orientation) in enumerate(zip(angles, orientations))
+    ]
+
+
+@pytest.fixture
+def geometry(fa_table):
+    return ActuatorGeometry(fa_table)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(11)
+    return rng.normal(0, 100, (12, len(COLUMNS)))
+
+
+def test_geometry(geometry, fa_table):
+    assert len(geometry) == len(fa_table)
+    np.testing.assert_array_equal(geometry.is_lateral, [False] * 4 + [True] * 4)
+    for i, fa in enumerate(fa_table):
+        assert COLUMNS[geometry.z_column[i]] == f"zForce{fa.z_index}"
+    assert [COLUMNS[c] for c in geometry.lateral_column[4:]] == [
+        "yForce4",
+        "yForce5",
+        "xForce0",
+        "xForce1",
+    ]
+
+
+def test_actuator_forces(geometry, fa_table, values):
+    z, lateral = actuator_forces(values, geometry, baseline=(0, 5))
+
+    baseline = np.median(values[0:5], axis=0)
+    directions = {
+        FAOrientation.Y_PLUS: ("y", 0, 1),
+        FAOrientation.Y_MINUS: ("y", 0, -1),
+        FAOrientation.X_PLUS: ("x", 1, 0),
+        FAOrientation.X_MINUS: ("x", -1, 0),
+    }
+    for frame, row in enumerate(values - baseline):
+        for i, fa in enumerate(fa_table):
+            force = dict(zip(COLUMNS, row))
+            assert z[frame, i] == force[f"zForce{fa.z_index}"]
+            if fa.orientation in directions:
+                axis, dx, dy = directions[fa.orientation]
+                index = fa.x_index if axis == "x" else fa.y_index
+                lateral_force = force[f"{axis}Force{index}"]
+                np.testing.assert_array_equal(
+                    lateral[frame, i], [dx * lateral_force, dy * lateral_force]
+                )
+            else:
+                np.testing.assert_array_equal(lateral[frame, i], [0, 0])
+
+
+def test_movie_limits():
+    z = np.array([[120.4, 80.0], [30.0, 250.6]])
+    lateral = np.array([[[0.2, 0.0], [0.0, -0.3]]])
+
+    assert movie_limits(z, lateral) == (0, 251, 1)
+    assert movie_limits(-z, 100 * lateral) == (-251, 0, 30)
+    assert movie_limits(np.empty((0, 2)), np.empty((0, 2, 2))) == (0, 0, 1)
+
+
+def test_renderer(geometry, values):
+    z, lateral = actuator_forces(values, geometry)
+    renderer = MovieRenderer(geometry, movie_limits(z, lateral), figsize=(4, 4))
+
+    first = renderer.render(z[0], lateral[0], "first")
+    second = renderer.render(z[1], lateral[1], "second")
+
+    assert first.shape == (*renderer.size[::-1], 4)
+    assert not np.array_equal(first, second)
+    # Updating the artists in place gives the same frame as a new figure.
+    np.testing.assert_array_equal(renderer.render(z[0], lateral[0], "first"), first)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_render_frames(geometry, values, processes):
+    z, lateral = actuator_forces(values, geometry)
+    times = 1.7e9 + np.arange(len(z)) * 0.02
+    limits = movie_limits(z, lateral)
+    renderer = MovieRenderer(geometry, limits, figsize=(4, 4))
+
+    frames = list(
+        render_frames(
+            times,
+            z,
+            lateral,
+            geometry,
+            processes=processes,
+            frames_per_task=5,
+            figsize=(4, 4),
+        )
+    )
+
+    assert len(frames) == len(times)
+    titles = Time(times, format="unix").utc.isot
+    for i in (0, 6, 11):
+        np.testing.assert_array_equal(
+            frames[i], renderer.render(z[i], lateral[i], titles[i])
+        )
+
+
+def test_read_fa_forces_step(synthetic_efd):
+    client, events = synthetic_efd
+    index = pd.date_range(events[0].begin.isot, periods=200, freq="50ms", tz="UTC")
+    data = np.random.default_rng(2).normal(0, 10, (index.size, len(COLUMNS)))
+    df = pd.DataFrame(data, index=index, columns=COLUMNS)
+    client.influx_client.add_topic(FA_TOPIC, df)
+    begin, end = events[0].begin, events[0].end
+
+    times, values = read_fa_forces(client, begin, end, step=1, chunk_duration=10)
+    step_times, step_values = read_fa_forces(
+        client, begin, end, step=3, chunk_duration=1.3
+    )
+
+    assert values.shape == (200, len(COLUMNS))
+    np.testing.assert_array_equal(values, data)
+    np.testing.assert_array_equal(step_times, times[::3])
+    np.testing.assert_array_equal(step_values, data[::3])
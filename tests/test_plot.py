@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from lsst.sitcom.tn092 import plot  # noqa: E402
+
+
+@pytest.fixture
+def hp_forces():
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "min_forces": rng.normal(-300, 200, 200),
+            "max_forces": rng.normal(300, 200, 200),
+            "end_reason": rng.integers(0, 3, 200),
+        }
+    )
+
+
+@pytest.fixture
+def shown(monkeypatch):
+    calls = []
+    monkeypatch.setattr(plt, "show", lambda: calls.append(True))
+    yield calls
+    plt.close("all")
+
+
+def test_histogram_shown_by_default(tmp_path, hp_forces, shown):
+    fig = plot.histogram_hp_minmax_forces(hp_forces, 20241127, output_dir=tmp_path)
+
+    assert shown == [True]
+    assert plt.fignum_exists(fig.number)
+    assert (tmp_path / "histogram_hp_minmax_dayobs_20241127.png").exists()
+
+
+def test_histogram_batch(tmp_path, hp_forces, shown):
+    fig = plot.histogram_hp_minmax_forces(
+        hp_forces, 20241127, output_dir=tmp_path, show=False
+    )
+
+    assert shown == []
+    assert not plt.fignum_exists(fig.number)
+    assert (tmp_path / "histogram_hp_minmax_dayobs_20241127.png").exists()
+
+
+def test_histogram_on_given_figure(tmp_path, hp_forces, shown):
+    fig = plt.figure()
+
+    result = plot.histogram_hp_minmax_forces(
+        hp_forces, 20241127, output_dir=tmp_path, fig=fig, show=False
+    )
+
+    assert result is fig
+    assert len(fig.axes) == 2
+    assert plt.fignum_exists(fig.number)
+
+
+def test_render_histograms_pool_matches_serial(tmp_path, hp_forces):
+    jobs = [
+        (20241127, None, hp_forces),
+        (20241128, "BL227", hp_forces.iloc[:100]),
+        (20241129, None, hp_forces.iloc[100:]),
+    ]
+
+    serial = plot.render_histograms(jobs, tmp_path / "serial", processes=1)
+    pool = plot.render_histograms(jobs, tmp_path / "pool", end_reason=1, processes=2)
+    pool_serial = plot.render_histograms(
+        jobs, tmp_path / "pool_serial", end_reason=1, processes=1
+    )
+
+    assert [Path(p).name for p in serial] == [
+        "histogram_hp_minmax_dayobs_20241127.png",
+        "hist_hp_minmax_BL227_20241128.png",
+        "histogram_hp_minmax_dayobs_20241129.png",
+    ]
+    for a, b in zip(pool, pool_serial):
+        np.testing.assert_array_equal(plt.imread(a), plt.imread(b))
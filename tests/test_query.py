@@ -0,0 +1,176 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.summit.utils.tmaUtils import TMAState  # noqa: E402
+
+from lsst.sitcom.tn092.executor import QueryExecutor  # noqa: E402
+from lsst.sitcom.tn092.local_efd import (  # noqa: E402
+    LocalTMAEvent,
+    LocalTMAEventMaker,
+    get_efd_data,
+    make_synthetic_efd,
+)
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    HP_TOPIC,
+    hp_forces_and_azimuth_elevation,
+    hp_forces_and_azimuth_elevation_by_day_obs,
+)
+
+
+def _event_data(client, topic, evt):
+    """The samples of ``topic`` in ``[evt.begin, evt.end)``."""
+    df = get_efd_data(client, topic, event=evt)
+    if df.empty:
+        return df
+    return df[df.index < pd.Timestamp(evt.end.utc.isot, tz="UTC")]
+
+
+def _reference_frame(client, events):
+    """
+    The table of `hp_forces_and_azimuth_elevation` computed one event at a
+    time from the raw samples, as the original implementation did.
+    """
+    rows, reasons = [], []
+    for evt in events:
+        az = _event_data(client, "lsst.sal.MTMount.azimuth", evt)
+        el = _event_data(client, "lsst.sal.MTMount.elevation", evt)
+        hp = _event_data(client, HP_TOPIC, evt)
+
+        if az.empty or el.empty or hp.empty:
+            continue
+
+        row = {}
+        for prefix, df in (("az", az), ("el", el)):
+            row[f"{prefix}_start"] = df["actualPosition"].iloc[0]
+            row[f"{prefix}_end"] = df["actualPosition"].iloc[-1]
+            row[f"{prefix}_diff"] = row[f"{prefix}_end"] - row[f"{prefix}_start"]
+        for i in range(6):
+            row[f"min_forces_{i}"] = hp[f"measuredForce{i}"].min()
+            row[f"max_forces_{i}"] = hp[f"measuredForce{i}"].max()
+        row["min_forces"] = min(row[f"min_forces_{i}"] for i in range(6))
+        row["max_forces"] = max(row[f"max_forces_{i}"] for i in range(6))
+        row["begin"] = evt.begin.isot
+        row["end"] = evt.end.isot
+        row["seq_num"] = evt.seqNum
+        row["day_obs"] = evt.dayObs
+        rows.append(row)
+        reasons.append(TMAState(evt.endReason))
+
+    df = pd.DataFrame(rows)
+    df["end_reason"] = pd.Series(reasons, dtype=object)
+    return df
+
+
+@pytest.fixture
+def events_with_gap(synthetic_efd):
+    """The synthetic slews plus one without any telemetry."""
+    client, events = synthetic_efd
+    begin = Time("2024-12-05T00:00:00", scale="utc")
+    empty = LocalTMAEvent(20241204, 99, begin, begin + TimeDelta(10, format="sec"))
+    return client, events[:10] + [empty] + events[10:]
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 3, 64])
+def test_hp_forces_match_reference(events_with_gap, batch_size):
+    client, events = events_with_gap
+
+    df = hp_forces_and_azimuth_elevation(
+        client, events, batch_size=batch_size, executor=QueryExecutor(backoff=0.01)
+    )
+
+    expected = _reference_frame(client, events)
+    assert len(expected) == len(events) - 1
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_batched_matches_unbatched(synthetic_efd):
+    client, events = synthetic_efd
+
+    unbatched = hp_forces_and_azimuth_elevation(client, events)
+    batched = hp_forces_and_azimuth_elevation(client, events, batch_size=7)
+
+    pd.testing.assert_frame_equal(batched, unbatched)
+    assert np.all(batched["seq_num"].to_numpy() == [evt.seqNum for evt in events])
+
+
+def test_batched_sends_fewer_requests(synthetic_efd):
+    client, events = synthetic_efd
+
+    hp_forces_and_azimuth_elevation(client, events)
+    unbatched = client.influx_client.n_requests
+
+    client.influx_client.reset_counters()
+    hp_forces_and_azimuth_elevation(client, events, batch_size=10)
+    batched = client.influx_client.n_requests
+
+    assert unbatched == 3 * len(events)
+    assert batched == 3 * 2
+
+
+def test_end_reason_names(synthetic_efd):
+    client, events = synthetic_efd
+
+    df = hp_forces_and_azimuth_elevation(client, events, batch_size=7)
+
+    assert all(isinstance(reason, TMAState) for reason in df["end_reason"])
+    assert [reason.name for reason in df["end_reason"]] == [
+        evt.endReason.name for evt in events
+    ]
+    # They still compare and convert as integers.
+    assert (df["end_reason"] == int(TMAState.TRACKING)).any()
+    assert df["end_reason"].to_numpy(dtype=int).dtype == int
+
+
+def test_empty_events(synthetic_efd):
+    client, _ = synthetic_efd
+
+    assert hp_forces_and_azimuth_elevation(client, []).empty
+
+
+def test_by_day_obs(record_requests):
+    client, events = make_synthetic_efd(12, gap=20000.0, rate=0.5)
+    maker_client, _ = make_synthetic_efd(12, gap=20000.0, rate=0.5)
+    day_obs_list = sorted({evt.dayObs for evt in events})
+    requests = record_requests(client)
+    maker_requests = record_requests(maker_client)
+
+    results = list(
+        hp_forces_and_azimuth_elevation_by_day_obs(
+            client,
+            lambda: LocalTMAEventMaker(maker_client, events),
+            day_obs_list[0],
+            day_obs_list[-1],
+            batch_size=4,
+        )
+    )
+
+    assert [day_obs for day_obs, _ in results] == day_obs_list
+    for day_obs, df in results:
+        day_events = [evt for evt in events if evt.dayObs == day_obs]
+        pd.testing.assert_frame_equal(df, _reference_frame(client, day_events))
+
+    # Each client stays on the event loop of its own thread.
+    assert {thread for thread, _ in requests} == {threading.current_thread()}
+    assert len({loop for _, loop in requests}) == 1
+    assert len(set(maker_requests)) == 1
+    assert maker_requests[0][0] is not threading.current_thread()
+
+
+def test_by_day_obs_shared_client(synthetic_efd):
+    client, events = synthetic_efd
+
+    with pytest.raises(ValueError):
+        list(
+            hp_forces_and_azimuth_elevation_by_day_obs(
+                client,
+                lambda: LocalTMAEventMaker(client, events),
+                events[0].dayObs,
+                events[0].dayObs,
+            )
+        )
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.rainflow import RainflowCounter, m1m3_hp_rainflow  # noqa: E402
+
+
+def _reference_cycles(values):
+    """
+    Sequential four-point rainflow counting of a 1D signal.
+
+    Returns the ranges and means of the full cycles, and the residue.
+    """
+    values = values[np.isfinite(values)]
+    reversals = []
+    for value in values.tolist():
+        if reversals and value == reversals[-1]:
+            continue
+        if len(reversals) >= 2 and (reversals[-1] - reversals[-2]) * (
+            value - reversals[-1]
+        ) > 0:
+            reversals[-1] = value
+        else:
+            reversals.append(value)
+
+    ranges, means, stack = [], [], []
+    for value in reversals:
+        stack.append(value)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            if abs(b - c) > abs(a - b) or abs(b - c) > abs(c - d):
+                break
+            ranges.append(abs(b - c))
+            means.append(0.5 * (b + c))
+            del stack[-3:-1]
+
+    return np.array(ranges), np.array(means), np.array(stack)
+
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(42)
+    values = np.cumsum(rng.normal(0, 50, (20000, 3)), axis=0)
+    values = np.round(values, -1)
+    values[rng.integers(0, values.shape[0], 100), 1] = np.nan
+    return values
+
+
+@pytest.fixture
+def whole(signal):
+    counter = RainflowCounter(n_channels=signal.shape[1])
+    counter.update(signal)
+    return counter
+
+
+def _chunks(values, seed=0):
+    rng = np.random.default_rng(seed)
+    cuts = np.sort(rng.choice(np.arange(1, values.shape[0]), 40, replace=False))
+    return np.split(values, cuts)
+
+
+def _sum(counters):
+    total = counters[0].copy()
+    for counter in counters[1:]:
+        total.merge(counter)
+    return total
+
+
+def _assert_same(counter, other):
+    np.testing.assert_array_equal(
+        counter.counts(residue=False, outliers=True),
+        other.counts(residue=False, outliers=True),
+    )
+    np.testing.assert_array_equal(
+        counter.counts(outliers=True), other.counts(outliers=True)
+    )
+    for residue, other_residue in zip(counter.residue, other.residue):
+        np.testing.assert_array_equal(residue, other_residue)
+    np.testing.assert_array_equal(counter.n_samples, other.n_samples)
+
+
+def test_whole_matches_reference(signal, whole):
+    for channel in range(signal.shape[1]):
+        ranges, means, residue = _reference_cycles(signal[:, channel])
+
+        expected = RainflowCounter(n_channels=1)
+        expected._cycles[0] = expected._bin_counts(ranges, means)
+
+        np.testing.assert_array_equal(
+            whole.counts(channel, residue=False, outliers=True),
+            expected.counts(residue=False, outliers=True),
+        )
+        np.testing.assert_array_equal(whole.residue[channel], residue)
+
+
+def test_chunked_matches_whole(signal, whole):
+    counter = RainflowCounter(n_channels=signal.shape[1])
+    for chunk in _chunks(signal):
+        counter.update(chunk)
+
+    _assert_same(counter, whole)
+
+
+def test_merged_matches_whole(signal, whole):
+    counters = []
+    for chunk in _chunks(signal, seed=1):
+        counter = RainflowCounter(n_channels=signal.shape[1])
+        counter.update(chunk)
+        counters.append(counter)
+
+    merged = RainflowCounter(n_channels=signal.shape[1])
+    for counter in counters:
+        merged += counter
+
+    _assert_same(merged, whole)
+    _assert_same(counters[0] + counters[1], _sum(counters[:2]))
+
+
+def test_merge_rejects_other_bins():
+    with pytest.raises(ValueError):
+        RainflowCounter(range_edges=[0, 10, 20]).merge(RainflowCounter())
+
+
+def test_efd_chunk_duration(synthetic_efd):
+    client, events = synthetic_efd
+    begin, end = events[0].begin, events[-1].end
+
+    whole = m1m3_hp_rainflow(client, begin, end, chunk_duration=3600)
+    chunked = m1m3_hp_rainflow(client, begin, end, chunk_duration=7)
+
+    assert whole.n_samples.sum() > 0
+    _assert_same(chunked, whole)
@@ -0,0 +1,175 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.summit.utils.efdUtils import (  # noqa: E402
+    getDayObsEndTime,
+    getDayObsStartTime,
+)
+
+from lsst.sitcom.tn092 import query  # noqa: E402
+from lsst.sitcom.tn092.local_efd import get_efd_data, make_synthetic_efd  # noqa: E402
+from lsst.sitcom.tn092.utils import filter_by_block_id  # noqa: E402
+
+STATE_TOPIC = "lsst.sal.Script.logevent_state"
+DESCRIPTION_TOPIC = "lsst.sal.Script.logevent_description"
+CONFIGURE_TOPIC = "lsst.sal.Script.command_configure"
+LOG_MESSAGE_TOPIC = "lsst.sal.Script.logevent_logMessage"
+BLOCK_STATUS_TOPIC = "lsst.sal.Scheduler.logevent_blockStatus"
+
+
+@pytest.fixture
+def efd():
+    """30 Scripts of blocks 227, 228 and 229, and the time range they span."""
+    client, events = make_synthetic_efd(30)
+    return client, events[0].begin, events[-1].end
+
+
+@pytest.fixture
+def statements(efd):
+    """The InfluxQL statements sent to the local EFD."""
+    client, _, _ = efd
+    sent = []
+    send = client.influx_client.query
+
+    async def recording(statement):
+        sent.append(" ".join(statement.split()))
+        return await send(statement)
+
+    client.influx_client.query = recording
+    return sent
+
+
+def _unfiltered(client, topic, begin, end):
+    """All the columns of a topic, as the functions used to fetch them."""
+    return get_efd_data(client, topic, columns="*", begin=begin, end=end)
+
+
+def test_states_where_clause(efd, statements):
+    client, begin, end = efd
+
+    query.script_states(
+        client,
+        begin,
+        end,
+        block_id="BLOCK-T228",
+        columns=["salIndex", "blockId"],
+        sal_index=[100007, 100001, 100007],
+    )
+
+    (statement,) = statements
+    assert statement.startswith(f'SELECT "salIndex", "blockId" FROM "{STATE_TOPIC}"')
+    assert statement.endswith(
+        ' AND ("salIndex" = 100001 OR "salIndex" = 100007)'
+        ' AND "blockId" =~ /228/'
+    )
+    assert f"time >= '{begin.utc.isot}Z'" in statement
+    assert f"time <= '{end.utc.isot}Z'" in statement
+
+
+def test_sal_index_where_clause(efd, statements):
+    client, begin, end = efd
+
+    query.script_configuration(client, begin, end, sal_index=100004)
+    query.script_log_message(client, begin, end)
+
+    assert statements[0].startswith(f'SELECT * FROM "{CONFIGURE_TOPIC}"')
+    assert statements[0].endswith(' AND "salIndex" = 100004')
+    assert statements[1].startswith(f'SELECT * FROM "{LOG_MESSAGE_TOPIC}"')
+    assert "salIndex" not in statements[1]
+
+
+def test_block_status_where_clause(efd, statements):
+    client, begin, end = efd
+
+    query.block_status(client, begin, end, block_name="BLOCK-T227", columns=["id"])
+    query.block_status(client, begin, end, block_name="it's")
+
+    assert statements[0].startswith(f'SELECT "id" FROM "{BLOCK_STATUS_TOPIC}"')
+    assert statements[0].endswith(" AND \"id\" = 'BLOCK-T227'")
+    assert statements[1].endswith(" AND \"id\" = 'it\\'s'")
+
+
+@pytest.mark.parametrize("block_id", [None, "BLOCK-T227", "BLOCK-228", "T230"])
+def test_states_match_pandas_filter(efd, block_id):
+    client, begin, end = efd
+
+    df = query.script_states(client, begin, end, block_id=block_id)
+
+    expected = _unfiltered(client, STATE_TOPIC, begin, end)
+    if block_id is not None:
+        expected = filter_by_block_id(expected, block_id)
+    if expected.empty:
+        assert df.empty
+    else:
+        pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("block_name", [None, "BLOCK-T229", "BLOCK-T1"])
+def test_block_status_match_pandas_filter(efd, block_name):
+    client, begin, end = efd
+
+    df = query.block_status(client, begin, end, block_name=block_name)
+
+    expected = _unfiltered(client, BLOCK_STATUS_TOPIC, begin, end)
+    if block_name is not None:
+        expected = expected[expected.id == block_name]
+    if expected.empty:
+        assert df.empty
+    else:
+        pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize(
+    "function, topic",
+    [
+        (query.script_configuration, CONFIGURE_TOPIC),
+        (query.script_description, DESCRIPTION_TOPIC),
+        (query.script_log_message, LOG_MESSAGE_TOPIC),
+    ],
+)
+def test_sal_index_matches_pandas_filter(efd, function, topic):
+    client, begin, end = efd
+    expected = _unfiltered(client, topic, begin, end)
+
+    pd.testing.assert_frame_equal(function(client, begin, end), expected)
+
+    df = function(client, begin, end, sal_index=[100003, 100011])
+    pd.testing.assert_frame_equal(
+        df, expected[expected["salIndex"].isin([100003, 100011])]
+    )
+
+    columns = [column for column in expected.columns if column != "salIndex"]
+    df = function(client, begin, end, columns=columns, sal_index=100005)
+    pd.testing.assert_frame_equal(
+        df, expected.loc[expected["salIndex"] == 100005, columns]
+    )
+
+
+def test_description_by_block(efd, statements):
+    client, begin, end = efd
+
+    df = query.script_description(client, begin, end, block_id="BLOCK-T228")
+
+    states = filter_by_block_id(_unfiltered(client, STATE_TOPIC, begin, end), "228")
+    expected = _unfiltered(client, DESCRIPTION_TOPIC, begin, end)
+    expected = expected[expected["salIndex"].isin(states["salIndex"])]
+    assert len(df) == 10
+    pd.testing.assert_frame_equal(df, expected)
+    # Only the SAL indices of the states are read.
+    assert statements[0].startswith(f'SELECT "salIndex" FROM "{STATE_TOPIC}"')
+
+    assert query.script_description(client, begin, end, block_id="BLOCK-T500").empty
+
+
+def test_day_obs_bounds(efd, statements):
+    client, _, _ = efd
+
+    df = query.script_states(client, 20241127, 20241127)
+
+    expected = _unfiltered(
+        client, STATE_TOPIC, getDayObsStartTime(20241127), getDayObsEndTime(20241127)
+    )
+    pd.testing.assert_frame_equal(df, expected)
+    assert f"time >= '{getDayObsStartTime(20241127).utc.isot}Z'" in statements[0]
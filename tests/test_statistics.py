@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.time import Time, TimeDelta
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.executor import QueryExecutor  # noqa: E402
+from lsst.sitcom.tn092.local_efd import (  # noqa: E402
+    LocalTMAEvent,
+    get_efd_data,
+    make_synthetic_efd,
+)
+from lsst.sitcom.tn092.query import (  # noqa: E402
+    HP_FORCE_COLUMNS,
+    HP_TOPIC,
+    hp_force_statistics,
+    hp_forces_and_azimuth_elevation,
+)
+
+
+@pytest.fixture
+def efd_events():
+    """
+    Slews with 50 Hz telemetry, plus an event without samples and one with
+    a single sample.
+    """
+    client, events = make_synthetic_efd(6, rate=50)
+    begin = Time("2024-12-05T00:00:00", scale="utc")
+    empty = LocalTMAEvent(20241204, 99, begin, begin + TimeDelta(10, format="sec"))
+    single = LocalTMAEvent(
+        events[2].dayObs,
+        100,
+        events[2].begin,
+        events[2].begin + TimeDelta(0.01, format="sec"),
+    )
+    return client, events[:3] + [empty] + events[3:] + [single]
+
+
+def _samples(client, evt):
+    """The hardpoint forces in ``[evt.begin, evt.end)``, one column each."""
+    df = get_efd_data(client, HP_TOPIC, columns=HP_FORCE_COLUMNS, event=evt)
+    if df.empty:
+        return np.empty((0, 6))
+    df = df[df.index < pd.Timestamp(evt.end.utc.isot, tz="UTC")]
+    return df[HP_FORCE_COLUMNS].to_numpy()
+
+
+def _nearest_rank(values, q):
+    """The nearest-rank percentile computed by InfluxQL."""
+    rank = int(np.floor(values.size * q / 100 + 0.5))
+    return np.sort(values)[rank - 1] if 1 <= rank <= values.size else np.nan
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_matches_numpy(efd_events, batch_size):
+    client, events = efd_events
+
+    df = hp_force_statistics(
+        client,
+        events,
+        statistics=("count", "min", "max", "mean", "stddev", "rms", "p95"),
+        batch_size=batch_size,
+        executor=QueryExecutor(backoff=0.01),
+    )
+
+    assert len(df) == len(events)
+    for row, evt in zip(df.itertuples(index=False), events):
+        row = row._asdict()
+        samples = _samples(client, evt)
+        assert row["seq_num"] == evt.seqNum
+        assert row["end_reason"].name == evt.endReason.name
+
+        for hp in range(6):
+            x = samples[:, hp]
+            count = row[f"count_forces_{hp}"]
+            if x.size == 0:
+                assert count is pd.NA
+                for stat in ("min", "max", "mean", "stddev", "rms", "p95"):
+                    assert np.isnan(row[f"{stat}_forces_{hp}"])
+                continue
+
+            assert count == x.size
+            assert row[f"min_forces_{hp}"] == x.min()
+            assert row[f"max_forces_{hp}"] == x.max()
+            np.testing.assert_allclose(row[f"mean_forces_{hp}"], x.mean(), rtol=1e-12)
+            np.testing.assert_allclose(
+                row[f"rms_forces_{hp}"], np.sqrt(np.mean(x**2)), rtol=1e-12
+            )
+            if x.size > 1:
+                np.testing.assert_allclose(
+                    row[f"stddev_forces_{hp}"], x.std(ddof=1), rtol=1e-12
+                )
+            else:
+                assert np.isnan(row[f"stddev_forces_{hp}"])
+            assert row[f"p95_forces_{hp}"] == _nearest_rank(x, 95)
+
+
+def test_min_max_match_hp_forces(efd_events):
+    client, events = efd_events
+
+    stats = hp_force_statistics(client, events, statistics=("min", "max"))
+    forces = hp_forces_and_azimuth_elevation(client, events)
+
+    # Events without data are dropped from the table of forces.
+    stats = stats[stats["min_forces"].notna()].reset_index(drop=True)
+    columns = [f"{stat}_forces_{hp}" for stat in ("min", "max") for hp in range(6)]
+    pd.testing.assert_frame_equal(
+        stats[columns + ["min_forces", "max_forces", "seq_num"]],
+        forces[columns + ["min_forces", "max_forces", "seq_num"]],
+    )
+
+
+def test_empty_events(efd_events):
+    client, _ = efd_events
+
+    df = hp_force_statistics(client, [])
+
+    assert df.empty
+    assert "mean_forces_0" in df.columns
+    assert "end_reason" in df.columns
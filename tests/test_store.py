@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("lsst.summit.utils")
+
+from lsst.sitcom.tn092.query import hp_forces_and_azimuth_elevation  # noqa: E402
+from lsst.sitcom.tn092.store import SummaryStore  # noqa: E402
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(3)
+    n = 60
+    return pd.DataFrame(
+        {
+            "seq_num": np.arange(n),
+            "el_diff": rng.normal(0, 10, n),
+            "max_forces": rng.uniform(0, 1000, n),
+            "end_reason": rng.integers(0, 3, n),
+            "begin": [f"2024-11-{1 + i % 3:02d}T00:00:{i:02d}" for i in range(n)],
+            "day_obs": 20241101 + rng.permutation(np.arange(n) % 3),
+        }
+    )
+
+
+def _expected(df, columns=None):
+    df = df.sort_values("day_obs", kind="stable").reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def test_round_trip(tmp_path, table):
+    store = SummaryStore(tmp_path)
+
+    assert store.read().empty
+    assert store.write(table) == [20241101, 20241102, 20241103]
+    assert store.day_obs_list == [20241101, 20241102, 20241103]
+
+    df = store.read()
+    assert sorted(df.columns) == sorted(table.columns)
+    pd.testing.assert_frame_equal(
+        df, _expected(table, df.columns), check_dtype=False, check_index_type=False
+    )
+
+
+def test_round_trip_query_results(tmp_path, synthetic_efd):
+    client, events = synthetic_efd
+    table = hp_forces_and_azimuth_elevation(client, events)
+    store = SummaryStore(tmp_path)
+
+    store.write(table)
+    df = store.read()
+
+    pd.testing.assert_frame_equal(
+        df[table.columns], _expected(table), check_dtype=False
+    )
+
+
+def test_read_selection(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    store.write(table)
+
+    df = store.read(
+        columns=["seq_num", "max_forces"],
+        day_obs_start=20241102,
+        day_obs_end=20241103,
+        filters=[("end_reason", "==", 2)],
+    )
+
+    selected = table[(table.day_obs >= 20241102) & (table.end_reason == 2)]
+    assert sorted(df.columns) == ["day_obs", "max_forces", "seq_num"]
+    pd.testing.assert_frame_equal(
+        df, _expected(selected, df.columns), check_dtype=False
+    )
+
+
+def test_write_replaces_day_obs(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    store.write(table)
+
+    update = table[table.day_obs == 20241102].iloc[:2].assign(max_forces=-1.0)
+    store.write(update)
+
+    df = store.read(day_obs_start=20241102, day_obs_end=20241102)
+    assert len(df) == 2
+    assert np.all(df["max_forces"] == -1.0)
+    assert len(store.read()) == len(table) - (table.day_obs == 20241102).sum() + 2
+
+
+def test_write_day_obs_argument(tmp_path, table):
+    store = SummaryStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.write(table.drop(columns="day_obs"))
+
+    store.write(table.drop(columns="day_obs"), day_obs=20241201)
+    assert store.day_obs_list == [20241201]
+    assert len(store.read()) == len(table)
+
+
+def test_delete(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    store.write(table)
+
+    store.delete(20241101)
+
+    assert store.day_obs_list == [20241102, 20241103]
+    assert set(store.read()["day_obs"]) == {20241102, 20241103}
+
+
+def test_schema_across_day_obs(tmp_path):
+    store = SummaryStore(tmp_path)
+    # A column without values on the first day, and one that is an integer
+    # on the first day but has missing values on the second.
+    first = pd.DataFrame(
+        {"seq_num": [1, 2], "note": [None, None], "count": [3, 4], "day_obs": 20241101}
+    )
+    second = pd.DataFrame(
+        {
+            "seq_num": [5, 6],
+            "note": ["fault", None],
+            "count": [7.5, np.nan],
+            "day_obs": 20241102,
+        }
+    )
+
+    store.write(first)
+    store.write(second)
+
+    assert store.schema.field("note").type in (pa.string(), pa.large_string())
+    assert store.schema.field("count").type == pa.float64()
+    df = store.read()
+    assert df["count"].dtype == float
+    assert df["count"].tolist()[:3] == [3.0, 4.0, 7.5]
+    assert np.isnan(df["count"].iloc[3])
+    assert df["note"].isna().tolist() == [True, True, False, True]
+    assert df["note"].iloc[2] == "fault"
+    assert df["seq_num"].dtype == np.int64
+
+    # Writing the first day again keeps the widened schema.
+    store.write(first)
+    assert store.schema.field("count").type == pa.float64()
+    assert store.read(day_obs_end=20241101)["count"].dtype == float
+
+
+def test_schema_all_null_column(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    table = table.assign(el_diff=np.nan, error=None)
+
+    store.write(table)
+
+    df = store.read(filters=[("end_reason", "==", 1)])
+    assert df["el_diff"].isna().all()
+    assert df["error"].isna().all()
+    assert len(df) == (table.end_reason == 1).sum()
+
+
+def test_schema_incompatible_types(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    store.write(table[table.day_obs == 20241101])
+
+    update = table[table.day_obs == 20241102].assign(max_forces="high")
+    with pytest.raises(ValueError):
+        store.write(update)
+
+    assert store.day_obs_list == [20241101]
+    assert store.schema.field("max_forces").type == pa.float64()
+
+
+def test_schema_of_files_without_metadata(tmp_path, table):
+    store = SummaryStore(tmp_path)
+    for day_obs, df_day in table.groupby("day_obs"):
+        df_day = df_day.drop(columns="day_obs")
+        if day_obs == 20241102:
+            df_day = df_day.astype({"end_reason": float})
+        path = store.partition_path(day_obs)
+        path.mkdir()
+        df_day.to_parquet(path / store.file_name, index=False)
+
+    assert store.schema.field("end_reason").type == pa.float64()
+    df = store.read()
+    assert df["end_reason"].dtype == float
+    pd.testing.assert_frame_equal(
+        df, _expected(table, df.columns), check_dtype=False, check_index_type=False
+    )
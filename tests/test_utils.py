@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("lsst.ts.xml")
+
+from lsst.sitcom.tn092.utils import write_atomic  # noqa: E402
+
+
+def test_write_atomic(tmp_path):
+    file_path = tmp_path / "new" / "table.csv"
+
+    assert write_atomic(file_path, lambda path: path.write_text("a,b\n")) == file_path
+    assert file_path.read_text() == "a,b\n"
+    assert [p.name for p in file_path.parent.iterdir()] == ["table.csv"]
+
+
+def test_write_atomic_failure_keeps_file(tmp_path):
+    file_path = tmp_path / "table.csv"
+    file_path.write_text("old\n")
+
+    def write(path):
+        path.write_text("partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        write_atomic(file_path, write)
+
+    assert file_path.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["table.csv"]